@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : bench_async_client.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 原生异步客户端基准，桩服务校验TC3签名，对比线程池执行层
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from mock_live_server import MockLiveServer  # noqa: E402
+
+SECRET_KEY = "benchmark-secret"
+
+
+def configure(endpoint: str) -> None:
+    """将客户端指向本地桩服务，需在导入客户端模块之前调用"""
+    os.environ["TENCENTCLOUD_SECRET_ID"] = "AKIDbenchmark"
+    os.environ["TENCENTCLOUD_SECRET_KEY"] = SECRET_KEY
+    os.environ["LIVE_ENDPOINT"] = endpoint
+    os.environ["TENCENTCLOUD_API_SCHEME"] = "http"
+    # 只测量调用本身，不受默认限流配额影响
+    os.environ["RATE_LIMIT_DEFAULT"] = "0"
+
+
+async def run_threaded(calls: int) -> float:
+    """通过线程池执行层并发调用"""
+    from tools.live_api import LiveClient
+
+    client = LiveClient()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client.async_call_api("DescribeLiveStreamState", {"StreamName": f"s{i}"}) for i in range(calls)
+    ))
+    return time.perf_counter() - start
+
+
+async def run_native(calls: int) -> float:
+    """通过原生异步客户端并发调用"""
+    from tools.live_api import AsyncLiveClient
+    from utils.async_tencent_client import close_http_pools
+
+    client = AsyncLiveClient()
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client.describe_live_stream_state("live", "bench.example.com", f"s{i}") for i in range(calls)
+    ))
+    elapsed = time.perf_counter() - start
+    await close_http_pools()
+    return elapsed
+
+
+def main():
+    """运行基准测试"""
+    parser = argparse.ArgumentParser(description="原生异步客户端基准")
+    parser.add_argument("--calls", type=int, default=300, help="并发调用数")
+    parser.add_argument("--latency", type=float, default=0.2, help="桩服务每个请求的延迟(秒)")
+    args = parser.parse_args()
+
+    stub = MockLiveServer(latency=args.latency, secret_key=SECRET_KEY).start()
+    configure(stub.endpoint)
+    try:
+        for name, runner in (("threaded", run_threaded), ("native", run_native)):
+            elapsed = asyncio.run(runner(args.calls))
+            print(f"{name:>9}: {args.calls} calls in {elapsed:.3f}s, "
+                  f"{args.calls / elapsed:.1f} calls/s")
+        print(f"signature failures: {stub.signature_failures}")
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
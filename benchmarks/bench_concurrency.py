@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : bench_concurrency.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 并发工具调用吞吐基准，对比在事件循环中直接调用SDK与线程池执行层
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from mock_live_server import MockLiveServer  # noqa: E402
+
+
+def configure(endpoint: str) -> None:
+    """将客户端指向本地桩服务，需在导入服务模块之前调用"""
+    os.environ.setdefault("TENCENTCLOUD_SECRET_ID", "AKIDbenchmark")
+    os.environ.setdefault("TENCENTCLOUD_SECRET_KEY", "benchmark")
+    os.environ["LIVE_ENDPOINT"] = endpoint
+    os.environ["TENCENTCLOUD_API_SCHEME"] = "http"
+    # 只测量调用本身，不受默认限流配额影响
+    os.environ["RATE_LIMIT_DEFAULT"] = "0"
+
+
+def stream_args(index: int) -> dict:
+    """每次调用使用不同的流名称，避免被请求合并和响应缓存折叠成一次上游请求"""
+    return {"app_name": "live", "domain_name": "bench.example.com", "stream_name": f"stream{index}"}
+
+
+async def run_inline(calls: int) -> float:
+    """在事件循环中直接调用同步SDK，模拟改造前的行为"""
+    from tools.live_api import LiveClient
+
+    async def one(index: int):
+        LiveClient().describe_live_stream_state(**stream_args(index))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return time.perf_counter() - start
+
+
+async def run_tools(calls: int) -> float:
+    """通过MCP工具并发调用，SDK调用在线程池中执行"""
+    from server import mcp
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        mcp.call_tool("describe_live_stream_state", stream_args(i)) for i in range(calls)
+    ))
+    return time.perf_counter() - start
+
+
+def main():
+    """运行基准测试"""
+    parser = argparse.ArgumentParser(description="并发工具调用吞吐基准")
+    parser.add_argument("--calls", type=int, default=64, help="并发调用数")
+    parser.add_argument("--latency", type=float, default=0.05, help="桩服务每个请求的延迟(秒)")
+    args = parser.parse_args()
+
+    stub = MockLiveServer(latency=args.latency).start()
+    configure(stub.endpoint)
+    try:
+        for name, runner in (("inline", run_inline), ("executor", run_tools)):
+            elapsed = asyncio.run(runner(args.calls))
+            print(f"{name:>9}: {args.calls} calls in {elapsed:.3f}s, "
+                  f"{args.calls / elapsed:.1f} calls/s")
+    finally:
+        stub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : bench_log_redaction.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 日志脱敏基准，对比call_api日志在不脱敏、脱敏和日志级别关闭时的单次耗时，并与一次API调用的耗时比较
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from mock_live_server import MockLiveServer  # noqa: E402
+
+SECRET_KEY = "benchmark"
+
+SMALL_PARAMS = {"AppName": "live", "DomainName": "bench.example.com", "StreamName": "stream"}
+LARGE_PARAMS = {
+    "SourceType": "PullVodPushLive",
+    "SourceUrls": [f"http://vod.example.com/video_{i}.mp4?sign=abcdef{i}" for i in range(1000)],
+    "ToUrl": "rtmp://push.example.com/live/stream?txSecret=0123456789abcdef&txTime=6A1B2C3D",
+}
+
+
+def build_logger(name: str, redaction: bool) -> logging.Logger:
+    """创建写入/dev/null的记录器，redaction为True时使用与服务相同的脱敏过滤器"""
+    from utils.redaction import RedactionFilter
+
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler = logging.StreamHandler(open(os.devnull, "w", encoding="utf-8"))  # pylint: disable=consider-using-with
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    if redaction:
+        handler.addFilter(RedactionFilter())
+    logger.addHandler(handler)
+    return logger
+
+
+def per_call_us(logger: logging.Logger, level: int, params, repeat: int) -> float:
+    """单次记录call_api日志的耗时(微秒)"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        logger.log(level, "调用API: %s, 参数: %s", "DescribeLiveStreamState", params)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def api_call_us(calls: int) -> float:
+    """通过异步客户端调用桩服务的平均耗时(微秒)"""
+    from tools.live_api import AsyncLiveClient
+
+    client = AsyncLiveClient()
+    await client.call_api("DescribeLiveStreamState", dict(SMALL_PARAMS))
+    start = time.perf_counter()
+    for _ in range(calls):
+        await client.call_api("DescribeLiveStreamState", dict(SMALL_PARAMS))
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    """运行基准测试"""
+    parser = argparse.ArgumentParser(description="日志脱敏基准")
+    parser.add_argument("--repeat", type=int, default=20_000, help="每种情况的日志次数")
+    parser.add_argument("--calls", type=int, default=500, help="API调用次数")
+    args = parser.parse_args()
+
+    server = MockLiveServer(latency=0.0, secret_key=SECRET_KEY).start()
+    os.environ.update({
+        "TENCENTCLOUD_SECRET_ID": "AKIDbenchmark",
+        "TENCENTCLOUD_SECRET_KEY": SECRET_KEY,
+        "TENCENTCLOUD_API_SCHEME": "http",
+        "LIVE_ENDPOINT": server.endpoint,
+        "RATE_LIMIT_DEFAULT": "0",
+        "LOG_LEVEL": "WARNING",
+    })
+
+    plain = build_logger("bench.plain", redaction=False)
+    redacted = build_logger("bench.redacted", redaction=True)
+    large_repeat = max(1, args.repeat // 100)
+    rows = [
+        ("small params, plain", per_call_us(plain, logging.INFO, SMALL_PARAMS, args.repeat)),
+        ("small params, redacted", per_call_us(redacted, logging.INFO, SMALL_PARAMS, args.repeat)),
+        ("large params, plain", per_call_us(plain, logging.INFO, LARGE_PARAMS, large_repeat)),
+        ("large params, redacted", per_call_us(redacted, logging.INFO, LARGE_PARAMS, large_repeat)),
+        ("level disabled", per_call_us(redacted, logging.DEBUG, LARGE_PARAMS, args.repeat)),
+    ]
+    api_us = asyncio.run(api_call_us(args.calls))
+    server.stop()
+
+    for label, us in rows:
+        print(f"  {label:<24} {us:9.2f} us/log  ({us / api_us:6.2%} of one call_api)")
+    print(f"  call_api against local mock: {api_us:9.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
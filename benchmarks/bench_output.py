@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : bench_output.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 工具返回值序列化基准，对比缩进输出、紧凑输出和字段裁剪的响应字节数与序列化耗时
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from utils.output import dumps, encoder_name, render  # noqa: E402
+
+
+def online_list(size: int):
+    """DescribeLiveStreamOnlineList响应"""
+    return {"Response": {
+        "TotalNum": size,
+        "TotalPage": 1,
+        "PageNum": 1,
+        "PageSize": size,
+        "OnlineInfo": [
+            {
+                "StreamName": f"stream_{i}",
+                "AppName": "live",
+                "DomainName": "5000.livepush.myqcloud.com",
+                "PublishTimeList": [{"PublishTime": "2026-10-17T00:00:00Z"}],
+            }
+            for i in range(size)
+        ],
+        "RequestId": str(uuid.uuid4()),
+    }}
+
+
+def pull_stream_tasks(size: int):
+    """DescribeLivePullStreamTasks响应"""
+    return {"Response": {
+        "TotalNum": size,
+        "TotalPage": 1,
+        "PageNum": 1,
+        "PageSize": size,
+        "LimitTaskNum": 100,
+        "TaskInfos": [
+            {
+                "TaskId": str(1000 + i),
+                "TaskName": f"任务{i}",
+                "SourceType": "PullLivePushLive",
+                "SourceUrls": [f"rtmp://source.example.com/live/src_{i}"],
+                "DomainName": "5000.livepush.myqcloud.com",
+                "AppName": "live",
+                "StreamName": f"stream_{i}",
+                "ToUrl": f"rtmp://5000.livepush.myqcloud.com/live/stream_{i}?txSecret=abc&txTime=6A1B2C3D",
+                "Region": "ap-guangzhou",
+                "StartTime": "2026-10-17T00:00:00Z",
+                "EndTime": "2026-10-24T00:00:00Z",
+                "Status": "active",
+                "CreateTime": "2026-10-16T08:00:00Z",
+                "UpdateTime": "2026-10-16T08:00:00Z",
+                "CreateBy": "API",
+                "UpdateBy": "API",
+                "CallbackUrl": "",
+                "CallbackEvents": ["TaskStart", "TaskExit", "VodSourceFileStart", "VodSourceFileFinish"],
+                "CallBackExtInfo": "",
+                "VodLoopTimes": -1,
+                "VodRefreshType": "ImmediateNewSource",
+                "FileIndex": 1,
+                "OffsetTime": 0,
+                "Comment": "",
+                "BackupSourceType": "",
+                "BackupSourceUrl": "",
+                "WatermarkList": [],
+                "VodLocalMode": 0,
+                "RecentPullInfo": {
+                    "FileUrl": f"rtmp://source.example.com/live/src_{i}",
+                    "OffsetTime": 0,
+                    "ReportTime": "2026-10-17T00:00:00Z",
+                    "LoopedTimes": 0,
+                },
+            }
+            for i in range(size)
+        ],
+        "RequestId": str(uuid.uuid4()),
+    }}
+
+
+def stream_events(size: int):
+    """DescribeLiveStreamEventList响应"""
+    return {"Response": {
+        "TotalNum": size,
+        "TotalPage": 1,
+        "PageNum": 1,
+        "PageSize": size,
+        "EventList": [
+            {
+                "StreamName": f"stream_{i % 20}",
+                "AppName": "live",
+                "DomainName": "5000.livepush.myqcloud.com",
+                "StreamStartTime": "2026-10-17T00:00:00Z",
+                "StreamEndTime": "2026-10-17T00:10:00Z",
+                "StopReason": "用户主动停止",
+                "Duration": 600,
+                "ClientIp": "10.0.0.1",
+                "Resolution": "1920*1080",
+            }
+            for i in range(size)
+        ],
+        "RequestId": str(uuid.uuid4()),
+    }}
+
+
+CASES = [
+    ("describe_live_stream_online_list", online_list, "OnlineInfo.StreamName,TotalNum"),
+    ("describe_live_pull_stream_tasks", pull_stream_tasks, "TaskInfos.TaskId,TaskInfos.StreamName,TaskInfos.Status"),
+    ("describe_live_stream_event_list", stream_events,
+     "EventList.StreamName,EventList.StreamStartTime,EventList.StreamEndTime,EventList.StopReason"),
+]
+
+
+def measure(func, repeat: int):
+    """返回(输出字节数, 单次耗时毫秒)"""
+    output = func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+    return len(output.encode()), elapsed * 1000
+
+
+def main():
+    """运行基准测试"""
+    parser = argparse.ArgumentParser(description="工具返回值序列化基准")
+    parser.add_argument("--size", type=int, default=100, help="每个响应的列表长度")
+    parser.add_argument("--repeat", type=int, default=200, help="每种输出方式的重复次数")
+    args = parser.parse_args()
+
+    print(f"encoder: {encoder_name()}, size: {args.size}")
+    for name, build, fields in CASES:
+        data = build(args.size)
+        variants = [
+            ("indent", lambda: json.dumps(data, ensure_ascii=False, indent=2)),
+            ("compact", lambda: dumps(data, pretty=False)),
+            ("fields", lambda: render(data, fields)),
+        ]
+        baseline = None
+        print(f"  {name}")
+        for label, func in variants:
+            size, ms = measure(func, args.repeat)
+            if baseline is None:
+                baseline = size
+            print(f"    {label:<8} {size:>8,} bytes ({size / baseline:6.1%})  {ms:7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : bench_startup.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 冷启动基准，每轮启动新进程，统计导入server模块、stdio启动到首次list_tools和首次工具调用成功的耗时，
+           中位数超过预算时退出码为1
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+sys.path.insert(0, BENCH_DIR)
+
+from mcp import ClientSession, StdioServerParameters  # noqa: E402
+from mcp.client.stdio import stdio_client  # noqa: E402
+
+from mock_live_server import MockLiveServer  # noqa: E402
+
+SECRET_KEY = "bench-startup"
+# 首次调用使用同步SDK客户端的工具，包含SDK的延迟导入和客户端创建
+FIRST_TOOL = "describe_live_domain"
+FIRST_ARGS = {"domain_name": "play.example.com"}
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import server; print(time.perf_counter() - t)"
+
+
+def import_seconds(env: Dict[str, str]) -> float:
+    """在新进程中导入server模块的耗时，不含解释器启动"""
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET], cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+async def session_seconds(env: Dict[str, str]) -> Dict[str, float]:
+    """从启动stdio服务进程开始计时，到完成初始化、首次list_tools和首次工具调用成功的耗时"""
+    params = StdioServerParameters(command=sys.executable, args=[os.path.join(SRC_DIR, "server.py")], env=env)
+    started = time.perf_counter()
+    with open(os.devnull, "w", encoding="utf-8") as errlog:
+        async with stdio_client(params, errlog=errlog) as streams:
+            async with ClientSession(streams[0], streams[1]) as session:
+                await session.initialize()
+                initialized = time.perf_counter() - started
+                tools = await session.list_tools()
+                listed = time.perf_counter() - started
+                result = await session.call_tool(FIRST_TOOL, FIRST_ARGS)
+                called = time.perf_counter() - started
+    text = result.content[0].text if result.content else ""
+    if result.isError or '"error"' in text:
+        raise RuntimeError(f"{FIRST_TOOL} 调用失败: {text}")
+    if not tools.tools:
+        raise RuntimeError("list_tools 没有返回工具")
+    return {"initialize": initialized, "list_tools": listed, "first_call": called}
+
+
+def main():
+    """运行基准测试"""
+    parser = argparse.ArgumentParser(description="冷启动基准")
+    parser.add_argument("--runs", type=int, default=5, help="启动次数，取中位数")
+    parser.add_argument("--budget-import", type=float, default=1.0, help="导入server模块的预算(秒)")
+    parser.add_argument("--budget-list-tools", type=float, default=2.0, help="启动到首次list_tools的预算(秒)")
+    parser.add_argument("--budget-first-call", type=float, default=2.5, help="启动到首次工具调用成功的预算(秒)")
+    args = parser.parse_args()
+
+    upstream = MockLiveServer(latency=0.0, secret_key=SECRET_KEY).start()
+    workdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+    env = dict(
+        os.environ,
+        TENCENTCLOUD_SECRET_ID="AKIDbenchstartup",
+        TENCENTCLOUD_SECRET_KEY=SECRET_KEY,
+        TENCENTCLOUD_API_SCHEME="http",
+        LIVE_ENDPOINT=upstream.endpoint,
+        LOG_LEVEL="WARNING",
+        EVENT_STORE_PATH=os.path.join(workdir.name, "events.sqlite3"),
+        EVENT_STORE_SYNC_INTERVAL="0",
+    )
+    samples: Dict[str, List[float]] = {"import": [], "initialize": [], "list_tools": [], "first_call": []}
+    try:
+        for _ in range(max(1, args.runs)):
+            samples["import"].append(import_seconds(env))
+            for key, value in asyncio.run(session_seconds(env)).items():
+                samples[key].append(value)
+    finally:
+        upstream.stop()
+        workdir.cleanup()
+
+    budgets = {"import": args.budget_import, "list_tools": args.budget_list_tools, "first_call": args.budget_first_call}
+    over = 0
+    print(f"冷启动 ({len(samples['import'])}次，中位数)")
+    for key, values in samples.items():
+        median = statistics.median(values)
+        budget = budgets.get(key)
+        status = ""
+        if budget is not None:
+            status = f"  预算 {budget * 1000:.0f}ms"
+            if median > budget:
+                status += "  超出预算"
+                over += 1
+        print(f"  {key:<12} {median * 1000:8.1f}ms  (min {min(values) * 1000:.1f}ms){status}")
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : bench_tools.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : MCP工具基准，以进程内、SSE和stdio三种方式调用每个工具，统计吞吐、p50/p99延迟和内存，
+           结果写入JSON文件，可与之前的结果对比发现性能退化
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from mcp import ClientSession, StdioServerParameters  # noqa: E402
+from mcp.client.sse import sse_client  # noqa: E402
+from mcp.client.stdio import stdio_client  # noqa: E402
+
+from load_test import free_port, percentile, start_server, wait_port  # noqa: E402
+from mock_live_server import MockLiveServer  # noqa: E402
+
+SECRET_KEY = "bench-tools"
+MODES = ("inprocess", "sse", "stdio")
+
+PUSH_DOMAIN = "push.example.com"
+PLAY_DOMAIN = "play.example.com"
+STREAM = {"app_name": "live", "domain_name": PUSH_DOMAIN, "stream_name": "stream"}
+STREAMS = [{"app_name": "live", "domain_name": PUSH_DOMAIN, "stream_name": f"stream_{i}"} for i in range(20)]
+TIME_RANGE = {"start_time": "2026-10-16T00:00:00Z", "end_time": "2026-10-17T00:00:00Z"}
+
+# 每个工具的调用参数，写操作同样只发往本地桩服务
+TOOL_CASES: Dict[str, Dict[str, Any]] = {
+    "describe_rtmp_addr": dict(STREAM),
+    "describe_play_addr": dict(STREAM, domain_name=PLAY_DOMAIN),
+    "batch_describe_stream_addrs": {
+        "streams": [{"app_name": "live", "stream_name": f"stream_{i}"} for i in range(20)],
+        "push_domain_name": PUSH_DOMAIN,
+        "play_domain_name": PLAY_DOMAIN,
+    },
+    "invalidate_auth_key_cache": {"domain_name": PLAY_DOMAIN},
+    "add_live_domain": {"domain_name": "new.example.com", "domain_type": 1},
+    "delete_live_domain": {"domain_name": "new.example.com", "domain_type": 1},
+    "enable_live_domain": {"domain_name": PLAY_DOMAIN},
+    "forbid_live_domain": {"domain_name": PLAY_DOMAIN},
+    "describe_live_domain": {"domain_name": PLAY_DOMAIN},
+    "describe_live_domains": {"page_num": 1, "page_size": 100},
+    "delete_live_pull_stream_task": {"task_id": "task_0", "operator": "bench"},
+    "describe_live_pull_stream_tasks": {"page_num": 1, "page_size": 20},
+    "create_live_pull_stream_task": {
+        "source_type": "PullVodPushLive",
+        "source_urls": ["http://vod.example.com/video.mp4"],
+        "domain_name": PUSH_DOMAIN,
+        "app_name": "live",
+        "stream_name": "stream",
+        "start_time": "2026-10-17T00:00:00Z",
+        "end_time": "2026-10-18T00:00:00Z",
+        "operator": "bench",
+    },
+    "modify_live_pull_stream_task": {"task_id": "task_0", "operator": "bench", "status": "pause"},
+    "describe_live_stream_state": dict(STREAM),
+    "describe_live_stream_online_list": {"domain_name": PUSH_DOMAIN, "app_name": "live", "stream_name": None,
+                                         "page_num": 1, "page_size": 100},
+    "describe_all_online_streams": {"domain_name": PUSH_DOMAIN, "group_by": "AppName"},
+    "drop_live_stream": dict(STREAM),
+    "resume_live_stream": dict(STREAM),
+    "forbid_live_stream": dict(STREAM, reason="bench"),
+    "batch_drop_live_stream": {"streams": STREAMS, "rate": 0},
+    "batch_resume_live_stream": {"streams": STREAMS, "rate": 0},
+    "batch_forbid_live_stream": {"streams": STREAMS, "reason": "bench", "rate": 0},
+    "describe_live_stream_event_list": dict(TIME_RANGE, domain_name=PUSH_DOMAIN, page_num=1, page_size=100),
+    "describe_all_live_stream_events": dict(
+        TIME_RANGE, domain_name=PUSH_DOMAIN, group_by="StreamName", metrics="Duration", top_n=5, top_by="Duration"
+    ),
+    "sync_stream_events": {"domain_name": PUSH_DOMAIN},
+    "query_stored_stream_events": dict(TIME_RANGE, domain_name=PUSH_DOMAIN, limit=100),
+    "add_delay_live_stream": dict(STREAM, delay_time="30"),
+    "resume_delay_live_stream": dict(STREAM),
+    "create_live_transcode_template": {"template_name": "bench", "video_bitrate": 1000},
+    "delete_live_transcode_template": {"template_id": 10000},
+    "create_live_transcode_rule": dict(STREAM, template_id=10000),
+    "delete_live_transcode_rule": dict(STREAM, template_id=10000),
+    "describe_server_diagnostics": {},
+    "describe_server_metrics": {},
+    "invalidate_response_cache": {"actions": ["DescribeLiveDomain"]},
+}
+
+# (工具名, 参数) -> (返回文本, 是否出错)
+CallTool = Callable[[str, Dict[str, Any]], Awaitable[tuple]]
+
+
+def _is_error(text: str) -> bool:
+    return text[:32].lstrip("{ \n").startswith('"error"')
+
+
+def process_rss_kb(pid: int) -> Dict[str, Optional[int]]:
+    """读取进程的常驻内存和峰值(KB)，非Linux时为None"""
+    result: Dict[str, Optional[int]] = {"rss_kb": None, "peak_rss_kb": None}
+    try:
+        with open(f"/proc/{pid}/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    result["rss_kb"] = int(line.split()[1])
+                elif line.startswith("VmHWM:"):
+                    result["peak_rss_kb"] = int(line.split()[1])
+    except OSError:
+        pass
+    return result
+
+
+def find_child_pid(marker: str) -> Optional[int]:
+    """在当前进程的子进程中查找命令行包含marker的进程"""
+    parent = str(os.getpid())
+    try:
+        pids = [name for name in os.listdir("/proc") if name.isdigit()]
+    except OSError:
+        return None
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+                ppid = f.read().rsplit(")", 1)[1].split()[1]
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read().decode("utf-8", "replace")
+        except (OSError, IndexError):
+            continue
+        if ppid == parent and marker in cmdline:
+            return int(pid)
+    return None
+
+
+async def measure(call: CallTool, tool: str, arguments: Dict[str, Any], iterations: int,
+                  concurrency: int) -> Dict[str, Any]:
+    """并发调用工具，统计吞吐和延迟"""
+    latencies: List[float] = []
+    errors = 0
+    remaining = iterations
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            _, failed = await call(tool, arguments)
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    # 预热一次，排除首次创建客户端和连接的开销
+    text, failed = await call(tool, arguments)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    elapsed = time.perf_counter() - start
+    result = {
+        "calls": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "response_bytes": len(text.encode("utf-8")),
+    }
+    if failed:
+        result["sample_error"] = text[:200]
+    return result
+
+
+async def bench_inprocess(tools: List[str], iterations: int, concurrency: int) -> Dict[str, Any]:
+    """在当前进程中直接调用FastMCP，内存为单次调用的tracemalloc分配峰值"""
+    import server  # pylint: disable=import-outside-toplevel
+
+    async def call(tool: str, arguments: Dict[str, Any]) -> tuple:
+        try:
+            text = (await server.mcp.call_tool(tool, arguments))[0].text
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            # 进程内调用没有请求上下文，工具出错时ctx.error会抛出异常
+            return repr(e), True
+        return text, _is_error(text)
+
+    results = {}
+    for tool in tools:
+        result = await measure(call, tool, TOOL_CASES[tool], iterations, concurrency)
+        tracemalloc.start()
+        await call(tool, TOOL_CASES[tool])
+        result["peak_alloc_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+        results[tool] = result
+    results["_process"] = {"peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss}
+    return results
+
+
+async def bench_session(session: ClientSession, pid: Optional[int], tools: List[str], iterations: int,
+                        concurrency: int) -> Dict[str, Any]:
+    """通过MCP客户端会话调用工具，内存为服务进程的常驻内存"""
+    async def call(tool: str, arguments: Dict[str, Any]) -> tuple:
+        response = await session.call_tool(tool, arguments)
+        text = response.content[0].text if response.content else ""
+        return text, bool(response.isError) or _is_error(text)
+
+    results = {}
+    for tool in tools:
+        results[tool] = await measure(call, tool, TOOL_CASES[tool], iterations, concurrency)
+        if pid is not None:
+            results[tool].update(process_rss_kb(pid))
+    if pid is not None:
+        results["_process"] = process_rss_kb(pid)
+    return results
+
+
+async def bench_sse(tools: List[str], iterations: int, concurrency: int, endpoint: str) -> Dict[str, Any]:
+    """启动SSE服务子进程并调用"""
+    port = free_port()
+    process = start_server("sse", 1, port, endpoint, secret_key=SECRET_KEY)
+    try:
+        wait_port(port)
+        async with sse_client(f"http://127.0.0.1:{port}/sse") as streams:
+            async with ClientSession(streams[0], streams[1]) as session:
+                await session.initialize()
+                return await bench_session(session, process.pid, tools, iterations, concurrency)
+    finally:
+        process.terminate()
+        process.wait(timeout=60)
+
+
+async def bench_stdio(tools: List[str], iterations: int, concurrency: int) -> Dict[str, Any]:
+    """以stdio子进程启动服务并调用"""
+    script = os.path.join(ROOT_DIR, "src", "server.py")
+    params = StdioServerParameters(command=sys.executable, args=[script], env=dict(os.environ))
+    with open(os.devnull, "w", encoding="utf-8") as errlog:
+        async with stdio_client(params, errlog=errlog) as streams:
+            async with ClientSession(streams[0], streams[1]) as session:
+                await session.initialize()
+                return await bench_session(session, find_child_pid(script), tools, iterations, concurrency)
+
+
+def git_revision() -> Optional[str]:
+    """当前提交，用于对比不同提交的结果"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """
+    与基线结果对比，输出p50/p99和吞吐的变化
+
+    Returns:
+        超过阈值的退化项数
+    """
+    regressions = 0
+    print(f"\n对比基线 {baseline['meta'].get('git_revision')} (阈值 {threshold:.0%})")
+    for mode, tools in current["results"].items():
+        for tool, result in tools.items():
+            base = baseline["results"].get(mode, {}).get(tool)
+            if tool.startswith("_") or not base:
+                continue
+            changes = []
+            for key, higher_is_worse in (("p50_ms", True), ("p99_ms", True), ("throughput_rps", False)):
+                if not base.get(key):
+                    continue
+                change = result[key] / base[key] - 1
+                worse = change > threshold if higher_is_worse else change < -threshold
+                regressions += worse
+                changes.append(f"{key}={change:+.1%}{' !' if worse else ''}")
+            print(f"  {mode:<10} {tool:<34} {'  '.join(changes)}")
+    return regressions
+
+
+def main():
+    """运行基准测试"""
+    parser = argparse.ArgumentParser(description="MCP工具基准")
+    parser.add_argument("--modes", type=str, default=",".join(MODES), help="逗号分隔的调用方式")
+    parser.add_argument("--tools", type=str, default="", help="逗号分隔的工具名，默认全部")
+    parser.add_argument("--iterations", type=int, default=50, help="每个工具的调用次数")
+    parser.add_argument("--concurrency", type=int, default=4, help="并发调用数")
+    parser.add_argument("--latency", type=float, default=0.0, help="桩服务每个请求的延迟(秒)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="桩服务随机返回错误的比例")
+    parser.add_argument("--online-streams", type=int, default=200, help="直播中的流数量")
+    parser.add_argument("--events-per-day", type=int, default=500, help="每天的推断流事件数量")
+    parser.add_argument("--domains", type=int, default=50, help="域名数量")
+    parser.add_argument("--pull-tasks", type=int, default=50, help="拉流转推任务数量")
+    parser.add_argument("--no-cache", action="store_true", help="关闭查询缓存，每次调用都请求桩服务")
+    parser.add_argument("--output", type=str, default="bench_tools.json", help="结果文件")
+    parser.add_argument("--baseline", type=str, default="", help="对比的基线结果文件")
+    parser.add_argument("--threshold", type=float, default=0.2, help="判定为退化的变化比例")
+    args = parser.parse_args()
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"未知的调用方式: {','.join(sorted(unknown))}")
+    tools = [tool.strip() for tool in args.tools.split(",") if tool.strip()] or list(TOOL_CASES)
+    unknown = set(tools) - set(TOOL_CASES)
+    if unknown:
+        parser.error(f"未知的工具: {','.join(sorted(unknown))}")
+
+    upstream = MockLiveServer(
+        latency=args.latency,
+        secret_key=SECRET_KEY,
+        online_streams=args.online_streams,
+        events_per_day=args.events_per_day,
+        domains=args.domains,
+        pull_tasks=args.pull_tasks,
+        error_rate=args.error_rate,
+        seed=0
+    ).start()
+    workdir = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+    # 子进程通过环境变量继承相同配置
+    os.environ.update({
+        "TENCENTCLOUD_SECRET_ID": "AKIDbenchtools",
+        "TENCENTCLOUD_SECRET_KEY": SECRET_KEY,
+        "TENCENTCLOUD_API_SCHEME": "http",
+        "LIVE_ENDPOINT": upstream.endpoint,
+        "RATE_LIMIT_DEFAULT": "0",
+        "LOG_LEVEL": "WARNING",
+        "EVENT_STORE_PATH": os.path.join(workdir.name, "events.sqlite3"),
+        "EVENT_STORE_SYNC_INTERVAL": "0",
+    })
+    if args.no_cache:
+        os.environ["RESPONSE_CACHE_MAX_ENTRIES"] = "0"
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": {},
+    }
+    try:
+        for mode in modes:
+            started = time.perf_counter()
+            if mode == "inprocess":
+                results = asyncio.run(bench_inprocess(tools, args.iterations, args.concurrency))
+            elif mode == "sse":
+                results = asyncio.run(bench_sse(tools, args.iterations, args.concurrency, upstream.endpoint))
+            else:
+                results = asyncio.run(bench_stdio(tools, args.iterations, args.concurrency))
+            report["results"][mode] = results
+            print(f"{mode} ({time.perf_counter() - started:.1f}s)")
+            for tool in tools:
+                r = results[tool]
+                print(f"  {tool:<34} {r['throughput_rps']:9.1f} req/s  p50={r['p50_ms']:8.2f}ms  "
+                      f"p99={r['p99_ms']:8.2f}ms  errors={r['errors']}")
+    finally:
+        upstream.stop()
+        workdir.cleanup()
+
+    report["meta"]["upstream_requests"] = upstream.request_count
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : bench_tracing.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 追踪开销基准，对比未启用和导出到JSONL时单个span及一次call_api的耗时
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from mock_live_server import MockLiveServer  # noqa: E402
+
+SECRET_KEY = "benchmark"
+PARAMS = {"AppName": "live", "DomainName": "bench.example.com", "StreamName": "stream"}
+
+
+def span_ns(tracer, repeat: int) -> float:
+    """创建并结束一个带属性的span的平均耗时(纳秒)"""
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        with tracer.span("bench", action="DescribeLiveStreamState") as span:
+            span.set_attribute("request_id", "x")
+    return (time.perf_counter_ns() - start) / repeat
+
+
+async def api_call_us(calls: int) -> float:
+    """通过异步客户端调用桩服务的平均耗时(微秒)，参数各不相同以绕过查询缓存"""
+    from tools.live_api import AsyncLiveClient
+
+    client = AsyncLiveClient()
+    await client.call_api("DescribeLiveStreamState", dict(PARAMS))
+    start = time.perf_counter()
+    for i in range(calls):
+        await client.call_api("DescribeLiveStreamState", dict(PARAMS, StreamName=f"stream{i}"))
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main():
+    """运行基准测试"""
+    parser = argparse.ArgumentParser(description="追踪开销基准")
+    parser.add_argument("--repeat", type=int, default=200_000, help="span次数")
+    parser.add_argument("--calls", type=int, default=500, help="API调用次数")
+    args = parser.parse_args()
+
+    server = MockLiveServer(latency=0.0, secret_key=SECRET_KEY).start()
+    os.environ.update({
+        "TENCENTCLOUD_SECRET_ID": "AKIDbenchmark",
+        "TENCENTCLOUD_SECRET_KEY": SECRET_KEY,
+        "TENCENTCLOUD_API_SCHEME": "http",
+        "LIVE_ENDPOINT": server.endpoint,
+        "RATE_LIMIT_DEFAULT": "0",
+        "LOG_LEVEL": "WARNING",
+    })
+    from utils.tracing import JsonlExporter, Tracer, tracer
+
+    with tempfile.TemporaryDirectory() as directory:
+        enabled = Tracer(JsonlExporter(os.path.join(directory, "traces.jsonl")))
+        print(f"  span, disabled           {span_ns(Tracer(), args.repeat):9.1f} ns")
+        print(f"  span, jsonl              {span_ns(enabled, args.repeat // 10):9.1f} ns")
+
+        disabled_us = asyncio.run(api_call_us(args.calls))
+        tracer.exporter = enabled.exporter
+        enabled_us = asyncio.run(api_call_us(args.calls))
+        tracer.exporter = None
+        enabled.shutdown()
+    server.stop()
+
+    print(f"  call_api, disabled       {disabled_us:9.2f} us/call")
+    print(f"  call_api, jsonl          {enabled_us:9.2f} us/call  (+{enabled_us - disabled_us:.2f} us)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : bench_url_signer.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 批量推流/播放地址签名基准，单核目标10万签名/秒
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), "src"))
+
+from tools.url_signer import StreamUrlSigner, sign_batch  # noqa: E402
+
+# 按签名(md5)次数计算：同一流的多个播放地址共用一个签名，按地址数计算会高估吞吐
+TARGET_SIGNATURES_PER_SECOND = 100_000
+
+
+def legacy_play_urls(domain_name: str, auth_key: str, app_name: str, stream_name: str, expire_days: int):
+    """改造前逐个拼接地址的写法，作为对照"""
+    future = time.time() + expire_days * 86400
+    hex_timestamp = format(int(hex(int(future)), 16), 'X')
+    md5_hash = hashlib.md5()
+    md5_hash.update((auth_key + stream_name + hex_timestamp).encode('utf-8'))
+    basic_addr = '://' + domain_name + '/' + app_name + '/' + stream_name
+    basic_addr += '?' + 'txSecret=' + md5_hash.hexdigest() + '&' + 'txTime=' + hex_timestamp
+    return 'rtmp' + basic_addr, 'http' + basic_addr + '.flv', 'http' + basic_addr + '.m3u8'
+
+
+def main():
+    """运行基准测试"""
+    parser = argparse.ArgumentParser(description="批量地址签名基准")
+    parser.add_argument("--streams", type=int, default=50_000, help="流数量")
+    args = parser.parse_args()
+
+    streams = [{"app_name": "live", "stream_name": f"stream_{i}", "expire_time": 1 + i % 7}
+               for i in range(args.streams)]
+
+    start = time.perf_counter()
+    for item in streams:
+        legacy_play_urls("play.example.com", "play-key", item["app_name"], item["stream_name"], item["expire_time"])
+    legacy_elapsed = time.perf_counter() - start
+    # 每个流签名1次
+    legacy_rate = args.streams / legacy_elapsed
+
+    push_signer = StreamUrlSigner("push.example.com", "push-key")
+    play_signer = StreamUrlSigner("play.example.com", "play-key")
+    start = time.perf_counter()
+    results = sign_batch(streams, push_signer=push_signer, play_signer=play_signer)
+    elapsed = time.perf_counter() - start
+    # 每个流签名2次：推流地址1次，4个播放地址共用1次
+    signatures = len(results) * 2
+    rate = signatures / elapsed
+
+    print(f"  legacy: {args.streams} signatures ({args.streams * 3} urls) in {legacy_elapsed:.3f}s, "
+          f"{legacy_rate:,.0f} signatures/s")
+    print(f"  signer: {signatures} signatures ({len(results) * 5} urls) in {elapsed:.3f}s, "
+          f"{rate:,.0f} signatures/s (target {TARGET_SIGNATURES_PER_SECOND:,} signatures/s: "
+          f"{'PASS' if rate >= TARGET_SIGNATURES_PER_SECOND else 'FAIL'})")
+
+
+if __name__ == "__main__":
+    main()
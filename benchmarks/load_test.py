@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : load_test.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : HTTP传输压测，按工作进程数分别启动服务，多个MCP客户端持续调用工具，统计每秒请求数和p50/p99延迟
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, "src"))
+sys.path.insert(0, BENCH_DIR)
+
+from mcp import ClientSession  # noqa: E402
+from mcp.client.sse import sse_client  # noqa: E402
+from mcp.client.streamable_http import streamablehttp_client  # noqa: E402
+
+from mock_live_server import MockLiveServer  # noqa: E402
+
+SECRET_KEY = "load-test"
+TOOL_ARGS = {"app_name": "live", "domain_name": "bench.example.com", "stream_name": "stream"}
+
+
+def free_port() -> int:
+    """获取一个空闲端口"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_port(port: int, timeout: float = 30.0) -> None:
+    """等待服务开始监听"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"服务未在{timeout}秒内启动: {port}")
+
+
+def start_server(
+        transport: str,
+        workers: int,
+        port: int,
+        endpoint: str,
+        secret_key: str = SECRET_KEY
+) -> subprocess.Popen:
+    """以子进程启动MCP服务，secret_key需与桩服务一致"""
+    env = dict(
+        os.environ,
+        TENCENTCLOUD_SECRET_ID="AKIDloadtest",
+        TENCENTCLOUD_SECRET_KEY=secret_key,
+        TENCENTCLOUD_API_SCHEME="http",
+        LIVE_ENDPOINT=endpoint,
+        RATE_LIMIT_DEFAULT="0",
+    )
+    return subprocess.Popen(
+        [sys.executable, os.path.join(ROOT_DIR, "src", "server.py"),
+         "--transport", transport, "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def connect(transport: str, port: int):
+    """创建对应传输的客户端连接"""
+    if transport == "sse":
+        return sse_client(f"http://127.0.0.1:{port}/sse")
+    return streamablehttp_client(f"http://127.0.0.1:{port}/mcp")
+
+
+async def client_loop(
+        transport: str,
+        port: int,
+        tool: str,
+        deadline: float,
+        latencies: List[float],
+        errors: List[str]
+) -> None:
+    """单个客户端持续调用工具直到截止时间，工具返回错误时记录错误内容"""
+    async with connect(transport, port) as streams:
+        async with ClientSession(streams[0], streams[1]) as session:
+            await session.initialize()
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                result = await session.call_tool(tool, TOOL_ARGS)
+                latencies.append(time.perf_counter() - start)
+                text = result.content[0].text if result.content else ""
+                if result.isError or '"error"' in text:
+                    errors.append(text)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_load(
+        transport: str,
+        port: int,
+        tool: str,
+        clients: int,
+        duration: float
+) -> Tuple[List[float], List[str]]:
+    """并发运行多个客户端，返回每次调用的延迟和错误"""
+    latencies: List[float] = []
+    errors: List[str] = []
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(
+        client_loop(transport, port, tool, deadline, latencies, errors) for _ in range(clients)
+    ))
+    return latencies, errors
+
+
+def main():
+    """运行压测"""
+    parser = argparse.ArgumentParser(description="HTTP传输压测")
+    parser.add_argument("--transport", choices=["sse", "streamable-http"], default="streamable-http",
+                        help="传输方式，sse只支持单进程")
+    parser.add_argument("--workers", type=str, default="1,2,4", help="逗号分隔的工作进程数")
+    parser.add_argument("--clients", type=int, default=32, help="并发客户端数")
+    parser.add_argument("--duration", type=float, default=10.0, help="每轮压测时长(秒)")
+    parser.add_argument("--latency", type=float, default=0.02, help="桩服务每个请求的延迟(秒)")
+    parser.add_argument("--tool", type=str, default="describe_live_stream_state", help="调用的工具")
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(",") if w.strip()]
+    if args.transport == "sse" and any(w > 1 for w in worker_counts):
+        # 服务端会把sse多进程改回单进程，继续压测得到的并不是所要求的进程数
+        parser.error("sse只支持单进程，多进程压测请使用streamable-http")
+
+    upstream = MockLiveServer(latency=args.latency, secret_key=SECRET_KEY).start()
+    failed = False
+    print(f"transport: {args.transport}, clients: {args.clients}, duration: {args.duration}s, "
+          f"upstream latency: {args.latency * 1000:.0f}ms")
+    for workers in worker_counts:
+        port = free_port()
+        server = start_server(args.transport, workers, port, upstream.endpoint)
+        try:
+            wait_port(port)
+            latencies, errors = asyncio.run(run_load(args.transport, port, args.tool, args.clients, args.duration))
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+        rps = len(latencies) / args.duration
+        print(f"  workers={workers:<3} requests={len(latencies):<7} {rps:9.1f} req/s  "
+              f"p50={percentile(latencies, 50) * 1000:7.1f}ms  p99={percentile(latencies, 99) * 1000:7.1f}ms  "
+              f"errors={len(errors)}")
+        if errors:
+            print(f"    首个错误: {errors[0][:200]}")
+            failed = True
+    upstream.stop()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
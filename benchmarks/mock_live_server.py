@@ -0,0 +1,430 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : mock_live_server.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 本地腾讯云直播API桩服务，覆盖LiveClient使用的全部操作，可配置延迟、错误和分页数量，用于基准测试
+"""
+
+import argparse
+import calendar
+import hashlib
+import hmac
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+SECONDS_PER_DAY = 86400
+# 桩服务生成的推断流事件持续时间(秒)
+EVENT_DURATION = 600
+
+
+def _parse_utc(value: str) -> float:
+    return calendar.timegm(time.strptime(value, "%Y-%m-%dT%H:%M:%SZ"))
+
+
+def _format_utc(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp))
+
+
+class MockLiveHandler(BaseHTTPRequestHandler):
+    """直播API桩服务请求处理器"""
+
+    protocol_version = "HTTP/1.1"
+    # 避免响应头与响应体分两次发送时触发Nagle与延迟ACK叠加的40ms等待
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else b""
+        action = self.headers.get("X-TC-Action", "")
+        server: "MockLiveServer" = self.server  # type: ignore[assignment]
+
+        latency = server.action_latency.get(action, server.latency)
+        if latency > 0:
+            time.sleep(latency)
+
+        if server.secret_key and not server.verify_signature(self.command, dict(self.headers), body):
+            payload = server.error("AuthFailure.SignatureFailure", "签名校验失败")
+        else:
+            payload = server.handle(action, json.loads(body or b"{}"))
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class MockLiveServer(ThreadingHTTPServer):
+    """直播API桩服务"""
+
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(
+            self,
+            address: Tuple[str, int] = ("127.0.0.1", 0),
+            latency: float = 0.0,
+            secret_key: Optional[str] = None,
+            online_streams: int = 0,
+            events_per_day: int = 0,
+            domains: int = 0,
+            pull_tasks: int = 0,
+            error_rate: float = 0.0,
+            error_code: str = "InternalError",
+            action_errors: Optional[Dict[str, str]] = None,
+            action_latency: Optional[Dict[str, float]] = None,
+            seed: Optional[int] = None
+    ):
+        """
+        初始化桩服务
+
+        Args:
+            address: 监听地址，端口为0时自动分配
+            latency: 每个请求的模拟延迟(秒)
+            secret_key: 设置后校验TC3-HMAC-SHA256签名
+            online_streams: DescribeLiveStreamOnlineList返回的直播中流数量
+            events_per_day: DescribeLiveStreamEventList每天产生的推断流事件数量
+            domains: DescribeLiveDomains返回的域名数量
+            pull_tasks: DescribeLivePullStreamTasks返回的拉流转推任务数量
+            error_rate: 随机返回错误的比例
+            error_code: 随机返回的错误码，如InternalError、RequestLimitExceeded
+            action_errors: 按操作固定返回的错误码，如{"DropLiveStream": "ResourceNotFound.StreamNotExist"}
+            action_latency: 按操作覆盖的模拟延迟(秒)
+            seed: 随机错误的种子，固定后结果可复现
+        """
+        super().__init__(address, MockLiveHandler)
+        self.latency = latency
+        self.secret_key = secret_key
+        self.online_streams = online_streams
+        self.events_per_day = events_per_day
+        self.domains = domains
+        self.pull_tasks = pull_tasks
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.action_errors = dict(action_errors or {})
+        self.action_latency = dict(action_latency or {})
+        self.signature_failures = 0
+        self.request_count = 0
+        self.error_count = 0
+        self.action_counts: Dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._responses: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "DescribeLiveStreamOnlineList": self.online_list_page,
+            "DescribeLiveStreamEventList": self.event_list_page,
+            "DescribeLiveDomains": self.domain_list_page,
+            "DescribeLiveDomain": self.domain_info,
+            "DescribeLivePullStreamTasks": self.pull_task_page,
+            "DescribeLiveStreamState": lambda params: {"StreamState": "active"},
+            "DescribeLivePushAuthKey": self.push_auth_key,
+            "DescribeLivePlayAuthKey": self.play_auth_key,
+            "CreateLivePullStreamTask": lambda params: {"TaskId": uuid.uuid4().hex[:16]},
+            "CreateLiveTranscodeTemplate": lambda params: {"TemplateId": self._random.randint(10000, 99999)},
+        }
+        self._count_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        """返回host:port形式的端点"""
+        host, port = self.server_address[:2]
+        return f"{host}:{port}"
+
+    def verify_signature(self, method: str, headers: Dict[str, str], body: bytes) -> bool:
+        """
+        按TC3-HMAC-SHA256规则独立校验请求签名
+
+        Args:
+            method: HTTP方法
+            headers: 请求头
+            body: 请求体
+
+        Returns:
+            签名是否正确
+        """
+        headers = {k.lower(): v for k, v in headers.items()}
+        try:
+            auth = headers["authorization"]
+            algorithm, fields = auth.split(" ", 1)
+            parts = dict(item.strip().split("=", 1) for item in fields.split(","))
+            secret_id, date, service, _ = parts["Credential"].split("/")
+            signed_headers = parts["SignedHeaders"]
+            timestamp = headers["x-tc-timestamp"]
+        except (KeyError, ValueError):
+            return self._signature_failed()
+
+        canonical_headers = "".join(
+            f"{name}:{headers.get(name, '').strip().lower()}\n" for name in signed_headers.split(";")
+        )
+        canonical_request = "\n".join([
+            method, "/", "", canonical_headers, signed_headers, hashlib.sha256(body).hexdigest()
+        ])
+        string_to_sign = "\n".join([
+            algorithm, timestamp, f"{date}/{service}/tc3_request",
+            hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+        ])
+        key = ("TC3" + self.secret_key).encode("utf-8")
+        for msg in (date, service, "tc3_request"):
+            key = hmac.new(key, msg.encode("utf-8"), hashlib.sha256).digest()
+        expected = hmac.new(key, string_to_sign.encode("utf-8"), hashlib.sha256).hexdigest()
+        if not secret_id or not hmac.compare_digest(expected, parts.get("Signature", "")):
+            return self._signature_failed()
+        return True
+
+    def _signature_failed(self) -> bool:
+        with self._count_lock:
+            self.signature_failures += 1
+        return False
+
+    @staticmethod
+    def error(code: str, message: str) -> Dict[str, Any]:
+        """生成错误响应"""
+        return {"Response": {"Error": {"Code": code, "Message": message}, "RequestId": str(uuid.uuid4())}}
+
+    def handle(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        生成API响应
+
+        Args:
+            action: API操作名称
+            params: API参数
+
+        Returns:
+            API响应
+        """
+        with self._count_lock:
+            self.request_count += 1
+            self.action_counts[action] = self.action_counts.get(action, 0) + 1
+            code = self.action_errors.get(action)
+            if code is None and self.error_rate > 0 and self._random.random() < self.error_rate:
+                code = self.error_code
+            if code is not None:
+                self.error_count += 1
+        if code is not None:
+            return self.error(code, f"桩服务模拟的错误: {code}")
+        # 其余写操作只返回RequestId
+        response = self._responses.get(action, lambda params: {})(params)
+        return {"Response": dict(response, RequestId=str(uuid.uuid4()))}
+
+    @staticmethod
+    def _page(params: Dict[str, Any], total: int, page_key: str = "PageNum") -> Tuple[int, int, range]:
+        """返回页码、每页数量和当前页的序号范围"""
+        page_num = int(params.get(page_key) or 1)
+        page_size = int(params.get("PageSize") or 10)
+        start = (page_num - 1) * page_size
+        return page_num, page_size, range(start, max(start, min(start + page_size, total)))
+
+    def domain_list_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """按PageNum/PageSize生成域名列表"""
+        _, _, indexes = self._page(params, self.domains)
+        prefix = params.get("DomainPrefix") or ""
+        domain_list = [
+            {
+                "Name": f"{prefix}{i}.live.example.com",
+                "Type": i % 2,
+                "Status": 1,
+                "CreateTime": "2026-01-01 00:00:00",
+                "BCName": 1,
+                "TargetDomain": f"{prefix}{i}.live.example.com.livecdn.liveplay.myqcloud.com",
+                "PlayType": 1,
+                "IsDelayLive": 0,
+                "CurrentCName": f"{prefix}{i}.live.example.com.livecdn.liveplay.myqcloud.com",
+            }
+            for i in indexes
+        ]
+        return {"AllCount": self.domains, "DomainList": domain_list, "CreateLimitCount": 100}
+
+    @staticmethod
+    def domain_info(params: Dict[str, Any]) -> Dict[str, Any]:
+        """生成单个域名信息"""
+        name = params.get("DomainName") or "live.example.com"
+        return {"DomainInfo": {
+            "Name": name,
+            "Type": 1,
+            "Status": 1,
+            "CreateTime": "2026-01-01 00:00:00",
+            "BCName": 1,
+            "TargetDomain": f"{name}.livecdn.liveplay.myqcloud.com",
+            "PlayType": 1,
+            "IsDelayLive": 0,
+        }}
+
+    def pull_task_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """按PageNum/PageSize生成拉流转推任务"""
+        page_num, page_size, indexes = self._page(params, self.pull_tasks)
+        task_infos = [
+            {
+                "TaskId": f"task_{i}",
+                "SourceType": "PullVodPushLive",
+                "SourceUrls": [f"http://vod.example.com/video_{i}.mp4"],
+                "DomainName": "push.example.com",
+                "AppName": "live",
+                "StreamName": f"stream_{i}",
+                "ToUrl": f"rtmp://push.example.com/live/stream_{i}",
+                "StartTime": "2026-10-17T00:00:00Z",
+                "EndTime": "2026-10-18T00:00:00Z",
+                "Region": "ap-guangzhou",
+                "VodLoopTimes": -1,
+                "Status": "active",
+                "CreateBy": "bench",
+                "CreateTime": "2026-10-17T00:00:00Z",
+            }
+            for i in indexes
+        ]
+        return {
+            "TaskInfos": task_infos,
+            "PageNum": page_num,
+            "PageSize": page_size,
+            "TotalNum": self.pull_tasks,
+            "TotalPage": max(1, -(-self.pull_tasks // page_size)),
+            "LimitTaskNum": 1000,
+        }
+
+    @staticmethod
+    def push_auth_key(params: Dict[str, Any]) -> Dict[str, Any]:
+        """生成开启鉴权的推流鉴权key"""
+        return {"PushAuthKeyInfo": {
+            "DomainName": params.get("DomainName"),
+            "Enable": 1,
+            "MasterAuthKey": "mockmasterauthkey",
+            "BackupAuthKey": "mockbackupauthkey",
+            "AuthDelta": 3600,
+        }}
+
+    @staticmethod
+    def play_auth_key(params: Dict[str, Any]) -> Dict[str, Any]:
+        """生成开启鉴权的播放鉴权key"""
+        return {"PlayAuthKeyInfo": {
+            "DomainName": params.get("DomainName"),
+            "Enable": 1,
+            "AuthKey": "mockplayauthkey",
+            "AuthDelta": 3600,
+            "AuthBackKey": "mockplaybackkey",
+        }}
+
+    def online_list_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """按PageNumber/PageSize生成直播中的流"""
+        domain_name = params.get("DomainName") or "5000.livepush.myqcloud.com"
+        app_name = params.get("AppName") or "live"
+        page_num = int(params.get("PageNumber") or 1)
+        page_size = int(params.get("PageSize") or 10)
+        total_page = max(1, -(-self.online_streams // page_size))
+        start = (page_num - 1) * page_size
+        online_info = [
+            {
+                "StreamName": f"stream_{i}",
+                "AppName": app_name,
+                "DomainName": domain_name,
+                "PublishTimeList": [{"PublishTime": "2026-10-17T00:00:00Z"}],
+            }
+            for i in range(start, min(start + page_size, self.online_streams))
+        ]
+        return {
+            "OnlineInfo": online_info,
+            "PageNum": page_num,
+            "PageSize": page_size,
+            "TotalNum": self.online_streams,
+            "TotalPage": total_page,
+        }
+
+    def event_list_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        按固定间隔生成推断流事件，结束时间落在[StartTime, EndTime]内的事件符合条件
+
+        每个事件持续EVENT_DURATION秒，第k个事件的结束时间为k * 间隔 + EVENT_DURATION
+        """
+        page_num = int(params.get("PageNumber") or 1)
+        page_size = int(params.get("PageSize") or 10)
+        if self.events_per_day <= 0:
+            return {"EventList": [], "PageNum": page_num, "PageSize": page_size, "TotalNum": 0, "TotalPage": 1}
+
+        interval = SECONDS_PER_DAY / self.events_per_day
+        start = _parse_utc(params["StartTime"])
+        end = _parse_utc(params["EndTime"])
+        first = math.ceil((start - EVENT_DURATION) / interval)
+        last = math.floor((end - EVENT_DURATION) / interval)
+        total_num = max(0, last - first + 1)
+        offset = (page_num - 1) * page_size
+        indexes = range(first + offset, min(first + offset + page_size, last + 1))
+        if not params.get("IsAsc"):
+            indexes = range(last - offset, max(last - offset - page_size, first - 1), -1)
+        domain_name = params.get("DomainName") or "5000.livepush.myqcloud.com"
+        app_name = params.get("AppName") or "live"
+        event_list = [
+            {
+                "StreamName": params.get("StreamName") or f"stream_{k % 100}",
+                "AppName": app_name,
+                "DomainName": domain_name,
+                "StreamStartTime": _format_utc(k * interval),
+                "StreamEndTime": _format_utc(k * interval + EVENT_DURATION),
+                "StopReason": "NormalStop",
+                "Duration": EVENT_DURATION,
+                "ClientIp": "127.0.0.1",
+                "Resolution": "1920*1080",
+            }
+            for k in indexes
+        ]
+        return {
+            "EventList": event_list,
+            "PageNum": page_num,
+            "PageSize": page_size,
+            "TotalNum": total_num,
+            "TotalPage": max(1, -(-total_num // page_size)),
+        }
+
+    def start(self) -> "MockLiveServer":
+        """在后台线程中启动服务"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止服务"""
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    """命令行启动桩服务"""
+    parser = argparse.ArgumentParser(description="本地腾讯云直播API桩服务")
+    parser.add_argument("--port", type=int, default=18080, help="监听端口")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的模拟延迟(秒)")
+    parser.add_argument("--secret-key", type=str, default=None, help="设置后校验请求签名")
+    parser.add_argument("--online-streams", type=int, default=0, help="直播中的流数量")
+    parser.add_argument("--events-per-day", type=int, default=0, help="每天产生的推断流事件数量")
+    parser.add_argument("--domains", type=int, default=0, help="域名数量")
+    parser.add_argument("--pull-tasks", type=int, default=0, help="拉流转推任务数量")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="随机返回错误的比例")
+    parser.add_argument("--error-code", type=str, default="InternalError", help="随机返回的错误码")
+    parser.add_argument("--seed", type=int, default=None, help="随机错误的种子")
+    args = parser.parse_args()
+
+    server = MockLiveServer(
+        ("127.0.0.1", args.port),
+        latency=args.latency,
+        secret_key=args.secret_key,
+        online_streams=args.online_streams,
+        events_per_day=args.events_per_day,
+        domains=args.domains,
+        pull_tasks=args.pull_tasks,
+        error_rate=args.error_rate,
+        error_code=args.error_code,
+        seed=args.seed
+    )
+    print(f"mock live api listening on http://{server.endpoint}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,48 +10,73 @@
 """
 
 # 标准库导入
-import json
-import random
-import sys
-import time
-import hmac
-import base64
-import hashlib
-import requests
+import asyncio
+import os
 import argparse
-from datetime import datetime, timedelta
-import time
 
 # 第三方库导入
 from mcp.server.fastmcp import Context, FastMCP
 from pydantic import Field
 
 # 类型提示导入
-from typing import Dict, Any, List, Optional, Union
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Any, List, Optional
 
 # 本地模块导入
-from tools.live_api import LiveClient
-from utils.logger import setup_logger
+from tools import batch_ops, event_query, event_store, paginator
+from tools.aggregation import build_aggregator
+from tools.auth_key_cache import auth_key_cache
+from tools.live_api import ThreadedLiveClient
+from tools.url_signer import StreamUrlSigner, sign_batch, tx_time
+from utils.async_tencent_client import close_http_pools
+from utils.circuit_breaker import circuit_breakers
+from utils.client_pool import client_pool
+from utils import http_server
+from utils.executor import run_blocking
+from utils.fixtures import fixture_store
+from utils.lazy_tools import defer_tool_registration
+from utils.logger import configure_logging, setup_logger
+from utils.metrics import metrics as metrics_registry
+from utils.output import FIELDS_DESCRIPTION, render
 from utils.config import config
+from utils.rate_limiter import rate_limiter
+from utils.redaction import mask_secret_id
+from utils.response_cache import response_cache
+from utils.retry import retry_policy
+from utils.single_flight import single_flight
+from utils.tracing import tracer
 
 MCP_SERVER_NAME = "tencent-cloud-mcp-server"
 
 # 设置日志
 logger = setup_logger(MCP_SERVER_NAME)
 
-# MD5
-def md5_encrypt(input_string):
-    # 创建一个MD5哈希对象
-    md5_hash = hashlib.md5()
 
-    # 将输入字符串编码为字节
-    input_bytes = input_string.encode('utf-8')
 
-    # 更新哈希值
-    md5_hash.update(input_bytes)
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """服务生命周期，运行后台任务"""
+    async with event_store.background_sync():
+        yield
+
+
+@asynccontextmanager
+async def worker_background() -> AsyncIterator[None]:
+    """HTTP工作进程的后台任务，退出时关闭异步客户端的连接池"""
+    try:
+        async with event_store.background_sync():
+            yield
+    finally:
+        await close_http_pools()
+
+
+async def run_stdio() -> None:
+    """以stdio传输运行，退出时关闭异步客户端的连接池"""
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await close_http_pools()
 
-    # 获取十六进制格式的哈希值
-    return md5_hash.hexdigest()
 
 # 创建MCP服务器实例
 mcp = FastMCP(
@@ -68,8 +93,14 @@ mcp = FastMCP(
         "tencentcloud-sdk-python",
         "pydantic",
         "loguru"
-    ]
+    ],
+    lifespan=server_lifespan
 )
+# 工具在首次列出或调用时才生成参数模型和JSON Schema，缩短启动时间
+defer_tool_registration(mcp)
+# 统计全部工具的调用次数和耗时，启用追踪时记录调用链
+metrics_registry.instrument_tools(mcp)
+tracer.instrument_tools(mcp)
 
 
 # <---------------------获取推流地址---------------------> #
@@ -107,42 +138,26 @@ async def describe_rtmp_addr(
             RTMPAddr: RTMP地址
             请求ID
     """
-    logger.info(f"获取推流地址: domain_name={domain_name}, app_name={app_name},"
-                f"stream_name={stream_name}, expire_time={expire_time}")
+    logger.info("获取推流地址: domain_name=%s, app_name=%s,"
+                "stream_name=%s, expire_time=%s",
+                domain_name, app_name, stream_name, expire_time)
 
     try:
-        live_client = LiveClient()
-        # 获取鉴权key
-        result = live_client.describe_live_push_auth_key(
+        # 获取鉴权key，优先使用缓存
+        result = await auth_key_cache.get_push_auth_key(
             domain_name=domain_name
         )
-        logger.info(f"获取鉴权key: result={result}")
         # 主鉴权key
-        push_auth_key_info = result['Response']['PushAuthKeyInfo']
-        master_auth_key = push_auth_key_info['MasterAuthKey']
-        logger.info(f"push_auth_key_info={push_auth_key_info}, master_auth_key={master_auth_key}")
-        # UNIX时间戳
-        expire_delay = timedelta(days=expire_time)
-        future_time = datetime.now() + expire_delay
-        unix_timestamp = future_time.timestamp()
-        hex_timestamp = format(int(hex(int(unix_timestamp)), 16), 'X')
-        logger.info(f"过期时间的UNIX16进制时间戳：hex_timestamp={hex_timestamp}")
-        # MD5拼接
-        str_for_md5 = master_auth_key + stream_name + hex_timestamp
-        md5_str = md5_encrypt(str_for_md5)
-        logger.info(f"MD5拼接：{str_for_md5},txSecret={md5_str}")
-        # rtmp地址拼接
-        str_for_rtmp = ('rtmp://' + domain_name + '/' + app_name + '/'
-                        + stream_name + '?' + 'txSecret=' + md5_str + '&' + 'txTime=' + hex_timestamp)
-        logger.info(f"rtmp地址={str_for_rtmp}")
-        result['Response']['RTMPAddr'] = str_for_rtmp
+        master_auth_key = result['Response']['PushAuthKeyInfo']['MasterAuthKey']
+        signer = StreamUrlSigner(domain_name, master_auth_key)
+        result['Response']['RTMPAddr'] = signer.push_url(app_name, stream_name, tx_time(expire_time))
         # 返回result
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"获取推流地址失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # <---------------------获取播放地址---------------------> #
@@ -181,60 +196,140 @@ async def describe_play_addr(
             transcode_template: 转码模版ID(optional)
 
         Returns:
-            PushAuthKeyInfo: 推流鉴权key信息
+            PlayAuthKeyInfo: 播放鉴权key信息
             RTMPAddr: RTMP地址
+            FLVAddr: FLV地址
+            HLSAddr: HLS地址
+            WebRTCAddr: WebRTC地址
             请求ID
     """
-    logger.info(f"获取播放地址: domain_name={domain_name}, app_name={app_name},"
-                f"stream_name={stream_name}, expire_time={expire_time}")
+    logger.info("获取播放地址: domain_name=%s, app_name=%s,"
+                "stream_name=%s, expire_time=%s",
+                domain_name, app_name, stream_name, expire_time)
 
     try:
-        live_client = LiveClient()
-        # 获取鉴权key
-        result = live_client.describe_live_play_auth_key(
+        # 获取鉴权key，优先使用缓存
+        result = await auth_key_cache.get_play_auth_key(
             domain_name=domain_name
         )
-        logger.info(f"获取鉴权key: result={result}")
-
-        # rtmp地址拼接
-        basic_addr = '://' + domain_name + '/' + app_name + '/' + stream_name
-        # str_for_rtmp = ('rtmp://' + domain_name + '/' + app_name + '/' + stream_name)
-        # str_for_flv = ('http://' + domain_name + '/' + app_name + '/' + stream_name)
-        # str_for_hls = ('http://' + domain_name + '/' + app_name + '/' + stream_name)
-        if transcode_template is not None:
-            basic_addr += '_' + str(transcode_template)
-        if result['Response']['PlayAuthKeyInfo']['Enable'] is 1:
-            # 主鉴权key
-            play_auth_key_info = result['Response']['PlayAuthKeyInfo']
-            master_auth_key = play_auth_key_info['AuthKey']
-            logger.info(f"play_auth_key_info={play_auth_key_info}, master_auth_key={master_auth_key}")
-            # UNIX时间戳
-            expire_delay = timedelta(days=expire_time)
-            future_time = datetime.now() + expire_delay
-            unix_timestamp = future_time.timestamp()
-            hex_timestamp = format(int(hex(int(unix_timestamp)), 16), 'X')
-            logger.info(f"过期时间的UNIX16进制时间戳：hex_timestamp={hex_timestamp}")
-            # MD5拼接
-            str_for_md5 = master_auth_key + stream_name + hex_timestamp
-            md5_str = md5_encrypt(str_for_md5)
-            logger.info(f"MD5拼接：{str_for_md5}, txSecret={md5_str}")
-            basic_addr += '?' + 'txSecret=' + md5_str + '&' + 'txTime=' + hex_timestamp
-
-        str_for_rtmp = 'rtmp' + basic_addr
-        str_for_flv = 'http' + basic_addr + '.flv'
-        str_for_hls = 'http' + basic_addr + '.m3u8'
-
-        logger.info(f"rtmp地址={str_for_rtmp}, flv地址={str_for_flv}, hls地址={str_for_hls}")
-        result['Response']['RTMPAddr'] = str_for_rtmp
-        result['Response']['FLVAddr'] = str_for_flv
-        result['Response']['HLSAddr'] = str_for_hls
+
+        play_auth_key_info = result['Response']['PlayAuthKeyInfo']
+        # 未开启播放鉴权时生成不带签名的地址
+        auth_key = play_auth_key_info['AuthKey'] if play_auth_key_info['Enable'] == 1 else None
+        signer = StreamUrlSigner(domain_name, auth_key)
+        result['Response'].update(
+            signer.play_urls(app_name, stream_name, tx_time(expire_time), transcode_template)
+        )
         # 返回result
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"获取播放地址失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
+
+
+# 批量获取推流/播放地址
+@mcp.tool()
+async def batch_describe_stream_addrs(
+        ctx: Context,
+        streams: List[Dict[str, Any]] = Field(
+            default=None,
+            description="流列表，每项包含 app_name(默认live)、stream_name，"
+                        "可选 expire_time(过期天数，默认7)、transcode_template(转码模版)。"
+                        "示例值：[{\"app_name\": \"live\", \"stream_name\": \"stream1\", \"expire_time\": 1}]"
+        ),
+        push_domain_name: Optional[str] = Field(
+            default=None,
+            description="推流域名，填写后生成推流地址。示例值：5000.livepush.myqcloud.com"
+        ),
+        play_domain_name: Optional[str] = Field(
+            default=None,
+            description="播放域名，填写后生成RTMP/FLV/HLS/WebRTC播放地址。示例值：www.test.com"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
+        )
+) -> str:
+    """
+    批量获取推流/播放地址，每个域名只查询一次鉴权key
+
+        Args:
+            streams: 流列表
+            push_domain_name: 推流域名(optional)
+            play_domain_name: 播放域名(optional)
+            fields: 返回字段(optional)
+
+        Returns:
+            StreamAddrs: 每个流的推流地址PushAddr及播放地址RTMPAddr/FLVAddr/HLSAddr/WebRTCAddr，
+                Status为Success或Failed，失败时包含Error
+            TotalCount: 流数量
+            FailedCount: 失败数量
+    """
+    logger.info("批量获取推流/播放地址: push_domain_name=%s, "
+                "play_domain_name=%s, count=%s",
+                push_domain_name, play_domain_name, len(streams or []))
+
+    try:
+        push_signer = None
+        if push_domain_name:
+            push_result = await auth_key_cache.get_push_auth_key(domain_name=push_domain_name)
+            push_signer = StreamUrlSigner(
+                push_domain_name,
+                push_result['Response']['PushAuthKeyInfo']['MasterAuthKey']
+            )
+
+        play_signer = None
+        if play_domain_name:
+            play_result = await auth_key_cache.get_play_auth_key(domain_name=play_domain_name)
+            play_auth_key_info = play_result['Response']['PlayAuthKeyInfo']
+            play_signer = StreamUrlSigner(
+                play_domain_name,
+                play_auth_key_info['AuthKey'] if play_auth_key_info['Enable'] == 1 else None
+            )
+
+        addrs = sign_batch(streams or [], push_signer=push_signer, play_signer=play_signer)
+        return render({
+            "StreamAddrs": addrs,
+            "TotalCount": len(addrs),
+            "FailedCount": sum(1 for addr in addrs if addr["Status"] == "Failed"),
+        }, fields)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"批量获取推流/播放地址失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
+
+
+# 清除鉴权key缓存
+@mcp.tool()
+async def invalidate_auth_key_cache(
+        ctx: Context,
+        domain_name: Optional[str] = Field(
+            default=None,
+            description="域名名称，不填则清除全部域名的缓存。示例值：www.test.com"
+        )
+) -> str:
+    """
+    清除推流/播放鉴权key缓存，在控制台修改鉴权key后调用
+
+        Args:
+            domain_name: 域名(optional)
+
+        Returns:
+            缓存统计
+    """
+    logger.info("清除鉴权key缓存: domain_name=%s", domain_name)
+
+    try:
+        await auth_key_cache.invalidate(domain_name)
+        return render(auth_key_cache.stats())
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"清除鉴权key缓存失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
 
 
 # <---------------------域名管理---------------------> #
@@ -281,13 +376,14 @@ async def add_live_domain(
         Returns:
             请求ID
     """
-    logger.info(f"添加域名: domain_name={domain_name}, domain_type={domain_type}, play_type={play_type}, "
-                f"is_delay_live={is_delay_live}, is_mini_program_live={is_mini_program_live}, "
-                f"verify_owner_type={verify_owner_type}")
+    logger.info("添加域名: domain_name=%s, domain_type=%s, play_type=%s, "
+                "is_delay_live=%s, is_mini_program_live=%s, "
+                "verify_owner_type=%s",
+                domain_name, domain_type, play_type, is_delay_live, is_mini_program_live, verify_owner_type)
 
     try:
-        live_client = LiveClient()
-        result = live_client.add_live_domain(
+        live_client = ThreadedLiveClient()
+        result = await live_client.add_live_domain(
             domain_name=domain_name,
             domain_type=domain_type,
             play_type=play_type,
@@ -295,12 +391,12 @@ async def add_live_domain(
             is_mini_program_live=is_mini_program_live,
             verify_owner_type=verify_owner_type
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"添加域名失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 删除域名
@@ -326,20 +422,20 @@ async def delete_live_domain(
         Returns:
             请求ID
     """
-    logger.info(f"删除域名: domain_name={domain_name}, domain_type={domain_type}")
+    logger.info("删除域名: domain_name=%s, domain_type=%s", domain_name, domain_type)
 
     try:
-        live_client = LiveClient()
-        result = live_client.delete_live_domain(
+        live_client = ThreadedLiveClient()
+        result = await live_client.delete_live_domain(
             domain_name=domain_name,
             domain_type=domain_type
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"删除域名失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 启用域名
@@ -360,19 +456,19 @@ async def enable_live_domain(
         Returns:
             请求ID
     """
-    logger.info(f"删除域名: domain_name={domain_name}")
+    logger.info("删除域名: domain_name=%s", domain_name)
 
     try:
-        live_client = LiveClient()
-        result = live_client.enable_live_domain(
+        live_client = ThreadedLiveClient()
+        result = await live_client.enable_live_domain(
             domain_name=domain_name
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"启用域名失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 禁用域名
@@ -393,19 +489,19 @@ async def forbid_live_domain(
         Returns:
             请求ID
     """
-    logger.info(f"禁用域名: domain_name={domain_name}")
+    logger.info("禁用域名: domain_name=%s", domain_name)
 
     try:
-        live_client = LiveClient()
-        result = live_client.forbid_live_domain(
+        live_client = ThreadedLiveClient()
+        result = await live_client.forbid_live_domain(
             domain_name=domain_name
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"禁用域名失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 查询域名信息
@@ -415,6 +511,10 @@ async def describe_live_domain(
         domain_name: str = Field(
             default=None,
             description="域名名称。示例值：www.test.com"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
         )
 ) -> str:
     """
@@ -422,24 +522,25 @@ async def describe_live_domain(
 
         Args:
             domain_name: 推流域名
+            fields: 返回字段(optional)
 
         Returns:
             DomainInfo: 域名信息
             请求ID
     """
-    logger.info(f"查询域名信息: domain_name={domain_name}")
+    logger.info("查询域名信息: domain_name=%s", domain_name)
 
     try:
-        live_client = LiveClient()
-        result = live_client.describe_live_domain(
+        live_client = ThreadedLiveClient()
+        result = await live_client.describe_live_domain(
             domain_name=domain_name
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result, fields)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"查询域名信息失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 查询域名列表
@@ -473,6 +574,10 @@ async def describe_live_domains(
         play_type: Optional[int] = Field(
             default=None,
             description="播放区域，只在 DomainType=1 时该参数有意义。1: 国内。2: 全球。3: 海外。"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
         )
 ) -> str:
     """
@@ -486,6 +591,7 @@ async def describe_live_domains(
             is_delay_live: 普通直播/慢直播(optional)
             domain_prefix: 域名前缀(optional)
             play_type: 播放区域(optional)
+            fields: 返回字段(optional)
 
         Returns:
             AllCount: 总记录数
@@ -494,13 +600,14 @@ async def describe_live_domains(
             PlayTypeCount: 启用的播放域名加速区域统计
             请求ID
     """
-    logger.info(f"查询域名列表: domain_status={domain_status}, domain_type={domain_type}, page_size={page_size}, "
-                f"page_num={page_num}, is_delay_live={is_delay_live}, "
-                f"domain_prefix={domain_prefix}, play_type={play_type}")
+    logger.info("查询域名列表: domain_status=%s, domain_type=%s, page_size=%s, "
+                "page_num=%s, is_delay_live=%s, "
+                "domain_prefix=%s, play_type=%s",
+                domain_status, domain_type, page_size, page_num, is_delay_live, domain_prefix, play_type)
 
     try:
-        live_client = LiveClient()
-        result = live_client.describe_live_domains(
+        live_client = ThreadedLiveClient()
+        result = await live_client.describe_live_domains(
             domain_status=domain_status,
             domain_type=domain_type,
             page_size=page_size,
@@ -509,12 +616,12 @@ async def describe_live_domains(
             domain_prefix=domain_prefix,
             play_type=play_type
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result, fields)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"查询域名列表失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # <---------------------拉流转推---------------------> #
@@ -551,22 +658,23 @@ async def delete_live_pull_stream_task(
         Returns:
             请求ID
     """
-    logger.info(f"删除直播拉流任务: region={region}, task_id={task_id}, "
-                f"operator={operator}, specify_task_id={specify_task_id}")
+    logger.info("删除直播拉流任务: region=%s, task_id=%s, "
+                "operator=%s, specify_task_id=%s",
+                region, task_id, operator, specify_task_id)
 
     try:
-        live_client = LiveClient(region=region)
-        result = live_client.delete_live_pull_stream_task(
+        live_client = ThreadedLiveClient(region=region)
+        result = await live_client.delete_live_pull_stream_task(
             task_id=task_id,
             operator=operator,
             specify_task_id=specify_task_id
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"删除直播拉流任务失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 查询直播拉流任务
@@ -592,6 +700,10 @@ async def describe_live_pull_stream_tasks(
         specify_task_id: Optional[str] = Field(
             default=None,
             description="指定任务 ID。注意：仅供使用指定 ID 创建的任务查询。示例值：myspecifytaskid"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
         )
 ) -> str:
     """
@@ -603,6 +715,7 @@ async def describe_live_pull_stream_tasks(
             page_num: 取得第几页(optional)
             page_size: 分页大小(optional)
             specify_task_id: 指定任务ID(optional)
+            fields: 返回字段(optional)
 
         Returns:
             TaskInfos: 直播拉流任务信息列表
@@ -613,23 +726,24 @@ async def describe_live_pull_stream_tasks(
             LimitTaskNum: 限制可创建的最大任务数
             请求ID
     """
-    logger.info(f"查询直播拉流任务: region={region}, task_id={task_id},  page_num={page_num}, "
-                f"page_size={page_size}, specify_task_id={specify_task_id}")
+    logger.info("查询直播拉流任务: region=%s, task_id=%s,  page_num=%s, "
+                "page_size=%s, specify_task_id=%s",
+                region, task_id, page_num, page_size, specify_task_id)
 
     try:
-        live_client = LiveClient(region=region)
-        result = live_client.describe_live_pull_stream_tasks(
+        live_client = ThreadedLiveClient(region=region)
+        result = await live_client.describe_live_pull_stream_tasks(
             task_id=task_id,
             page_num=page_num,
             page_size=page_size,
             specify_task_id=specify_task_id
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result, fields)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"查询直播拉流任务失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 创建直播拉流任务
@@ -776,12 +890,13 @@ async def create_live_pull_stream_task(
             TaskId: 任务ID
             请求ID
     """
-    logger.info(f"创建直播拉流任务: region={region}, source_type={source_type},  source_urls={source_urls}, "
-                f"domain_name={domain_name}, app_name={app_name}, stream_name={stream_name}, operator={operator}")
+    logger.info("创建直播拉流任务: region=%s, source_type=%s,  source_urls=%s, "
+                "domain_name=%s, app_name=%s, stream_name=%s, operator=%s",
+                region, source_type, source_urls, domain_name, app_name, stream_name, operator)
 
     try:
-        live_client = LiveClient(region=region)
-        result = live_client.create_live_pull_stream_task(
+        live_client = ThreadedLiveClient(region=region)
+        result = await live_client.create_live_pull_stream_task(
             source_type=source_type,
             source_urls=source_urls,
             domain_name=domain_name,
@@ -808,77 +923,61 @@ async def create_live_pull_stream_task(
             backup_to_url=backup_to_url,
             transcode_template_name=transcode_template_name
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"创建直播拉流任务失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 更新直播拉流任务
 @mcp.tool()
-async def create_live_pull_stream_task(
+async def modify_live_pull_stream_task(
         ctx: Context,
         region: str = Field(
             default=config.DEFAULT_REGION,
             description="地域"
         ),
-        source_type: str = Field(
-            default=None,
-            description="拉流源的类型：PullLivePushLive -直播，PullVodPushLive -点播，PullPicPushLive -图片。示例值：PullLivePushLive"
-        ),
-        source_urls: List[str] = Field(
+        task_id: str = Field(
             default=None,
-            description="拉流源 url 列表，SourceType 为直播（PullLivePushLive）只可以填1个，SourceType 为点播（PullVodPushLive）可以填多个，上限30个。当前支持的文件格式：flv，mp4，hls。当前支持的拉流协议：http，https，rtmp，rtmps，rtsp，srt。"
+            description="任务Id"
         ),
-        domain_name: str = Field(
+        operator: str = Field(
             default=None,
-            description="推流域名。将拉取过来的流推到该域名"
+            description="操作人姓名"
         ),
-        app_name: str = Field(
+        source_urls: Optional[List[str]] = Field(
             default=None,
-            description="推流路径。将拉取过来的流推到该路径。"
+            description="拉流源url列表。SourceType为直播（PullLivePushLive）只可以填1个，SourceType为点播（PullVodPushLive）可以填多个，上限30个"
         ),
-        stream_name: str = Field(
+        start_time: Optional[str] = Field(
             default=None,
-            description="推流名称。将拉取过来的流推到该流名称。"
+            description="开始时间。使用 UTC 格式时间，例如：2019-01-08T10:00:00Z"
         ),
-        start_time: str = Field(
+        end_time: Optional[str] = Field(
             default=None,
-            description="开始时间。使用 UTC 格式时间，例如：2019-01-08T10:00:00Z"
+            description="结束时间。注意：1. 结束时间必须大于开始时间；2. 结束时间和开始时间必须大于当前时间；3. 结束时间 和 开始时间 间隔必须小于七天"
         ),
-        end_time: str = Field(
+        vod_loop_times: Optional[int] = Field(
             default=None,
-            description="结束时间"
+            description="点播拉流转推循环次数。-1：无限循环，直到任务结束；0：不循环；>0：具体循环次数"
         ),
-        operator: str = Field(
+        vod_refresh_type: Optional[str] = Field(
             default=None,
-            description="任务操作人备注"
+            description="点播更新SourceUrls后的播放方式：ImmediateNewSource：立即从更新的拉流源开始播放；ContinueBreakPoint：从上次断流url源的断点处继续，结束后再使用新的拉流源"
         ),
-        push_args: Optional[str] = Field(
+        status: Optional[str] = Field(
             default=None,
-            description="推流参数。推流时携带自定义参数。"
+            description="任务状态：enable - 启用，pause - 暂停"
         ),
         callback_events: Optional[List[str]] = Field(
             default=None,
             description="选择需要回调的事件（不填则回调全部）"
         ),
-        vod_loop_times: Optional[str] = Field(
-            default=None,
-            description="点播拉流转推循环次数，默认：-1"
-        ),
-        vod_refresh_type: Optional[str] = Field(
-            default=None,
-            description="点播更新SourceUrls后的播放方式：ImmediateNewSource：立即播放新的拉流源内容；ContinueBreakPoint：播放完当前正在播放的点播 url 后再使用新的拉流源播放。（旧拉流源未播放的点播 url 不会再播放）"
-        ),
         callback_url: Optional[str] = Field(
             default=None,
-            description="自定义回调地址。拉流转推任务相关事件会回调到该地址。"
-        ),
-        extra_cmd: Optional[str] = Field(
-            default=None,
-            description="其他参数"
+            description="自定义回调地址。相关事件会回调到该地址"
         ),
         specify_task_id: Optional[str] = Field(
             default=None,
@@ -886,19 +985,19 @@ async def create_live_pull_stream_task(
         ),
         comment: Optional[str] = Field(
             default=None,
-            description="任务描述，限制 512 字节"
+            description="任务备注"
         ),
         to_url: Optional[str] = Field(
             default=None,
-            description="完整目标 URL 地址"
+            description="目标地址。仅在任务状态为暂停时可修改"
         ),
         file_index: Optional[int] = Field(
             default=None,
-            description="指定播放文件索引"
+            description="指定播放文件索引，从 1 开始，不大于SourceUrls中文件个数"
         ),
         offset_time: Optional[int] = Field(
             default=None,
-            description="指定播放文件偏移"
+            description="指定播放文件偏移，单位：秒"
         ),
         backup_source_type: Optional[str] = Field(
             default=None,
@@ -906,23 +1005,19 @@ async def create_live_pull_stream_task(
         ),
         backup_source_url: Optional[str] = Field(
             default=None,
-            description="备源 URL"
+            description="备源 URL，只允许填一个备源 URL"
         ),
         vod_local_mode: Optional[int] = Field(
             default=None,
-            description="点播源是否启用本地推流模式，默认0，不启用"
-        ),
-        record_template_id: Optional[str] = Field(
-            default=None,
-            description="录制模板 ID"
+            description="点播源是否启用本地推流模式，默认0，不启用。0 - 不启用；1 - 启用"
         ),
         backup_to_url: Optional[str] = Field(
             default=None,
-            description="新的目标地址，用于任务同时推两路场景"
+            description="新的目标地址。传空值，则取消该地址的推流。传入新值，则替换原有地址"
         ),
-        transcode_template_name: Optional[str] = Field(
+        backup_vod_url: Optional[str] = Field(
             default=None,
-            description="直播转码模板，使用云直播的转码功能进行转码后再转推出去。转码模板需在云直播控制台创建"
+            description="点播垫片文件地址。注意：用于在主源拉不到时自动兜底到垫片文件，切到垫片文件后，每次播完垫片会尝试拉主源"
         )
 ) -> str:
     """
@@ -930,20 +1025,16 @@ async def create_live_pull_stream_task(
 
         Args:
             region: 地域
-            source_type: 拉流源的类型
-            source_urls: 拉流源 url 列表
-            domain_name: 推流域名
-            app_name: 推流路径
-            stream_name: 推流名称
-            start_time: 开始时间
-            end_time: 结束时间
-            operator: 任务操作人备注
-            push_args: 推流参数(optional)
-            callback_events: 需要回调的事件(optional)
+            task_id: 任务Id
+            operator: 操作人姓名
+            source_urls: 拉流源 url 列表(optional)
+            start_time: 开始时间(optional)
+            end_time: 结束时间(optional)
             vod_loop_times: 点播拉流转推循环次数(optional)
             vod_refresh_type: 点播更新SourceUrls后的播放方式(optional)
+            status: 任务状态(optional)
+            callback_events: 需要回调的事件(optional)
             callback_url: 自定义回调地址(optional)
-            extra_cmd: 其他参数(optional)
             specify_task_id: 自定义任务 ID(optional)
             comment: 任务描述(optional)
             to_url: 完整目标 URL 地址(optional)
@@ -952,34 +1043,27 @@ async def create_live_pull_stream_task(
             backup_source_type: 备源的类型(optional)
             backup_source_url: 备源 URL(optional)
             vod_local_mode: 点播源是否启用本地推流模式(optional)
-            record_template_id: 录制模板 ID(optional)
             backup_to_url: 新的目标地址，用于任务同时推两路场景(optional)
-            transcode_template_name: 直播转码模板(optional)
+            backup_vod_url: 点播垫片文件地址(optional)
 
         Returns:
-            TaskId: 任务ID
             请求ID
     """
-    logger.info(f"更新直播拉流任务: region={region}, source_type={source_type},  source_urls={source_urls}, "
-                f"domain_name={domain_name}, app_name={app_name}, stream_name={stream_name}, operator={operator}")
+    logger.info("更新直播拉流任务: region=%s, task_id=%s, operator=%s, status=%s", region, task_id, operator, status)
 
     try:
-        live_client = LiveClient(region=region)
-        result = live_client.create_live_pull_stream_task(
-            source_type=source_type,
+        live_client = ThreadedLiveClient(region=region)
+        result = await live_client.modify_live_pull_stream_task(
+            task_id=task_id,
+            operator=operator,
             source_urls=source_urls,
-            domain_name=domain_name,
-            app_name=app_name,
-            stream_name=stream_name,
             start_time=start_time,
             end_time=end_time,
-            operator=operator,
-            push_args=push_args,
-            callback_events=callback_events,
             vod_loop_times=vod_loop_times,
             vod_refresh_type=vod_refresh_type,
+            status=status,
+            callback_events=callback_events,
             callback_url=callback_url,
-            extra_cmd=extra_cmd,
             specify_task_id=specify_task_id,
             comment=comment,
             to_url=to_url,
@@ -988,16 +1072,15 @@ async def create_live_pull_stream_task(
             backup_source_type=backup_source_type,
             backup_source_url=backup_source_url,
             vod_local_mode=vod_local_mode,
-            record_template_id=record_template_id,
             backup_to_url=backup_to_url,
-            transcode_template_name=transcode_template_name
+            backup_vod_url=backup_vod_url
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"更新直播拉流任务失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # <---------------------直播流管理---------------------> #
@@ -1016,6 +1099,10 @@ async def describe_live_stream_state(
         stream_name: str = Field(
             default=None,
             description="流名称。示例值：stream1"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
         )
 ) -> str:
     """
@@ -1024,25 +1111,26 @@ async def describe_live_stream_state(
             app_name: 推流路径
             domain_name: 推流域名
             stream_name: 流名称
+            fields: 返回字段(optional)
 
         Returns:
             流状态
     """
-    logger.info(f"查询流状态: app_name={app_name}, domain_name={domain_name}, stream_name={stream_name}")
+    logger.info("查询流状态: app_name=%s, domain_name=%s, stream_name=%s", app_name, domain_name, stream_name)
 
     try:
-        live_client = LiveClient()
-        result = live_client.describe_live_stream_state(
+        live_client = ThreadedLiveClient()
+        result = await live_client.describe_live_stream_state(
             app_name=app_name,
             domain_name=domain_name,
             stream_name=stream_name
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result, fields)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"查询流状态失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 查询直播中的流
@@ -1068,6 +1156,10 @@ async def describe_live_stream_online_list(
         stream_name: Optional[str] = Field(
             default="mystream",
             description="流名称。示例值：stream1"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
         )
 ) -> str:
     """
@@ -1079,28 +1171,116 @@ async def describe_live_stream_online_list(
             page_num: 取的第几页(optional)
             page_size: 每页大小(optional)
             stream_name: 流名称(optional)
+            fields: 返回字段(optional)
 
         Returns:
             正在直播中的流列表
     """
-    logger.info(f"查询直播中的流: app_name={app_name}, domain_name={domain_name},page_num={page_num},"
-                f"page_size{page_size},stream_name={stream_name}")
+    logger.info("查询直播中的流: app_name=%s, domain_name=%s,page_num=%s,"
+                "page_size%s,stream_name=%s",
+                app_name, domain_name, page_num, page_size, stream_name)
 
     try:
-        live_client = LiveClient()
-        result = live_client.describe_live_stream_online_list(
+        live_client = ThreadedLiveClient()
+        result = await live_client.describe_live_stream_online_list(
             app_name=app_name,
             domain_name=domain_name,
             page_num=page_num,
             page_size=page_size,
             stream_name=stream_name
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result, fields)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"查询直播中的流失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
+
+
+# 查询全部直播中的流
+@mcp.tool()
+async def describe_all_online_streams(
+        ctx: Context,
+        app_name: Optional[str] = Field(
+            default=None,
+            description="推流路径，与推流和播放地址中的AppName保持一致，不填则不过滤"
+        ),
+        domain_name: Optional[str] = Field(
+            default=None,
+            description="您的推流域名，不填则查询全部域名。示例值：5000.livepush.myqcloud.com"
+        ),
+        stream_name: Optional[str] = Field(
+            default=None,
+            description="流名称，精确匹配。示例值：stream1"
+        ),
+        stream_name_prefix: Optional[str] = Field(
+            default=None,
+            description="流名称前缀过滤。示例值：room_"
+        ),
+        limit: Optional[int] = Field(
+            default=None,
+            description="最多返回条数，不填则返回全部"
+        ),
+        group_by: Optional[str] = Field(
+            default=None,
+            description="汇总模式：分组字段，逗号分隔，指定任一汇总参数时只返回汇总结果。示例值：DomainName,AppName"
+        ),
+        metrics: Optional[str] = Field(
+            default=None,
+            description="汇总模式：统计数量、总和、最小/最大/平均值的数值字段，逗号分隔"
+        ),
+        top_n: Optional[int] = Field(
+            default=None,
+            description="汇总模式：返回top_by最大的前N条记录，最多100"
+        ),
+        top_by: Optional[str] = Field(
+            default=None,
+            description="汇总模式：Top N的排序字段(数值)"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
+        )
+) -> str:
+    """
+    查询全部直播中的流，自动并发翻页并合并结果
+
+        Args:
+            app_name: 推流路径(optional)
+            domain_name: 推流域名(optional)
+            stream_name: 流名称(optional)
+            stream_name_prefix: 流名称前缀(optional)
+            limit: 最多返回条数(optional)
+            group_by: 分组字段(optional)
+            metrics: 数值字段(optional)
+            top_n: 返回前N条(optional)
+            top_by: Top N排序字段(optional)
+            fields: 返回字段(optional)
+
+        Returns:
+            OnlineInfo: 直播中的流列表
+            TotalNum: 返回的流数量
+            汇总模式下返回TotalNum、Metrics、Groups(Key/Count/Metrics)、GroupNum和Top
+    """
+    logger.info("查询全部直播中的流: app_name=%s, domain_name=%s, "
+                "stream_name=%s, stream_name_prefix=%s, limit=%s",
+                app_name, domain_name, stream_name, stream_name_prefix, limit)
+
+    try:
+        result = await paginator.describe_all_online_streams(
+            app_name=app_name,
+            domain_name=domain_name,
+            stream_name=stream_name,
+            stream_name_prefix=stream_name_prefix,
+            limit=limit,
+            aggregator=build_aggregator(group_by, metrics, top_n, top_by)
+        )
+        return render(result, fields)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"查询全部直播中的流失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
 
 
 # <---------------------流管理---------------------> #
@@ -1132,21 +1312,21 @@ async def drop_live_stream(
         Returns:
             请求ID
     """
-    logger.info(f"断开直播推流: app_name={app_name}, domain_name={domain_name},stream_name={stream_name}")
+    logger.info("断开直播推流: app_name=%s, domain_name=%s,stream_name=%s", app_name, domain_name, stream_name)
 
     try:
-        live_client = LiveClient()
-        result = live_client.drop_live_stream(
+        live_client = ThreadedLiveClient()
+        result = await live_client.drop_live_stream(
             app_name=app_name,
             domain_name=domain_name,
             stream_name=stream_name
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"断开直播流失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 恢复直播流
@@ -1177,21 +1357,21 @@ async def resume_live_stream(
         Returns:
             请求ID
     """
-    logger.info(f"恢复直播流: app_name={app_name}, domain_name={domain_name},stream_name={stream_name}")
+    logger.info("恢复直播流: app_name=%s, domain_name=%s,stream_name=%s", app_name, domain_name, stream_name)
 
     try:
-        live_client = LiveClient()
-        result = live_client.resume_live_stream(
+        live_client = ThreadedLiveClient()
+        result = await live_client.resume_live_stream(
             app_name=app_name,
             domain_name=domain_name,
             stream_name=stream_name
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"断开直播流失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 禁推直播流
@@ -1232,23 +1412,176 @@ async def forbid_live_stream(
         Returns:
             请求ID
     """
-    logger.info(f"禁推直播流: app_name={app_name}, domain_name={domain_name},stream_name={stream_name}")
+    logger.info("禁推直播流: app_name=%s, domain_name=%s,stream_name=%s", app_name, domain_name, stream_name)
 
     try:
-        live_client = LiveClient()
-        result = live_client.forbid_live_stream(
+        live_client = ThreadedLiveClient()
+        result = await live_client.forbid_live_stream(
             app_name=app_name,
             domain_name=domain_name,
             stream_name=stream_name,
             resume_time=resume_time,
             reason=reason
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"禁推直播流失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
+
+
+# 批量断开直播流
+@mcp.tool()
+async def batch_drop_live_stream(
+        ctx: Context,
+        streams: List[Dict[str, Any]] = Field(
+            default=None,
+            description="流列表，每项包含 domain_name、stream_name、app_name(默认live)。"
+                        "示例值：[{\"domain_name\": \"5000.livepush.myqcloud.com\", \"stream_name\": \"stream1\"}]"
+        ),
+        concurrency: Optional[int] = Field(
+            default=None,
+            description="最大并发数，默认使用BATCH_CONCURRENCY配置"
+        ),
+        rate: Optional[float] = Field(
+            default=None,
+            description="每秒最多发起的请求数，默认使用BATCH_RATE_LIMIT配置，0表示不限制"
+        )
+) -> str:
+    """
+    批量断开直播流，并发执行并逐条返回结果
+
+        Args:
+            streams: 流列表
+            concurrency: 最大并发数(optional)
+            rate: 每秒最多发起的请求数(optional)
+
+        Returns:
+            Results: 逐条结果，Status为Success或Failed，失败时包含ErrorCode/Error
+            SuccessCount: 成功数量
+            FailedCount: 失败数量
+    """
+    logger.info("批量断开直播流: count=%s, concurrency=%s, rate=%s", len(streams or []), concurrency, rate)
+
+    try:
+        result = await batch_ops.batch_drop_live_stream(
+            streams or [],
+            concurrency=concurrency,
+            rate=rate
+        )
+        return render(result)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"批量断开直播流失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
+
+
+# 批量恢复直播流
+@mcp.tool()
+async def batch_resume_live_stream(
+        ctx: Context,
+        streams: List[Dict[str, Any]] = Field(
+            default=None,
+            description="流列表，每项包含 domain_name、stream_name、app_name(默认live)。"
+                        "示例值：[{\"domain_name\": \"5000.livepush.myqcloud.com\", \"stream_name\": \"stream1\"}]"
+        ),
+        concurrency: Optional[int] = Field(
+            default=None,
+            description="最大并发数，默认使用BATCH_CONCURRENCY配置"
+        ),
+        rate: Optional[float] = Field(
+            default=None,
+            description="每秒最多发起的请求数，默认使用BATCH_RATE_LIMIT配置，0表示不限制"
+        )
+) -> str:
+    """
+    批量恢复直播流，并发执行并逐条返回结果
+
+        Args:
+            streams: 流列表
+            concurrency: 最大并发数(optional)
+            rate: 每秒最多发起的请求数(optional)
+
+        Returns:
+            Results: 逐条结果，Status为Success或Failed，失败时包含ErrorCode/Error
+            SuccessCount: 成功数量
+            FailedCount: 失败数量
+    """
+    logger.info("批量恢复直播流: count=%s, concurrency=%s, rate=%s", len(streams or []), concurrency, rate)
+
+    try:
+        result = await batch_ops.batch_resume_live_stream(
+            streams or [],
+            concurrency=concurrency,
+            rate=rate
+        )
+        return render(result)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"批量恢复直播流失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
+
+
+# 批量禁推直播流
+@mcp.tool()
+async def batch_forbid_live_stream(
+        ctx: Context,
+        streams: List[Dict[str, Any]] = Field(
+            default=None,
+            description="流列表，每项包含 domain_name、stream_name、app_name(默认live)，可选 resume_time、reason 覆盖统一设置。"
+                        "示例值：[{\"domain_name\": \"5000.livepush.myqcloud.com\", \"stream_name\": \"stream1\"}]"
+        ),
+        resume_time: Optional[str] = Field(
+            default=None,
+            description="恢复流的时间。UTC 格式，例如：2018-11-29T19:00:00Z。注意：默认禁播7天，且最长支持禁播90天"
+        ),
+        reason: Optional[str] = Field(
+            default=None,
+            description="禁推原因。注明：请务必填写禁推原因，防止误操作"
+        ),
+        concurrency: Optional[int] = Field(
+            default=None,
+            description="最大并发数，默认使用BATCH_CONCURRENCY配置"
+        ),
+        rate: Optional[float] = Field(
+            default=None,
+            description="每秒最多发起的请求数，默认使用BATCH_RATE_LIMIT配置，0表示不限制"
+        )
+) -> str:
+    """
+    批量禁推直播流，并发执行并逐条返回结果
+
+        Args:
+            streams: 流列表
+            resume_time: 恢复流的时间(optional)
+            reason: 禁推原因(optional)
+            concurrency: 最大并发数(optional)
+            rate: 每秒最多发起的请求数(optional)
+
+        Returns:
+            Results: 逐条结果，Status为Success或Failed，失败时包含ErrorCode/Error
+            SuccessCount: 成功数量
+            FailedCount: 失败数量
+    """
+    logger.info("批量禁推直播流: count=%s, concurrency=%s, rate=%s", len(streams or []), concurrency, rate)
+
+    try:
+        result = await batch_ops.batch_forbid_live_stream(
+            streams or [],
+            resume_time=resume_time,
+            reason=reason,
+            concurrency=concurrency,
+            rate=rate
+        )
+        return render(result)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"批量禁推直播流失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
 
 
 # 查询推断流事件
@@ -1294,6 +1627,10 @@ async def describe_live_stream_event_list(
         is_asc: Optional[int] = Field(
             default=None,
             description="是否按结束时间正序显示，默认逆序"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
         )
 ) -> str:
     """
@@ -1310,6 +1647,7 @@ async def describe_live_stream_event_list(
             is_fiter: 是否过滤(optional)
             is_strict: 是否精确查询(optional)
             is_asc: 是否按结束时间正序显示(optional)
+            fields: 返回字段(optional)
 
         Returns:
             EventList: 推断流事件列表
@@ -1319,11 +1657,11 @@ async def describe_live_stream_event_list(
             TotalPage: 总页数
             请求ID
     """
-    logger.info(f"查询推断流事件: start_time={start_time}, end_time={end_time}")
+    logger.info("查询推断流事件: start_time=%s, end_time=%s", start_time, end_time)
 
     try:
-        live_client = LiveClient()
-        result = live_client.describe_live_stream_event_list(
+        live_client = ThreadedLiveClient()
+        result = await live_client.describe_live_stream_event_list(
             start_time=start_time,
             end_time=end_time,
             app_name=app_name,
@@ -1335,12 +1673,237 @@ async def describe_live_stream_event_list(
             is_strict=is_strict,
             is_asc=is_asc
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result, fields)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"查询推断流事件失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
+
+
+# 查询时间范围内的全部推断流事件
+@mcp.tool()
+async def describe_all_live_stream_events(
+        ctx: Context,
+        start_time: Optional[str] = Field(
+            default=None,
+            description="起始时间。UTC 格式，例如：2018-12-29T19:00:00Z。不填或早于2个月前时取可查询的最早时间"
+        ),
+        end_time: Optional[str] = Field(
+            default=None,
+            description="结束时间。UTC 格式，例如：2018-12-29T20:00:00Z。不填时取当前时间，跨度不受1个月限制"
+        ),
+        app_name: Optional[str] = Field(
+            default=None,
+            description="推流路径，与推流和播放地址中的AppName保持一致"
+        ),
+        domain_name: Optional[str] = Field(
+            default=None,
+            description="您的推流域名。示例值：5000.livepush.myqcloud.com"
+        ),
+        stream_name: Optional[str] = Field(
+            default=None,
+            description="流名称。示例值：stream1"
+        ),
+        is_fiter: Optional[int] = Field(
+            default=None,
+            description="是否过滤，默认不过滤"
+        ),
+        is_strict: Optional[int] = Field(
+            default=None,
+            description="是否精确查询，默认模糊匹配"
+        ),
+        limit: Optional[int] = Field(
+            default=None,
+            description="最多返回条数，不填则返回全部"
+        ),
+        group_by: Optional[str] = Field(
+            default=None,
+            description="汇总模式：分组字段，逗号分隔，指定任一汇总参数时只返回汇总结果。示例值：DomainName,StopReason"
+        ),
+        metrics: Optional[str] = Field(
+            default=None,
+            description="汇总模式：统计数量、总和、最小/最大/平均值的数值字段，逗号分隔。示例值：Duration"
+        ),
+        top_n: Optional[int] = Field(
+            default=None,
+            description="汇总模式：返回top_by最大的前N条记录，最多100"
+        ),
+        top_by: Optional[str] = Field(
+            default=None,
+            description="汇总模式：Top N的排序字段(数值)。示例值：Duration"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
+        )
+) -> str:
+    """
+    查询时间范围内的全部推断流事件，自动拆分为不超过1个月的子窗口并发翻页，按时间正序返回
+
+        Args:
+            start_time: 起始时间(optional)
+            end_time: 结束时间(optional)
+            app_name: 推流路径(optional)
+            domain_name: 推流域名(optional)
+            stream_name: 流名称(optional)
+            is_fiter: 是否过滤(optional)
+            is_strict: 是否精确查询(optional)
+            limit: 最多返回条数(optional)
+            group_by: 分组字段(optional)
+            metrics: 数值字段(optional)
+            top_n: 返回前N条(optional)
+            top_by: Top N排序字段(optional)
+            fields: 返回字段(optional)
+
+        Returns:
+            EventList: 推断流事件列表
+            TotalNum: 返回的事件数量
+            StartTime: 实际查询的起始时间
+            EndTime: 实际查询的结束时间
+            汇总模式下返回TotalNum、Metrics、Groups(Key/Count/Metrics)、GroupNum和Top
+    """
+    logger.info("查询全部推断流事件: start_time=%s, end_time=%s, "
+                "domain_name=%s, app_name=%s, stream_name=%s",
+                start_time, end_time, domain_name, app_name, stream_name)
+
+    try:
+        result = await event_query.describe_all_live_stream_events(
+            start_time=start_time,
+            end_time=end_time,
+            app_name=app_name,
+            domain_name=domain_name,
+            stream_name=stream_name,
+            is_filter=is_fiter,
+            is_strict=is_strict,
+            limit=limit,
+            aggregator=build_aggregator(group_by, metrics, top_n, top_by)
+        )
+        return render(result, fields)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"查询全部推断流事件失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
+
+
+# 同步推断流事件到本地库
+@mcp.tool()
+async def sync_stream_events(
+        ctx: Context,
+        domain_name: Optional[str] = Field(
+            default=None,
+            description="您的推流域名，不填则同步全部域名。示例值：5000.livepush.myqcloud.com"
+        )
+) -> str:
+    """
+    从上次同步位置增量同步推断流事件到本地库，需要设置EVENT_STORE_PATH
+
+        Args:
+            domain_name: 推流域名(optional)
+
+        Returns:
+            StartTime/EndTime: 本次同步的时间范围
+            Fetched: 拉取的事件数
+            Inserted: 新写入的事件数
+            Store: 本地库统计
+    """
+    logger.info("同步推断流事件: domain_name=%s", domain_name)
+
+    try:
+        store = event_store.get_event_store()
+        result = await store.sync(domain_name)
+        result["Store"] = await run_blocking(store.stats)
+        return render(result)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"同步推断流事件失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
+
+
+# 查询本地推断流事件
+@mcp.tool()
+async def query_stored_stream_events(
+        ctx: Context,
+        domain_name: Optional[str] = Field(
+            default=None,
+            description="您的推流域名。示例值：5000.livepush.myqcloud.com"
+        ),
+        app_name: Optional[str] = Field(
+            default=None,
+            description="推流路径，与推流和播放地址中的AppName保持一致"
+        ),
+        stream_name: Optional[str] = Field(
+            default=None,
+            description="流名称，精确匹配。示例值：stream1"
+        ),
+        start_time: Optional[str] = Field(
+            default=None,
+            description="起始时间，按事件结束时间过滤。UTC 格式，例如：2018-12-29T19:00:00Z"
+        ),
+        end_time: Optional[str] = Field(
+            default=None,
+            description="结束时间，按事件结束时间过滤。UTC 格式，例如：2018-12-29T20:00:00Z"
+        ),
+        stop_reason: Optional[str] = Field(
+            default=None,
+            description="断流原因。示例值：NormalStop"
+        ),
+        limit: Optional[int] = Field(
+            default=1000,
+            description="最多返回条数，默认1000"
+        ),
+        is_asc: Optional[int] = Field(
+            default=1,
+            description="是否按结束时间正序显示，默认正序"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
+        )
+) -> str:
+    """
+    查询本地库中的推断流事件，不调用云API，需要先同步
+
+        Args:
+            domain_name: 推流域名(optional)
+            app_name: 推流路径(optional)
+            stream_name: 流名称(optional)
+            start_time: 起始时间(optional)
+            end_time: 结束时间(optional)
+            stop_reason: 断流原因(optional)
+            limit: 最多返回条数(optional)
+            is_asc: 是否按结束时间正序显示(optional)
+            fields: 返回字段(optional)
+
+        Returns:
+            EventList: 推断流事件列表
+            TotalNum: 返回的事件数量
+    """
+    logger.info("查询本地推断流事件: domain_name=%s, app_name=%s, stream_name=%s, "
+                "start_time=%s, end_time=%s",
+                domain_name, app_name, stream_name, start_time, end_time)
+
+    try:
+        store = event_store.get_event_store()
+        events = await run_blocking(
+            store.query,
+            domain_name=domain_name,
+            app_name=app_name,
+            stream_name=stream_name,
+            start_time=start_time,
+            end_time=end_time,
+            stop_reason=stop_reason,
+            limit=limit,
+            ascending=is_asc != 0
+        )
+        return render({"EventList": events, "TotalNum": len(events)}, fields)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"查询本地推断流事件失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
 
 
 # 设置延时直播
@@ -1381,24 +1944,25 @@ async def add_delay_live_stream(
         Returns:
             请求ID
     """
-    logger.info(f"设置延时直播: app_name={app_name}, domain_name={domain_name},"
-                f"stream_name={stream_name},delay_time={delay_time}")
+    logger.info("设置延时直播: app_name=%s, domain_name=%s,"
+                "stream_name=%s,delay_time=%s",
+                app_name, domain_name, stream_name, delay_time)
 
     try:
-        live_client = LiveClient()
-        result = live_client.add_delay_live_stream(
+        live_client = ThreadedLiveClient()
+        result = await live_client.add_delay_live_stream(
             app_name=app_name,
             domain_name=domain_name,
             stream_name=stream_name,
             delay_time=delay_time,
             expire_time=expire_time
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"设置延时直播失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 取消直播延时
@@ -1429,21 +1993,21 @@ async def resume_delay_live_stream(
         Returns:
             请求ID
     """
-    logger.info(f"取消直播延时: app_name={app_name}, domain_name={domain_name},stream_name={stream_name}")
+    logger.info("取消直播延时: app_name=%s, domain_name=%s,stream_name=%s", app_name, domain_name, stream_name)
 
     try:
-        live_client = LiveClient()
-        result = live_client.resume_delay_live_stream(
+        live_client = ThreadedLiveClient()
+        result = await live_client.resume_delay_live_stream(
             app_name=app_name,
             domain_name=domain_name,
             stream_name=stream_name
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"取消直播延时失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # <---------------------转码模版---------------------> #
@@ -1571,11 +2135,11 @@ async def create_live_transcode_template(
             TemplateId: 模版ID
             请求ID
     """
-    logger.info(f"创建转码模板: template_name={template_name}, video_bitrate={video_bitrate}")
+    logger.info("创建转码模板: template_name=%s, video_bitrate=%s", template_name, video_bitrate)
 
     try:
-        live_client = LiveClient()
-        result = live_client.create_live_transcode_template(
+        live_client = ThreadedLiveClient()
+        result = await live_client.create_live_transcode_template(
             template_name=template_name,
             video_bitrate=video_bitrate,
             acodec=acodec,
@@ -1599,12 +2163,12 @@ async def create_live_transcode_template(
             drm_type=drm_type,
             drm_tracks=drm_tracks
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"创建转码模板失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 删除转码模板
@@ -1622,19 +2186,19 @@ async def delete_live_transcode_template(
         Returns:
             请求ID
     """
-    logger.info(f"删除转码模板: template_id={template_id}")
+    logger.info("删除转码模板: template_id=%s", template_id)
 
     try:
-        live_client = LiveClient()
-        result = live_client.delete_live_transcode_template(
+        live_client = ThreadedLiveClient()
+        result = await live_client.delete_live_transcode_template(
             template_id=template_id,
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"删除转码模板失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 创建转码规则
@@ -1669,23 +2233,24 @@ async def create_live_transcode_rule(
         Returns:
             请求ID
     """
-    logger.info(f"创建转码规则: app_name={app_name}, domain_name={domain_name}, "
-                f"stream_name={stream_name}, template_id={template_id}")
+    logger.info("创建转码规则: app_name=%s, domain_name=%s, "
+                "stream_name=%s, template_id=%s",
+                app_name, domain_name, stream_name, template_id)
 
     try:
-        live_client = LiveClient()
-        result = live_client.create_live_transcode_rule(
+        live_client = ThreadedLiveClient()
+        result = await live_client.create_live_transcode_rule(
             app_name=app_name,
             domain_name=domain_name,
             stream_name=stream_name,
             template_id=template_id
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"创建转码规则失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
 
 
 # 删除转码规则
@@ -1720,23 +2285,149 @@ async def delete_live_transcode_rule(
         Returns:
             请求ID
     """
-    logger.info(f"删除转码规则: app_name={app_name}, domain_name={domain_name}, "
-                f"stream_name={stream_name}, template_id={template_id}")
+    logger.info("删除转码规则: app_name=%s, domain_name=%s, "
+                "stream_name=%s, template_id=%s",
+                app_name, domain_name, stream_name, template_id)
 
     try:
-        live_client = LiveClient()
-        result = live_client.delete_live_transcode_rule(
+        live_client = ThreadedLiveClient()
+        result = await live_client.delete_live_transcode_rule(
             app_name=app_name,
             domain_name=domain_name,
             stream_name=stream_name,
             template_id=template_id
         )
-        return json.dumps(result, ensure_ascii=False, indent=2)
+        return render(result)
     except Exception as e:  # pylint: disable=broad-exception-caught
         error_msg = f"删除转码规则失败: {e}"
         logger.error(error_msg)
         await ctx.error(error_msg)
-        return json.dumps({"error": error_msg}, ensure_ascii=False)
+        return render({"error": error_msg})
+
+
+# <---------------------服务诊断---------------------> #
+@mcp.tool()
+async def describe_server_diagnostics(
+        ctx: Context,
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
+        )
+) -> str:
+    """
+    查询服务运行状态
+
+        Args:
+            fields: 返回字段(optional)
+
+        Returns:
+            CircuitBreakers: 按区域和端点的熔断状态
+            RateLimiter: 按API操作统计的限流排队次数和等待时间
+            Retry: 按API操作统计的重试次数、退避时间和错误码
+            SingleFlight: 只读请求的上游请求数、合并数和合并比例
+            ResponseCache: 查询缓存统计
+            ClientPool: 客户端池统计
+            AuthKeyCache: 鉴权key缓存统计
+            Fixtures: API录制回放统计
+    """
+    logger.info("查询服务运行状态")
+
+    try:
+        result = {
+            "CircuitBreakers": circuit_breakers.stats(),
+            "RateLimiter": rate_limiter.stats(),
+            "Retry": retry_policy.stats(),
+            "SingleFlight": single_flight.stats(),
+            "ResponseCache": response_cache.stats(),
+            "ClientPool": client_pool.stats(),
+            "AuthKeyCache": auth_key_cache.stats(),
+            "Fixtures": fixture_store.stats(),
+        }
+        return render(result, fields)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"查询服务运行状态失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
+
+
+# 查询运行指标
+@mcp.tool()
+async def describe_server_metrics(
+        ctx: Context,
+        output_format: Optional[str] = Field(
+            default="summary",
+            description="输出格式，summary为汇总(含p50/p99估算)，prometheus为Prometheus文本格式"
+        ),
+        fields: Optional[str] = Field(
+            default=None,
+            description=FIELDS_DESCRIPTION
+        )
+) -> str:
+    """
+    查询运行指标，按API操作、区域、错误码和工具统计调用次数和耗时，stdio传输下代替HTTP的/metrics
+
+        Args:
+            output_format: 输出格式(optional)
+            fields: 返回字段，仅summary格式有效(optional)
+
+        Returns:
+            ApiRequests: 按"操作|区域|错误码"统计的上游API调用次数(含重试)
+            ApiLatency: 按"操作|区域"统计的调用次数、平均耗时和p50/p99(取桶上界，超出最大桶时为null)
+            ToolCalls: 按"工具|状态"统计的工具调用次数
+            ToolLatency: 按工具统计的耗时
+    """
+    logger.info("查询运行指标: output_format=%s", output_format)
+
+    try:
+        if output_format == "prometheus":
+            return metrics_registry.render()
+        return render(metrics_registry.snapshot(), fields)
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"查询运行指标失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
+
+
+# 清除查询缓存
+@mcp.tool()
+async def invalidate_response_cache(
+        ctx: Context,
+        actions: Optional[List[str]] = Field(
+            default=None,
+            description="查询操作名称列表，不填则清空全部。示例值：[\"DescribeLiveDomains\"]"
+        )
+) -> str:
+    """
+    清除查询缓存，在控制台等其他途径修改配置后调用
+
+        Args:
+            actions: 查询操作名称列表(optional)
+
+        Returns:
+            Removed: 删除的条目数
+    """
+    logger.info("清除查询缓存: actions=%s", actions)
+
+    try:
+        removed = await response_cache.invalidate_async(tuple(actions) if actions else None)
+        return render({"Removed": removed})
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        error_msg = f"清除查询缓存失败: {e}"
+        logger.error(error_msg)
+        await ctx.error(error_msg)
+        return render({"error": error_msg})
+
+
+def create_app():
+    """uvicorn应用工厂，HTTP传输的每个工作进程调用一次"""
+    http_server.configure_worker()
+    return http_server.build_app(
+        mcp,
+        os.getenv(http_server.TRANSPORT_ENV, http_server.SSE),
+        background=worker_background
+    )
 
 
 def main():
@@ -1744,24 +2435,31 @@ def main():
     parser = argparse.ArgumentParser(
         description='腾讯云API的模型上下文协议(MCP)服务器'
     )
-    parser.add_argument('--transport', type=str, default='stdio', choices=['sse', 'stdio'],
-                        help='传输模式，可选值：sse(服务器发送事件)或stdio(标准输入输出)，默认为sse')
+    parser.add_argument('--transport', type=str, default='stdio', choices=['stdio', *http_server.HTTP_TRANSPORTS],
+                        help='传输模式，可选值：stdio(标准输入输出)、sse(服务器发送事件)或streamable-http，默认为stdio')
+    parser.add_argument('--host', type=str, default=config.HTTP_HOST, help='HTTP传输的监听地址')
     parser.add_argument('--port', type=int, default=9000, help='服务器运行端口')
+    parser.add_argument('--workers', type=int, default=config.HTTP_WORKERS,
+                        help='HTTP传输的工作进程数，sse只支持单进程')
+    parser.add_argument('--log-level', type=str, default=None, help='日志级别，如DEBUG、INFO、WARNING，默认使用LOG_LEVEL')
+    parser.add_argument('--log-file', type=str, default=None, help='日志文件路径，默认输出到stderr')
+    parser.add_argument('--log-format', type=str, default=None, choices=['text', 'json'], help='日志格式')
 
     args = parser.parse_args()
+    configure_logging(level=args.log_level, log_file=args.log_file, log_format=args.log_format)
 
     # 记录启动信息
     logger.info('启动腾讯云API MCP服务器')
-    logger.info(f'TENCENT_SECRET_ID:{config.SECRET_ID}, TENCENT_SECRET_KEY:{config.SECRET_KEY}')
+    logger.info('TENCENT_SECRET_ID: %s', mask_secret_id(config.SECRET_ID))
 
     # 根据传输方式运行服务器
     if args.transport == 'stdio':
         logger.info('使用标准输入输出传输')
-        mcp.run()
-    else:
-        logger.info(f'使用SSE传输，端口: {args.port}')
-        mcp.settings.port = args.port
-        mcp.run(transport='sse')
+        asyncio.run(run_stdio())
+        return
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    http_server.serve('server:create_app', args.transport, args.host, args.port, max(1, args.workers))
 
 
 if __name__ == "__main__":
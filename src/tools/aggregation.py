@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : aggregation.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 列表结果的服务端汇总，边翻页边统计分组计数、数值字段的最小/最大/平均值和Top N，只返回汇总结果
+"""
+
+import heapq
+import itertools
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# 最多返回的分组数，其余分组只计入GroupNum
+DEFAULT_GROUP_LIMIT = 100
+# Top N的上限
+TOP_N_MAX = 100
+
+
+def split_fields(value: Optional[str]) -> List[str]:
+    """将逗号分隔的字段名拆分为列表，忽略空项和重复项"""
+    fields: List[str] = []
+    for name in (value or "").split(","):
+        name = name.strip()
+        if name and name not in fields:
+            fields.append(name)
+    return fields
+
+
+def get_field(item: Dict[str, Any], path: str) -> Any:
+    """
+    按.分隔的路径读取字段
+
+    Args:
+        item: 单条记录
+        path: 字段路径，如DomainName、RecentPullInfo.LoopedTimes
+
+    Returns:
+        字段值，不存在时返回None
+    """
+    value: Any = item
+    for name in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(name)
+    return value
+
+
+def _group_value(value: Any) -> Any:
+    """分组字段的值，列表和字典不可哈希，转为键排序的JSON字符串"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return value
+
+
+def _number(value: Any) -> Optional[float]:
+    """数值字段，布尔值和非数值返回None"""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return value
+
+
+class _Metric:
+    """单个数值字段的统计"""
+
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "Count": self.count,
+            "Sum": self.total,
+            "Min": self.min,
+            "Max": self.max,
+            "Avg": round(self.total / self.count, 6) if self.count else None,
+        }
+
+
+class _Group:
+    """一个分组的计数和数值统计"""
+
+    __slots__ = ("count", "metrics")
+
+    def __init__(self, metrics: Iterable[str]):
+        self.count = 0
+        self.metrics = {name: _Metric() for name in metrics}
+
+
+class Aggregator:
+    """
+    单次遍历的汇总器
+
+    内存占用只与分组数和Top N有关，与记录总数无关
+    """
+
+    def __init__(
+            self,
+            group_by: Optional[List[str]] = None,
+            metrics: Optional[List[str]] = None,
+            top_n: int = 0,
+            top_by: Optional[str] = None,
+            group_limit: int = DEFAULT_GROUP_LIMIT
+    ):
+        """
+        初始化汇总器
+
+        Args:
+            group_by: 分组字段，为空时全部记录为一组
+            metrics: 统计最小/最大/平均值的数值字段
+            top_n: 返回top_by最大的前N条记录，0表示不返回
+            top_by: Top N的排序字段，必须为数值字段
+            group_limit: 最多返回的分组数，按记录数从多到少
+
+        Raises:
+            ValueError: 指定了top_n但未指定top_by
+        """
+        self.group_by = list(group_by or [])
+        self.metrics = list(metrics or [])
+        self.top_n = min(max(int(top_n or 0), 0), TOP_N_MAX)
+        self.top_by = top_by
+        if self.top_n and not top_by:
+            raise ValueError("指定top_n时必须同时指定top_by")
+        self.group_limit = group_limit
+        self.total = 0
+        self._overall = _Group(self.metrics)
+        self._groups: Dict[Tuple, _Group] = {}
+        # 小顶堆保存当前最大的N条，序号保证值相同时按出现顺序
+        self._top: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._seq = itertools.count()
+
+    @property
+    def enabled(self) -> bool:
+        """是否指定了任何汇总条件"""
+        return bool(self.group_by or self.metrics or self.top_n)
+
+    def _add_to(self, group: _Group, item: Dict[str, Any]) -> None:
+        group.count += 1
+        for name, metric in group.metrics.items():
+            value = _number(get_field(item, name))
+            if value is not None:
+                metric.add(value)
+
+    def add(self, item: Dict[str, Any]) -> None:
+        """
+        统计一条记录
+
+        Args:
+            item: 单条记录
+        """
+        self.total += 1
+        self._add_to(self._overall, item)
+        if self.group_by:
+            key = tuple(_group_value(get_field(item, name)) for name in self.group_by)
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Group(self.metrics)
+            self._add_to(group, item)
+        if self.top_n:
+            value = _number(get_field(item, self.top_by))
+            if value is None:
+                return
+            # 序号取负数，值相同时先出现的记录排在前面
+            entry = (value, -next(self._seq), item)
+            if len(self._top) < self.top_n:
+                heapq.heappush(self._top, entry)
+            elif entry[:2] > self._top[0][:2]:
+                heapq.heapreplace(self._top, entry)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        生成汇总结果
+
+        Returns:
+            TotalNum: 记录总数
+            Metrics: 全部记录的数值字段统计
+            Groups: 按记录数从多到少的分组，含Key、Count和Metrics
+            GroupNum: 分组总数
+            Top: top_by最大的前N条记录
+        """
+        result: Dict[str, Any] = {"TotalNum": self.total}
+        if self.metrics:
+            result["Metrics"] = {name: metric.summary() for name, metric in self._overall.metrics.items()}
+        if self.group_by:
+            groups = sorted(self._groups.items(), key=lambda kv: kv[1].count, reverse=True)
+            if self.group_limit:
+                groups = groups[:self.group_limit]
+            result["Groups"] = [
+                {
+                    "Key": dict(zip(self.group_by, key)),
+                    "Count": group.count,
+                    **({"Metrics": {name: m.summary() for name, m in group.metrics.items()}} if self.metrics else {}),
+                }
+                for key, group in groups
+            ]
+            result["GroupNum"] = len(self._groups)
+        if self.top_n:
+            result["Top"] = [item for _, _, item in sorted(self._top, key=lambda entry: entry[:2], reverse=True)]
+        return result
+
+
+def build_aggregator(
+        group_by: Optional[str] = None,
+        metrics: Optional[str] = None,
+        top_n: Optional[int] = None,
+        top_by: Optional[str] = None
+) -> Optional[Aggregator]:
+    """
+    由工具参数创建汇总器
+
+    Args:
+        group_by: 逗号分隔的分组字段
+        metrics: 逗号分隔的数值字段
+        top_n: Top N条数
+        top_by: Top N的排序字段
+
+    Returns:
+        汇总器，未指定任何汇总条件时返回None
+    """
+    aggregator = Aggregator(split_fields(group_by), split_fields(metrics), top_n or 0, top_by)
+    return aggregator if aggregator.enabled else None
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : auth_key_cache.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 推流/播放鉴权key缓存，按域名缓存DescribeLivePushAuthKey/DescribeLivePlayAuthKey的结果，
+           设置DISK_CACHE_DIR时持久化到磁盘，新启动的进程不必重新查询
+"""
+
+import copy
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from tools.live_api import ThreadedLiveClient
+from utils.client_pool import credential_identity
+from utils.config import config
+from utils.disk_cache import DiskCache
+from utils.executor import run_blocking
+from utils.logger import setup_logger
+from utils.response_cache import response_cache
+from utils.ttl_cache import Expiring, TTLCache
+
+logger = setup_logger("auth_key_cache")
+
+PUSH_ACTION = "DescribeLivePushAuthKey"
+PLAY_ACTION = "DescribeLivePlayAuthKey"
+
+
+class AuthKeyCache:
+    """按域名缓存推流/播放鉴权key，内存未命中时读取磁盘，再未命中时调用API"""
+
+    def __init__(self, ttl: float, maxsize: int, disk: Optional[DiskCache] = None):
+        """
+        初始化鉴权key缓存
+
+        Args:
+            ttl: 缓存有效期(秒)
+            maxsize: 每类鉴权key最多缓存的域名数
+            disk: 磁盘持久层，与查询缓存共用同一个只允许当前用户读写的数据库
+        """
+        self.ttl = ttl
+        self.disk = disk
+        self.push_keys = TTLCache(ttl=ttl, maxsize=maxsize)
+        self.play_keys = TTLCache(ttl=ttl, maxsize=maxsize)
+        # 失效操作递增代数，失效前发起的查询结果不再写入磁盘
+        self._generation = 0
+        self.disk_hits = 0
+
+    @staticmethod
+    def _disk_key(action: str, domain_name: str) -> str:
+        # 包含凭证标识，切换账号后不会读到其他账号的鉴权key
+        return DiskCache.encode_key((action, domain_name, credential_identity(config.SECRET_ID, config.SECRET_KEY)))
+
+    async def _load(
+            self,
+            action: str,
+            domain_name: str,
+            fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Any:
+        """依次读取磁盘和调用API，磁盘读写在线程池中执行"""
+        if self.disk is None:
+            return await fetch()
+        key = self._disk_key(action, domain_name)
+        stored = await run_blocking(self.disk.get, key)
+        if stored is not None:
+            value, _, expires_at = stored
+            self.disk_hits += 1
+            return Expiring(value, expires_at - time.time())
+        generation = self._generation
+        value = await fetch()
+        if generation == self._generation:
+            await run_blocking(self.disk.set, key, action, value, self.ttl)
+        return value
+
+    async def get_push_auth_key(self, domain_name: str) -> Dict[str, Any]:
+        """
+        获取推流鉴权key，未命中时调用DescribeLivePushAuthKey
+
+        Args:
+            domain_name: 推流域名
+
+        Returns:
+            DescribeLivePushAuthKey的响应副本
+        """
+        result = await self.push_keys.get_or_load_async(
+            domain_name,
+            lambda: self._load(
+                PUSH_ACTION,
+                domain_name,
+                lambda: ThreadedLiveClient().describe_live_push_auth_key(domain_name=domain_name)
+            )
+        )
+        # 调用方会在响应中追加地址字段，返回副本避免污染缓存
+        return copy.deepcopy(result)
+
+    async def get_play_auth_key(self, domain_name: str) -> Dict[str, Any]:
+        """
+        获取播放鉴权key，未命中时调用DescribeLivePlayAuthKey
+
+        Args:
+            domain_name: 播放域名
+
+        Returns:
+            DescribeLivePlayAuthKey的响应副本
+        """
+        result = await self.play_keys.get_or_load_async(
+            domain_name,
+            lambda: self._load(
+                PLAY_ACTION,
+                domain_name,
+                lambda: ThreadedLiveClient().describe_live_play_auth_key(domain_name=domain_name)
+            )
+        )
+        return copy.deepcopy(result)
+
+    async def invalidate(self, domain_name: Optional[str] = None) -> None:
+        """
+        使内存和磁盘中的鉴权key缓存失效，鉴权key变更后调用
+
+        Args:
+            domain_name: 域名，为空时清空全部
+        """
+        logger.info("鉴权key缓存失效: domain_name=%s", domain_name)
+        self._generation += 1
+        self.push_keys.invalidate(domain_name)
+        self.play_keys.invalidate(domain_name)
+        if self.disk is not None:
+            if domain_name is None:
+                await run_blocking(self.disk.invalidate, (PUSH_ACTION, PLAY_ACTION))
+            else:
+                await run_blocking(
+                    self.disk.delete,
+                    [self._disk_key(PUSH_ACTION, domain_name), self._disk_key(PLAY_ACTION, domain_name)]
+                )
+        # 通过RESPONSE_CACHE_TTLS开启了鉴权key查询缓存时，查询缓存及其磁盘持久层中也有一份
+        await response_cache.invalidate_async((PUSH_ACTION, PLAY_ACTION))
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计"""
+        return {
+            "push": self.push_keys.stats(),
+            "play": self.play_keys.stats(),
+            "disk": self.disk.path if self.disk is not None else None,
+            "disk_hits": self.disk_hits,
+        }
+
+
+auth_key_cache = AuthKeyCache(
+    ttl=config.AUTH_KEY_CACHE_TTL,
+    maxsize=config.AUTH_KEY_CACHE_SIZE,
+    disk=response_cache.disk
+)
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : batch_ops.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 批量断流/禁推/恢复直播流，在并发上限和速率预算内并发执行，逐条返回结果
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+from tools.live_api import AsyncLiveClient
+from utils.config import config
+from utils.logger import setup_logger
+
+logger = setup_logger("batch_ops")
+
+
+class _Pacer:
+    """按固定间隔放行请求，保证每秒发起的请求不超过rate"""
+
+    def __init__(self, rate: float):
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = time.monotonic()
+
+    async def wait(self) -> None:
+        if not self._interval:
+            return
+        now = time.monotonic()
+        start = max(now, self._next)
+        self._next = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+async def run_batch(
+        items: List[Dict[str, Any]],
+        operation: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        concurrency: Optional[int] = None,
+        rate: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    并发执行批量操作，单条失败不影响其他条目
+
+    Args:
+        items: 操作条目
+        operation: 条目 -> API响应
+        concurrency: 最大并发数，默认使用配置
+        rate: 每秒最多发起的请求数，默认使用配置，0表示不限制
+
+    Returns:
+        Results: 与items顺序一致的逐条结果
+        SuccessCount/FailedCount: 成功/失败数量
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency or config.BATCH_CONCURRENCY))
+    pacer = _Pacer(config.BATCH_RATE_LIMIT if rate is None else rate)
+
+    async def run_one(item: Dict[str, Any]) -> Dict[str, Any]:
+        status = {
+            "DomainName": item.get("domain_name"),
+            "AppName": item.get("app_name") or "live",
+            "StreamName": item.get("stream_name"),
+        }
+        if not status["DomainName"] or not status["StreamName"]:
+            return dict(status, Status="Failed", Error="缺少domain_name或stream_name")
+        async with semaphore:
+            await pacer.wait()
+            try:
+                result = await operation(dict(item, app_name=status["AppName"]))
+            except TencentCloudSDKException as e:
+                return dict(status, Status="Failed", ErrorCode=e.get_code(), Error=e.get_message(),
+                            RequestId=e.get_request_id())
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                return dict(status, Status="Failed", Error=str(e))
+        return dict(status, Status="Success", RequestId=result.get("Response", {}).get("RequestId"))
+
+    results = await asyncio.gather(*(run_one(item) for item in items))
+    success_count = sum(1 for r in results if r["Status"] == "Success")
+    return {
+        "Results": results,
+        "SuccessCount": success_count,
+        "FailedCount": len(results) - success_count,
+    }
+
+
+async def batch_drop_live_stream(items: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+    """
+    批量断开直播流
+
+    Args:
+        items: [{domain_name, app_name, stream_name}]
+        **kwargs: concurrency/rate，见run_batch
+
+    Returns:
+        逐条结果
+    """
+    client = AsyncLiveClient()
+    result = await run_batch(
+        items,
+        lambda item: client.drop_live_stream(
+            stream_name=item["stream_name"],
+            domain_name=item["domain_name"],
+            app_name=item["app_name"]
+        ),
+        **kwargs
+    )
+    logger.info("批量断开直播流完成: 成功%d条, 失败%d条", result['SuccessCount'], result['FailedCount'])
+    return result
+
+
+async def batch_resume_live_stream(items: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+    """
+    批量恢复直播流
+
+    Args:
+        items: [{domain_name, app_name, stream_name}]
+        **kwargs: concurrency/rate，见run_batch
+
+    Returns:
+        逐条结果
+    """
+    client = AsyncLiveClient()
+    result = await run_batch(
+        items,
+        lambda item: client.resume_live_stream(
+            stream_name=item["stream_name"],
+            domain_name=item["domain_name"],
+            app_name=item["app_name"]
+        ),
+        **kwargs
+    )
+    logger.info("批量恢复直播流完成: 成功%d条, 失败%d条", result['SuccessCount'], result['FailedCount'])
+    return result
+
+
+async def batch_forbid_live_stream(
+        items: List[Dict[str, Any]],
+        resume_time: Optional[str] = None,
+        reason: Optional[str] = None,
+        **kwargs
+) -> Dict[str, Any]:
+    """
+    批量禁推直播流
+
+    Args:
+        items: [{domain_name, app_name, stream_name, 可选resume_time, reason}]
+        resume_time: 默认恢复流的时间，条目中填写时以条目为准
+        reason: 默认禁推原因，条目中填写时以条目为准
+        **kwargs: concurrency/rate，见run_batch
+
+    Returns:
+        逐条结果
+    """
+    client = AsyncLiveClient()
+    result = await run_batch(
+        items,
+        lambda item: client.forbid_live_stream(
+            stream_name=item["stream_name"],
+            domain_name=item["domain_name"],
+            app_name=item["app_name"],
+            resume_time=item.get("resume_time") or resume_time,
+            reason=item.get("reason") or reason
+        ),
+        **kwargs
+    )
+    logger.info("批量禁推直播流完成: 成功%d条, 失败%d条", result['SuccessCount'], result['FailedCount'])
+    return result
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : event_query.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 推断流事件查询，将任意时间范围拆分为合法的子窗口并发翻页，按时间顺序产出
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from tools.aggregation import Aggregator
+from tools.live_api import AsyncLiveClient
+from utils.config import config
+from utils.logger import setup_logger
+
+logger = setup_logger("event_query")
+
+# DescribeLiveStreamEventList的限制：单次查询跨度不超过1个月，只能查询2个月内的记录，
+# 单页最多100条，单个查询条件最多翻到第10000条
+EVENT_WINDOW_MAX = timedelta(days=30)
+EVENT_HISTORY_MAX = timedelta(days=60)
+EVENT_PAGE_SIZE = 100
+EVENT_RECORDS_MAX = 10000
+# 子窗口继续二分的最小跨度
+EVENT_WINDOW_MIN = timedelta(minutes=1)
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def parse_time(value: str) -> datetime:
+    """
+    解析时间，支持2018-12-29T19:00:00Z和带时区偏移的ISO 8601格式，不带时区时按UTC处理
+
+    Args:
+        value: 时间字符串
+
+    Returns:
+        UTC时间
+    """
+    parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def format_time(value: datetime) -> str:
+    """格式化为接口要求的UTC时间"""
+    return value.astimezone(timezone.utc).strftime(TIME_FORMAT)
+
+
+def split_windows(start: datetime, end: datetime, span: timedelta = EVENT_WINDOW_MAX) -> List[Tuple[datetime, datetime]]:
+    """
+    将时间范围拆分为首尾相接、跨度不超过span的子窗口
+
+    Args:
+        start: 起始时间
+        end: 结束时间
+        span: 子窗口最大跨度
+
+    Returns:
+        [(起始时间, 结束时间)]，按时间顺序排列
+    """
+    windows = []
+    while start < end:
+        window_end = min(start + span, end)
+        windows.append((start, window_end))
+        start = window_end
+    return windows
+
+
+def event_key(event: Dict[str, Any]) -> Tuple:
+    """事件去重键，相邻窗口共用边界秒，同一事件可能出现两次"""
+    return (
+        event.get("DomainName"),
+        event.get("AppName"),
+        event.get("StreamName"),
+        event.get("StreamStartTime"),
+        event.get("StreamEndTime"),
+        event.get("ClientIp"),
+    )
+
+
+class EventQuery:
+    """推断流事件查询"""
+
+    def __init__(
+            self,
+            app_name: Optional[str] = None,
+            domain_name: Optional[str] = None,
+            stream_name: Optional[str] = None,
+            is_filter: Optional[int] = None,
+            is_strict: Optional[int] = None,
+            concurrency: Optional[int] = None,
+            client: Optional[AsyncLiveClient] = None
+    ):
+        """
+        初始化查询
+
+        Args:
+            app_name: 推流路径
+            domain_name: 推流域名
+            stream_name: 流名称
+            is_filter: 是否过滤
+            is_strict: 是否精确查询
+            concurrency: 最大并发请求数，默认使用配置
+            client: Live API异步客户端，默认新建
+        """
+        self.app_name = app_name
+        self.domain_name = domain_name
+        self.stream_name = stream_name
+        self.is_filter = is_filter
+        self.is_strict = is_strict
+        self.client = client or AsyncLiveClient()
+        self._semaphore = asyncio.Semaphore(max(1, concurrency or config.PAGINATOR_CONCURRENCY))
+        self.request_count = 0
+        # 已达最小跨度仍超过可翻页条数、只取到前EVENT_RECORDS_MAX条的子窗口
+        self.truncated_windows: List[Tuple[datetime, datetime]] = []
+
+    @property
+    def truncated(self) -> bool:
+        """是否有子窗口的事件不完整"""
+        return bool(self.truncated_windows)
+
+    async def _fetch_page(self, start: datetime, end: datetime, page_num: int) -> Dict[str, Any]:
+        async with self._semaphore:
+            self.request_count += 1
+            result = await self.client.describe_live_stream_event_list(
+                start_time=format_time(start),
+                end_time=format_time(end),
+                app_name=self.app_name,
+                domain_name=self.domain_name,
+                stream_name=self.stream_name,
+                page_num=page_num,
+                page_size=EVENT_PAGE_SIZE,
+                is_fiter=self.is_filter,
+                is_strict=self.is_strict,
+                is_asc=1
+            )
+        return result["Response"]
+
+    async def fetch_window(self, start: datetime, end: datetime) -> List[Dict[str, Any]]:
+        """
+        拉取单个子窗口的全部事件，超过可翻页条数时二分窗口，
+        已达最小跨度仍超过时只能取到前EVENT_RECORDS_MAX条，记入truncated_windows
+
+        Args:
+            start: 起始时间
+            end: 结束时间
+
+        Returns:
+            按结束时间正序排列的事件
+        """
+        first = await self._fetch_page(start, end, 1)
+        total_num = int(first.get("TotalNum") or 0)
+        if total_num > EVENT_RECORDS_MAX:
+            if end - start > EVENT_WINDOW_MIN:
+                middle = start + (end - start) / 2
+                halves = await asyncio.gather(self.fetch_window(start, middle), self.fetch_window(middle, end))
+                return halves[0] + halves[1]
+            logger.warning("推断流事件超过可翻页条数，结果不完整: %s ~ %s, 共%d条, 只取前%d条",
+                           format_time(start), format_time(end), total_num, EVENT_RECORDS_MAX)
+            self.truncated_windows.append((start, end))
+
+        total_page = min(int(first.get("TotalPage") or 1), EVENT_RECORDS_MAX // EVENT_PAGE_SIZE)
+        pages = await asyncio.gather(*(
+            self._fetch_page(start, end, page_num) for page_num in range(2, total_page + 1)
+        ))
+        events = list(first.get("EventList") or [])
+        for page in pages:
+            events.extend(page.get("EventList") or [])
+        events.sort(key=lambda e: (e.get("StreamEndTime") or "", e.get("StreamStartTime") or ""))
+        return events
+
+    async def iter_events(self, start: datetime, end: datetime) -> AsyncIterator[Dict[str, Any]]:
+        """
+        按时间顺序产出时间范围内的全部事件，各子窗口并发拉取
+
+        Args:
+            start: 起始时间
+            end: 结束时间
+
+        Yields:
+            EventList中的单条事件
+        """
+        tasks = [asyncio.ensure_future(self.fetch_window(*window)) for window in split_windows(start, end)]
+        seen = set()
+        try:
+            for task in tasks:
+                for event in await task:
+                    key = event_key(event)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def clamp_range(
+        start_time: Optional[str],
+        end_time: Optional[str],
+        now: Optional[datetime] = None
+) -> Tuple[datetime, datetime]:
+    """
+    将时间范围限制在可查询的历史范围内
+
+    Args:
+        start_time: 起始时间，为空时取可查询的最早时间
+        end_time: 结束时间，为空时取当前时间
+        now: 当前时间，默认取系统时间
+
+    Returns:
+        (起始时间, 结束时间)
+
+    Raises:
+        ValueError: 起始时间晚于结束时间
+    """
+    now = now or datetime.now(timezone.utc).replace(microsecond=0)
+    earliest = now - EVENT_HISTORY_MAX
+    start = parse_time(start_time) if start_time else earliest
+    end = parse_time(end_time) if end_time else now
+    if start < earliest:
+        logger.warning("起始时间早于可查询的历史范围，调整为%s", format_time(earliest))
+        start = earliest
+    end = min(end, now)
+    if start >= end:
+        raise ValueError(f"起始时间必须早于结束时间: {format_time(start)} >= {format_time(end)}")
+    return start, end
+
+
+async def describe_all_live_stream_events(
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        app_name: Optional[str] = None,
+        domain_name: Optional[str] = None,
+        stream_name: Optional[str] = None,
+        is_filter: Optional[int] = None,
+        is_strict: Optional[int] = None,
+        limit: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        aggregator: Optional[Aggregator] = None
+) -> Dict[str, Any]:
+    """
+    查询时间范围内的全部推断流事件并合并为一个结果，指定汇总器时只返回汇总结果
+
+    Args:
+        start_time: 起始时间，为空时取可查询的最早时间
+        end_time: 结束时间，为空时取当前时间
+        app_name: 推流路径
+        domain_name: 推流域名
+        stream_name: 流名称
+        is_filter: 是否过滤
+        is_strict: 是否精确查询
+        limit: 最多返回条数
+        concurrency: 最大并发请求数
+        aggregator: 汇总器，逐条统计而不保留事件列表
+
+    Returns:
+        EventList: 按结束时间正序排列的事件
+        TotalNum: 返回的事件数量
+        StartTime/EndTime: 实际查询的时间范围
+        Truncated: 是否有1分钟内的事件超过接口可翻页的条数而未取全
+        指定汇总器时EventList/TotalNum替换为Aggregator.summary()的结果
+    """
+    start, end = clamp_range(start_time, end_time)
+    query = EventQuery(
+        app_name=app_name,
+        domain_name=domain_name,
+        stream_name=stream_name,
+        is_filter=is_filter,
+        is_strict=is_strict,
+        concurrency=concurrency
+    )
+    event_list = []
+    count = 0
+    events = query.iter_events(start, end)
+    try:
+        async for event in events:
+            count += 1
+            if aggregator is not None:
+                aggregator.add(event)
+            else:
+                event_list.append(event)
+            if limit and count >= limit:
+                break
+    finally:
+        await events.aclose()
+    logger.info("查询推断流事件完成: 共%d条, 请求%d次", count, query.request_count)
+    result = aggregator.summary() if aggregator is not None else {"EventList": event_list, "TotalNum": count}
+    result["StartTime"] = format_time(start)
+    result["EndTime"] = format_time(end)
+    result["Truncated"] = query.truncated
+    return result
@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : event_store.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 推断流事件本地存储，基于SQLite从上次同步位置增量同步，按域名/推流路径/流名称/时间建立索引
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from tools.event_query import EVENT_HISTORY_MAX, EventQuery, format_time, parse_time
+from utils.config import config
+from utils.executor import run_blocking
+from utils.logger import setup_logger
+
+logger = setup_logger("event_store")
+
+# 事件在结束后才会上报，增量同步时从同步位置往前多取一段，重复事件由主键去重
+SYNC_OVERLAP = timedelta(minutes=10)
+# 每批写入的事件数
+INSERT_BATCH_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stream_events (
+    domain_name TEXT NOT NULL,
+    app_name TEXT NOT NULL,
+    stream_name TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    client_ip TEXT NOT NULL,
+    stop_reason TEXT,
+    duration INTEGER,
+    resolution TEXT,
+    PRIMARY KEY (domain_name, app_name, stream_name, start_time, end_time, client_ip)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_stream_events_end_time ON stream_events (end_time);
+CREATE INDEX IF NOT EXISTS idx_stream_events_stream ON stream_events (stream_name, end_time);
+CREATE INDEX IF NOT EXISTS idx_stream_events_domain ON stream_events (domain_name, app_name, end_time);
+CREATE TABLE IF NOT EXISTS sync_state (
+    scope TEXT PRIMARY KEY,
+    high_water TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+COLUMNS = (
+    ("DomainName", "domain_name"),
+    ("AppName", "app_name"),
+    ("StreamName", "stream_name"),
+    ("StreamStartTime", "start_time"),
+    ("StreamEndTime", "end_time"),
+    ("ClientIp", "client_ip"),
+    ("StopReason", "stop_reason"),
+    ("Duration", "duration"),
+    ("Resolution", "resolution"),
+)
+
+
+def _to_row(event: Dict[str, Any]) -> tuple:
+    row = [event.get(field) for field, _ in COLUMNS]
+    # ClientIp是主键的一部分，缺失时按空字符串存储
+    row[5] = row[5] or ""
+    return tuple(row)
+
+
+class EventStore:
+    """推断流事件本地存储"""
+
+    def __init__(self, path: str):
+        """
+        初始化存储
+
+        Args:
+            path: SQLite数据库文件路径
+        """
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        # sqlite3连接不支持多线程并发使用，读写都在线程池中执行，串行化访问
+        self._lock = threading.Lock()
+        # 同一范围同时只允许一个同步任务
+        self._sync_locks: Dict[str, asyncio.Lock] = {}
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+    def insert_events(self, events: List[Dict[str, Any]]) -> int:
+        """
+        写入事件，已存在的事件忽略
+
+        Args:
+            events: DescribeLiveStreamEventList返回的事件
+
+        Returns:
+            新写入的事件数
+        """
+        rows = [_to_row(event) for event in events]
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR IGNORE INTO stream_events ({', '.join(c for _, c in COLUMNS)}) "
+                    f"VALUES ({', '.join('?' for _ in COLUMNS)})",
+                    rows
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def get_high_water(self, scope: str) -> Optional[str]:
+        """读取同步位置"""
+        with self._lock:
+            row = self._conn.execute("SELECT high_water FROM sync_state WHERE scope = ?", (scope,)).fetchone()
+        return row[0] if row else None
+
+    def set_high_water(self, scope: str, high_water: str) -> None:
+        """更新同步位置"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO sync_state (scope, high_water, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(scope) DO UPDATE SET high_water = excluded.high_water, synced_at = excluded.synced_at",
+                (scope, high_water, time.time())
+            )
+
+    def query(
+            self,
+            domain_name: Optional[str] = None,
+            app_name: Optional[str] = None,
+            stream_name: Optional[str] = None,
+            start_time: Optional[str] = None,
+            end_time: Optional[str] = None,
+            stop_reason: Optional[str] = None,
+            limit: Optional[int] = 1000,
+            ascending: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        查询本地事件，时间条件作用于事件结束时间
+
+        Args:
+            domain_name: 推流域名
+            app_name: 推流路径
+            stream_name: 流名称
+            start_time: 起始时间
+            end_time: 结束时间
+            stop_reason: 断流原因
+            limit: 最多返回条数，为空时不限制
+            ascending: 是否按结束时间正序
+
+        Returns:
+            与DescribeLiveStreamEventList字段一致的事件列表
+        """
+        conditions = []
+        args: List[Any] = []
+        for column, value in (
+                ("domain_name", domain_name),
+                ("app_name", app_name),
+                ("stream_name", stream_name),
+                ("stop_reason", stop_reason)
+        ):
+            if value:
+                conditions.append(f"{column} = ?")
+                args.append(value)
+        if start_time:
+            conditions.append("end_time >= ?")
+            args.append(format_time(parse_time(start_time)))
+        if end_time:
+            conditions.append("end_time <= ?")
+            args.append(format_time(parse_time(end_time)))
+
+        sql = f"SELECT {', '.join(c for _, c in COLUMNS)} FROM stream_events"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += f" ORDER BY end_time {'ASC' if ascending else 'DESC'}, start_time"
+        if limit:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [{field: value for (field, _), value in zip(COLUMNS, row)} for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """返回事件数量和各范围的同步位置"""
+        with self._lock:
+            count = self._conn.execute("SELECT COUNT(*) FROM stream_events").fetchone()[0]
+            scopes = self._conn.execute("SELECT scope, high_water, synced_at FROM sync_state").fetchall()
+        return {
+            "path": self.path,
+            "events": count,
+            "sync_state": [
+                {"scope": scope or "*", "high_water": high_water, "synced_at": synced_at}
+                for scope, high_water, synced_at in scopes
+            ],
+        }
+
+    async def sync(self, domain_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        从上次同步位置增量同步事件，首次同步拉取可查询的全部历史
+
+        Args:
+            domain_name: 推流域名，为空时同步全部域名
+
+        Returns:
+            同步范围、拉取和新写入的事件数，Truncated为True时同步位置停在不完整的子窗口之前
+        """
+        scope = domain_name or ""
+        lock = self._sync_locks.setdefault(scope, asyncio.Lock())
+        async with lock:
+            now = datetime.now(timezone.utc).replace(microsecond=0)
+            earliest = now - EVENT_HISTORY_MAX
+            high_water = await run_blocking(self.get_high_water, scope)
+            start = max(parse_time(high_water) - SYNC_OVERLAP, earliest) if high_water else earliest
+
+            query = EventQuery(domain_name=domain_name)
+            fetched = inserted = 0
+            batch: List[Dict[str, Any]] = []
+            async for event in query.iter_events(start, now):
+                batch.append(event)
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    fetched += len(batch)
+                    inserted += await run_blocking(self.insert_events, batch)
+                    batch = []
+            if batch:
+                fetched += len(batch)
+                inserted += await run_blocking(self.insert_events, batch)
+            # 不完整的子窗口不计入已同步范围，同步位置最多推进到其中最早的起始时间
+            synced_until = min([now] + [window[0] for window in query.truncated_windows])
+            if not high_water or synced_until > parse_time(high_water):
+                await run_blocking(self.set_high_water, scope, format_time(synced_until))
+
+        logger.info("推断流事件同步完成: domain_name=%s, 拉取%d条, 新增%d条", domain_name, fetched, inserted)
+        return {
+            "DomainName": domain_name,
+            "StartTime": format_time(start),
+            "EndTime": format_time(now),
+            "Fetched": fetched,
+            "Inserted": inserted,
+            "Truncated": query.truncated,
+        }
+
+
+_store: Optional[EventStore] = None
+_store_lock = threading.Lock()
+
+
+def get_event_store() -> EventStore:
+    """
+    获取进程级事件存储，首次使用时打开
+
+    Raises:
+        RuntimeError: 未配置EVENT_STORE_PATH
+    """
+    global _store
+    if _store is None:
+        if not config.EVENT_STORE_PATH:
+            raise RuntimeError("本地事件库未启用，请设置环境变量EVENT_STORE_PATH")
+        with _store_lock:
+            if _store is None:
+                _store = EventStore(config.EVENT_STORE_PATH)
+    return _store
+
+
+async def _sync_loop(interval: float, domains: List[Optional[str]]) -> None:
+    store = get_event_store()
+    while True:
+        for domain_name in domains:
+            try:
+                await store.sync(domain_name)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("推断流事件同步失败: domain_name=%s, %s", domain_name, e)
+        await asyncio.sleep(interval)
+
+
+_sync_task: Optional[asyncio.Task] = None
+_sync_refs = 0
+
+
+@asynccontextmanager
+async def background_sync() -> AsyncIterator[None]:
+    """
+    在上下文内运行后台同步任务
+
+    SSE模式下每个会话都会进入一次lifespan，按引用计数只保留一个同步任务
+    """
+    global _sync_task, _sync_refs
+    enabled = bool(config.EVENT_STORE_PATH) and config.EVENT_STORE_SYNC_INTERVAL > 0
+    if enabled:
+        _sync_refs += 1
+        if _sync_task is None or _sync_task.done():
+            domains = [d.strip() for d in config.EVENT_STORE_SYNC_DOMAINS.split(",") if d.strip()] or [None]
+            logger.info("启动推断流事件后台同步: 间隔%s秒, 域名%s", config.EVENT_STORE_SYNC_INTERVAL, domains)
+            _sync_task = asyncio.create_task(_sync_loop(config.EVENT_STORE_SYNC_INTERVAL, domains))
+    try:
+        yield
+    finally:
+        if enabled:
+            _sync_refs -= 1
+            if _sync_refs == 0 and _sync_task is not None:
+                _sync_task.cancel()
+                try:
+                    await _sync_task
+                except asyncio.CancelledError:
+                    pass
+                _sync_task = None
@@ -10,6 +10,7 @@
 
 from typing import Dict, Any, List, Optional
 
+from utils.async_tencent_client import AsyncTencentCloudClient
 from utils.config import config
 from utils.tencent_client import TencentCloudClient
 from utils.logger import setup_logger
@@ -1047,3 +1048,38 @@ class LiveClient(TencentCloudClient):
         }
 
         return self.call_api("DeleteLiveTranscodeRule", params)
+
+
+class ThreadedLiveClient(LiveClient):
+    """
+    Live API 线程池客户端
+
+    复用LiveClient的参数组装，call_api为TencentCloudClient.async_call_api：
+    限流排队、缓存、合并和重试在事件循环中完成，只有SDK请求放入线程池，
+    因此所有接口方法都返回协程，需要await
+    """
+
+    call_api = TencentCloudClient.async_call_api
+
+
+class AsyncLiveClient(AsyncTencentCloudClient, LiveClient):
+    """
+    Live API 异步客户端
+
+    复用LiveClient的参数组装，call_api由AsyncTencentCloudClient提供，
+    因此所有接口方法都返回协程，需要await
+    """
+
+    def __init__(self, region: Optional[str] = None):
+        """
+        初始化Live API异步客户端
+        Args:
+            region: 区域，默认使用配置中的区域
+        """
+        AsyncTencentCloudClient.__init__(
+            self,
+            service="live",
+            version=config.LIVE_API_VERSION,
+            endpoint=config.LIVE_ENDPOINT,
+            region=region
+        )
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : paginator.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 分页接口的自动翻页，首页获取总页数后并发拉取剩余页
+"""
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+from tools.aggregation import Aggregator
+from tools.live_api import AsyncLiveClient
+from utils.config import config
+from utils.logger import setup_logger
+
+logger = setup_logger("paginator")
+
+# DescribeLiveStreamOnlineList单页最大条数
+ONLINE_LIST_MAX_PAGE_SIZE = 100
+
+
+async def iter_pages(
+        fetch_page: Callable[[int], Awaitable[Dict[str, Any]]],
+        concurrency: int
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    按页码顺序产出分页响应，第2页起并发拉取
+
+    Args:
+        fetch_page: 页码 -> 响应中的Response字段
+        concurrency: 最大并发页数
+
+    Yields:
+        每一页的Response
+    """
+    first = await fetch_page(1)
+    yield first
+    total_page = int(first.get("TotalPage") or 1)
+    if total_page <= 1:
+        return
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(page_num: int) -> Dict[str, Any]:
+        async with semaphore:
+            return await fetch_page(page_num)
+
+    tasks = [asyncio.ensure_future(fetch(page_num)) for page_num in range(2, total_page + 1)]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        # 调用方提前结束迭代或出错时取消尚未完成的页
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def iter_online_streams(
+        app_name: Optional[str] = None,
+        domain_name: Optional[str] = None,
+        stream_name: Optional[str] = None,
+        page_size: int = ONLINE_LIST_MAX_PAGE_SIZE,
+        concurrency: Optional[int] = None,
+        client: Optional[AsyncLiveClient] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    逐条产出全部直播中的流
+
+    翻页期间流可能上下线导致条目在页间移动，按(域名, 推流路径, 流名称)去重
+
+    Args:
+        app_name: 推流路径
+        domain_name: 推流域名
+        stream_name: 流名称
+        page_size: 每页大小，最大100
+        concurrency: 最大并发页数，默认使用配置
+        client: Live API异步客户端，默认新建
+
+    Yields:
+        OnlineInfo中的单条流信息
+    """
+    client = client or AsyncLiveClient()
+    page_size = min(max(int(page_size), 1), ONLINE_LIST_MAX_PAGE_SIZE)
+
+    async def fetch_page(page_num: int) -> Dict[str, Any]:
+        result = await client.describe_live_stream_online_list(
+            app_name=app_name,
+            domain_name=domain_name,
+            page_num=page_num,
+            page_size=page_size,
+            stream_name=stream_name
+        )
+        return result["Response"]
+
+    seen = set()
+    async for page in iter_pages(fetch_page, concurrency or config.PAGINATOR_CONCURRENCY):
+        for info in page.get("OnlineInfo") or []:
+            key = (info.get("DomainName"), info.get("AppName"), info.get("StreamName"))
+            if key in seen:
+                continue
+            seen.add(key)
+            yield info
+
+
+async def describe_all_online_streams(
+        app_name: Optional[str] = None,
+        domain_name: Optional[str] = None,
+        stream_name: Optional[str] = None,
+        stream_name_prefix: Optional[str] = None,
+        limit: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        aggregator: Optional[Aggregator] = None
+) -> Dict[str, Any]:
+    """
+    查询全部直播中的流并合并为一个结果，指定汇总器时只返回汇总结果
+
+    Args:
+        app_name: 推流路径
+        domain_name: 推流域名
+        stream_name: 流名称，精确匹配
+        stream_name_prefix: 流名称前缀，本地过滤
+        limit: 最多返回条数，达到后停止翻页
+        concurrency: 最大并发页数
+        aggregator: 汇总器，逐条统计而不保留流列表
+
+    Returns:
+        OnlineInfo: 直播中的流列表
+        TotalNum: 返回的流数量
+        指定汇总器时返回Aggregator.summary()的结果
+    """
+    online_info = []
+    count = 0
+    streams = iter_online_streams(
+        app_name=app_name,
+        domain_name=domain_name,
+        stream_name=stream_name,
+        concurrency=concurrency
+    )
+    try:
+        async for info in streams:
+            if stream_name_prefix and not str(info.get("StreamName", "")).startswith(stream_name_prefix):
+                continue
+            count += 1
+            if aggregator is not None:
+                aggregator.add(info)
+            else:
+                online_info.append(info)
+            if limit and count >= limit:
+                break
+    finally:
+        await streams.aclose()
+    logger.info("查询全部直播中的流完成: 共%d条", count)
+    if aggregator is not None:
+        return aggregator.summary()
+    return {"OnlineInfo": online_info, "TotalNum": len(online_info)}
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : url_signer.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 推流/播放地址签名，txSecret = md5(鉴权key + 流名称 + txTime)
+"""
+
+import hashlib
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+SECONDS_PER_DAY = 86400
+
+
+def tx_time(expire_days: float, now: Optional[float] = None) -> str:
+    """
+    计算过期时间的16进制UNIX时间戳
+
+    Args:
+        expire_days: 有效期(天)
+        now: 当前时间戳，默认取系统时间
+
+    Returns:
+        大写16进制时间戳
+    """
+    if now is None:
+        now = time.time()
+    return format(int(now + expire_days * SECONDS_PER_DAY), "X")
+
+
+class StreamUrlSigner:
+    """
+    单个域名的地址签名器
+
+    鉴权key的md5状态和地址前缀在构造时预先计算，
+    每个地址只需复制md5状态并追加流名称与txTime
+    """
+
+    __slots__ = ("domain_name", "_key_md5", "_prefix")
+
+    def __init__(self, domain_name: str, auth_key: Optional[str]):
+        """
+        初始化签名器
+
+        Args:
+            domain_name: 推流或播放域名
+            auth_key: 鉴权key，为空时生成不带签名的地址
+        """
+        self.domain_name = domain_name
+        self._key_md5 = hashlib.md5(auth_key.encode("utf-8")) if auth_key else None
+        self._prefix = "://" + domain_name + "/"
+
+    @property
+    def enabled(self) -> bool:
+        """是否开启鉴权"""
+        return self._key_md5 is not None
+
+    def query(self, stream_name: str, tx_time_hex: str) -> str:
+        """
+        生成鉴权参数
+
+        Args:
+            stream_name: 流名称
+            tx_time_hex: 16进制过期时间
+
+        Returns:
+            ?txSecret=...&txTime=...，未开启鉴权时返回空字符串
+        """
+        if self._key_md5 is None:
+            return ""
+        md5 = self._key_md5.copy()
+        md5.update((stream_name + tx_time_hex).encode("utf-8"))
+        return "?txSecret=" + md5.hexdigest() + "&txTime=" + tx_time_hex
+
+    def push_url(self, app_name: str, stream_name: str, tx_time_hex: str) -> str:
+        """
+        生成RTMP推流地址
+
+        Args:
+            app_name: 推流路径
+            stream_name: 流名称
+            tx_time_hex: 16进制过期时间
+
+        Returns:
+            RTMP推流地址
+        """
+        return "rtmp" + self._prefix + app_name + "/" + stream_name + self.query(stream_name, tx_time_hex)
+
+    def play_urls(
+            self,
+            app_name: str,
+            stream_name: str,
+            tx_time_hex: str,
+            transcode_template: Optional[Any] = None
+    ) -> Dict[str, str]:
+        """
+        生成播放地址
+
+        Args:
+            app_name: 推流路径
+            stream_name: 流名称
+            tx_time_hex: 16进制过期时间
+            transcode_template: 转码模板，填写后播放转码流
+
+        Returns:
+            RTMPAddr/FLVAddr/HLSAddr/WebRTCAddr
+        """
+        path = self._prefix + app_name + "/" + stream_name
+        if transcode_template is not None:
+            path += "_" + str(transcode_template)
+        query = self.query(stream_name, tx_time_hex)
+        return {
+            "RTMPAddr": "rtmp" + path + query,
+            "FLVAddr": "http" + path + ".flv" + query,
+            "HLSAddr": "http" + path + ".m3u8" + query,
+            "WebRTCAddr": "webrtc" + path + query,
+        }
+
+
+def sign_batch(
+        streams: Iterable[Dict[str, Any]],
+        push_signer: Optional[StreamUrlSigner] = None,
+        play_signer: Optional[StreamUrlSigner] = None,
+        default_expire_days: float = 7,
+        now: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """
+    批量生成推流/播放地址
+
+    Args:
+        streams: 流列表，每项包含app_name、stream_name，可选expire_time(天)、transcode_template
+        push_signer: 推流域名签名器，为空时不生成推流地址
+        play_signer: 播放域名签名器，为空时不生成播放地址
+        default_expire_days: 未指定expire_time时的有效期(天)
+        now: 当前时间戳，同一批次共用
+
+    Returns:
+        每个流的地址信息，Status为Success或Failed，单条参数错误时记录Error，不影响其他条目
+    """
+    if now is None:
+        now = time.time()
+    # 同一批次中相同有效期只计算一次txTime
+    tx_times: Dict[float, str] = {}
+    results = []
+    for item in streams:
+        app_name = item.get("app_name") or "live"
+        stream_name = item.get("stream_name")
+        status = {"AppName": app_name, "StreamName": stream_name}
+        if not stream_name:
+            results.append(dict(status, Status="Failed", Error="缺少stream_name"))
+            continue
+        expire_days = item.get("expire_time")
+        if expire_days is None:
+            expire_days = default_expire_days
+        tx_time_hex = tx_times.get(expire_days)
+        if tx_time_hex is None:
+            try:
+                tx_time_hex = tx_times[expire_days] = tx_time(expire_days, now)
+            except (TypeError, ValueError):
+                results.append(dict(status, Status="Failed", Error=f"expire_time无效: {expire_days!r}"))
+                continue
+
+        result = dict(status, Status="Success", TxTime=tx_time_hex)
+        if push_signer is not None:
+            result["PushAddr"] = push_signer.push_url(app_name, stream_name, tx_time_hex)
+        if play_signer is not None:
+            result.update(play_signer.play_urls(
+                app_name, stream_name, tx_time_hex, item.get("transcode_template")
+            ))
+        results.append(result)
+    return results
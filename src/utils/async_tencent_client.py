@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : async_tencent_client.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 基于asyncio的腾讯云API客户端，自行完成TC3-HMAC-SHA256签名，经httpx连接池复用长连接
+"""
+
+import asyncio
+import hashlib
+import hmac
+import json
+import time
+import weakref
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+from utils.circuit_breaker import circuit_breakers
+from utils.client_pool import credential_identity
+from utils.config import config
+from utils.fixtures import fixture_store
+from utils.http_pool import create_pool
+from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.rate_limiter import rate_limiter
+from utils.response_cache import response_cache
+from utils.retry import retry_policy
+from utils.single_flight import is_read_only, request_key, single_flight
+from utils.tencent_client import request_id_of
+from utils.tracing import tracer
+
+logger = setup_logger("async_tencent_client")
+
+TC3_ALGORITHM = "TC3-HMAC-SHA256"
+CONTENT_TYPE = "application/json"
+SIGNED_HEADERS = "content-type;host;x-tc-action"
+
+# 连接池绑定事件循环，按(事件循环, 端点)分别维护
+_http_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = \
+    weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=64)
+def tc3_signing_key(secret_key: str, date: str, service: str) -> bytes:
+    """
+    计算TC3派生签名密钥，按(密钥, 日期, 服务)缓存
+
+    Args:
+        secret_key: 腾讯云SecretKey
+        date: UTC日期，格式为YYYY-MM-DD
+        service: 服务名称
+
+    Returns:
+        派生签名密钥
+    """
+    secret_date = hmac.new(("TC3" + secret_key).encode("utf-8"), date.encode("utf-8"), hashlib.sha256).digest()
+    secret_service = hmac.new(secret_date, service.encode("utf-8"), hashlib.sha256).digest()
+    return hmac.new(secret_service, b"tc3_request", hashlib.sha256).digest()
+
+
+def tc3_sign(
+        secret_id: str,
+        secret_key: str,
+        service: str,
+        host: str,
+        action: str,
+        payload: bytes,
+        timestamp: int,
+        content_type: str = CONTENT_TYPE,
+        signed_headers: str = SIGNED_HEADERS
+) -> str:
+    """
+    生成TC3-HMAC-SHA256的Authorization头
+
+    Args:
+        secret_id: 腾讯云SecretId
+        secret_key: 腾讯云SecretKey
+        service: 服务名称
+        host: 请求Host
+        action: API操作名称
+        payload: 请求体
+        timestamp: 请求时间戳(秒)
+        content_type: 请求的Content-Type
+        signed_headers: 参与签名的请求头，取content-type、host、x-tc-action中的若干个，以分号分隔
+
+    Returns:
+        Authorization头的值
+    """
+    date = datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+    values = {"content-type": content_type, "host": host, "x-tc-action": action.lower()}
+    canonical_headers = "".join(f"{name}:{values[name]}\n" for name in signed_headers.split(";"))
+    canonical_request = (
+        f"POST\n/\n\n{canonical_headers}\n{signed_headers}\n"
+        f"{hashlib.sha256(payload).hexdigest()}"
+    )
+    credential_scope = f"{date}/{service}/tc3_request"
+    string_to_sign = (
+        f"{TC3_ALGORITHM}\n{timestamp}\n{credential_scope}\n"
+        f"{hashlib.sha256(canonical_request.encode('utf-8')).hexdigest()}"
+    )
+    signature = hmac.new(
+        tc3_signing_key(secret_key, date, service),
+        string_to_sign.encode("utf-8"),
+        hashlib.sha256
+    ).hexdigest()
+    return (f"{TC3_ALGORITHM} Credential={secret_id}/{credential_scope}, "
+            f"SignedHeaders={signed_headers}, Signature={signature}")
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2需要安装h2，未安装时回退到HTTP/1.1"""
+    if not config.ASYNC_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401  pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        logger.warning("未安装h2，HTTP/2已禁用，使用HTTP/1.1")
+        return False
+    return True
+
+
+def get_http_pool(endpoint: str):
+    """获取当前事件循环中指定端点共享的连接池"""
+    loop = asyncio.get_running_loop()
+    pools = _http_pools.setdefault(loop, {})
+    pool = pools.get(endpoint)
+    if pool is None or pool.is_closed:
+        with tracer.span("client.create", endpoint=endpoint):
+            pool = create_pool(
+                config.API_SCHEME,
+                endpoint,
+                http2=_http2_enabled(),
+                max_connections=config.ASYNC_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=config.ASYNC_HTTP_KEEPALIVE_EXPIRY,
+                timeout=config.API_TIMEOUT
+            )
+        pools[endpoint] = pool
+    return pool
+
+
+async def close_http_pools() -> None:
+    """关闭当前事件循环的全部连接池"""
+    pools = _http_pools.pop(asyncio.get_running_loop(), {})
+    for pool in pools.values():
+        await pool.aclose()
+
+
+class AsyncTencentCloudClient:
+    """腾讯云API异步客户端"""
+
+    def __init__(
+            self,
+            service: str,
+            version: str,
+            endpoint: str,
+            region: Optional[str] = None
+    ):
+        """
+        初始化腾讯云API异步客户端
+
+        Args:
+            service: 服务名称
+            version: API版本
+            endpoint: API端点
+            region: 区域，默认使用配置中的区域
+        """
+        self.service = service
+        self.version = version
+        self.endpoint = endpoint
+        self.region = region or ""
+
+    def _build_request(self, action: str, params: Dict[str, Any]) -> Tuple[Dict[str, str], bytes]:
+        """构造签名后的请求头和请求体"""
+        payload = json.dumps(params, separators=(",", ":")).encode("utf-8")
+        timestamp = int(time.time())
+        headers = {
+            "Content-Type": CONTENT_TYPE,
+            "Host": self.endpoint,
+            "X-TC-Action": action,
+            "X-TC-Timestamp": str(timestamp),
+            "X-TC-Version": self.version,
+            "Authorization": tc3_sign(
+                config.SECRET_ID,
+                config.SECRET_KEY,
+                self.service,
+                self.endpoint,
+                action,
+                payload,
+                timestamp
+            ),
+        }
+        if self.region:
+            headers["X-TC-Region"] = self.region
+        return headers, payload
+
+    async def call_api(self, action: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        调用腾讯云API
+
+        Args:
+            action: API操作名称
+            params: API参数，默认为空字典
+
+        Returns:
+            API响应结果
+
+        Raises:
+            TencentCloudSDKException: API调用失败
+        """
+        if params is None:
+            params = {}
+
+        with tracer.span("api.call", action=action, region=self.region) as span:
+            result = await self._call_api(action, params)
+            span.set_attribute("request_id", request_id_of(result))
+            return result
+
+    async def _call_api(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """查询经缓存、合并和重试后调用，写操作重试后使相关查询缓存失效"""
+        if is_read_only(action):
+            key = request_key(action, params, self.region, self.endpoint)
+            return await response_cache.get_or_fetch_async(key, action, lambda: single_flight.do_async(
+                key,
+                lambda: retry_policy.call_async(action, lambda: self._call_once(action, params))
+            ))
+        try:
+            return await retry_policy.call_async(action, lambda: self._call_once(action, params))
+        finally:
+            # 写操作失败时也可能已部分生效，同样使相关查询缓存失效
+            await response_cache.invalidate_for_write_async(action)
+
+    async def _call_once(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """单次调用，每次重试都重新排队限流，排队结束后才进入熔断和指标统计"""
+        with tracer.span("api.attempt", action=action):
+            with tracer.span("rate_limit.acquire"):
+                await rate_limiter.acquire_async(
+                    action, self.region, credential_identity(config.SECRET_ID, config.SECRET_KEY)
+                )
+            with metrics.track_api(action, self.region), circuit_breakers.get(self.region, self.endpoint).guard():
+                return await self._send(action, params)
+
+    async def _send(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """签名并发送请求，每次重试都重新签名"""
+        logger.info("调用API: %s, 参数: %s", action, params)
+        if fixture_store.replaying:
+            return await fixture_store.replay_async(action, params, self.region)
+        if not fixture_store.recording:
+            return await self._request(action, params)
+        start = time.perf_counter()
+        try:
+            result = await self._request(action, params)
+        except TencentCloudSDKException as e:
+            fixture_store.record(action, params, self.region, time.perf_counter() - start, error=e)
+            raise
+        fixture_store.record(action, params, self.region, time.perf_counter() - start, response=result)
+        return result
+
+    async def _request(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """签名并发送请求，解析响应"""
+        # 排队结束后再签名，避免时间戳过期
+        with tracer.span("api.sign"):
+            headers, payload = self._build_request(action, params)
+        try:
+            pool = get_http_pool(self.endpoint)
+            with tracer.span("http.request", endpoint=self.endpoint, request_bytes=len(payload)) as span:
+                response = await pool.post("/", headers, payload)
+                span.set_attribute("http.status", response.status)
+        except OSError as e:
+            logger.error("API调用失败: %r", e)
+            raise TencentCloudSDKException("ClientNetworkError", repr(e)) from e
+
+        if response.status != 200:
+            error = TencentCloudSDKException("ServerNetworkError", response.body.decode("utf-8", "replace"))
+            logger.error("API调用失败: %s", error)
+            raise error
+
+        with tracer.span("api.deserialize", response_bytes=len(response.body)):
+            result = json.loads(response.body)
+        error_info = result.get("Response", {}).get("Error")
+        if error_info:
+            error = TencentCloudSDKException(
+                error_info.get("Code"),
+                error_info.get("Message"),
+                result["Response"].get("RequestId")
+            )
+            logger.error("API调用失败: %s", error)
+            raise error
+        return result
@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : circuit_breaker.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 按(区域, 端点)熔断，上游连续故障时快速失败，恢复期后放行少量探测请求
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+from utils.config import config
+from utils.logger import setup_logger
+from utils.retry import TRANSIENT_CODES, match_code
+
+logger = setup_logger("circuit_breaker")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# 熔断时抛出的错误码
+CIRCUIT_OPEN_CODE = "ClientCircuitOpen"
+
+
+class CircuitBreaker:
+    """熔断器"""
+
+    def __init__(
+            self,
+            name: str,
+            failure_threshold: int = 5,
+            recovery_timeout: float = 30.0,
+            half_open_max_calls: int = 1
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            name: 名称，用于日志和错误信息
+            failure_threshold: 连续故障多少次后熔断，0表示不熔断
+            recovery_timeout: 熔断持续时间(秒)，之后进入半开状态
+            half_open_max_calls: 半开状态下同时放行的探测请求数
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """当前状态，熔断已到恢复期时视为半开"""
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def _before_call(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            if state == CLOSED:
+                return
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return
+            self._rejected += 1
+            retry_after = max(0.0, self.recovery_timeout - (now - self._opened_at))
+        raise TencentCloudSDKException(
+            CIRCUIT_OPEN_CODE,
+            f"{self.name} 上游连续故障已熔断，{retry_after:.0f}秒后重试"
+        )
+
+    def _on_success(self) -> None:
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info("熔断恢复: %s", self.name)
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def _on_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (self._state == CLOSED and self._failures >= self.failure_threshold):
+                if self._state == CLOSED:
+                    logger.error("连续故障%d次，熔断: %s", self._failures, self.name)
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def _on_abort(self) -> None:
+        """调用被取消，归还半开状态的探测名额"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """
+        保护一次调用，熔断时抛出ClientCircuitOpen
+
+        只有上游故障(TRANSIENT_CODES)计为失败，参数错误等业务错误说明上游可用，计为成功
+        """
+        self._before_call()
+        if self.failure_threshold <= 0:
+            yield
+            return
+        try:
+            yield
+        except TencentCloudSDKException as e:
+            if match_code(e.get_code() or "", TRANSIENT_CODES):
+                self._on_failure()
+            else:
+                self._on_success()
+            raise
+        except BaseException:
+            self._on_abort()
+            raise
+        self._on_success()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """返回状态快照"""
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "rejected": self._rejected,
+                "open_remaining_seconds": round(max(0.0, self.recovery_timeout - (now - self._opened_at)), 3)
+                if state == OPEN else 0.0,
+            }
+
+
+class CircuitBreakerRegistry:
+    """按(区域, 端点)维护熔断器"""
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float, half_open_max_calls: int):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, region: str, endpoint: str) -> CircuitBreaker:
+        """
+        获取熔断器
+
+        Args:
+            region: 区域
+            endpoint: API端点
+
+        Returns:
+            熔断器
+        """
+        key = (region, endpoint)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = self._breakers[key] = CircuitBreaker(
+                        f"{endpoint}({region or '-'})",
+                        self.failure_threshold,
+                        self.recovery_timeout,
+                        self.half_open_max_calls
+                    )
+        return breaker
+
+    def stats(self) -> Dict[str, Any]:
+        """返回全部熔断器的状态"""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+circuit_breakers = CircuitBreakerRegistry(
+    failure_threshold=config.BREAKER_FAILURE_THRESHOLD,
+    recovery_timeout=config.BREAKER_RECOVERY_TIMEOUT,
+    half_open_max_calls=config.BREAKER_HALF_OPEN_MAX_CALLS
+)
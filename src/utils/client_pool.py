@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : client_pool.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 进程级腾讯云API客户端注册表，按(服务, 版本, 端点, 区域, 凭证)复用客户端
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from utils.config import config
+from utils.logger import setup_logger
+
+logger = setup_logger("client_pool")
+
+
+def credential_identity(secret_id: str, secret_key: str) -> str:
+    """
+    计算凭证标识，避免在注册表键中保存明文密钥
+
+    Args:
+        secret_id: 腾讯云SecretId
+        secret_key: 腾讯云SecretKey
+
+    Returns:
+        凭证标识
+    """
+    digest = hashlib.sha256(secret_key.encode("utf-8")).hexdigest()[:16]
+    return f"{secret_id}:{digest}"
+
+
+def _close_clients(clients: List[Any]) -> None:
+    """
+    关闭被移出注册表的客户端的HTTP会话，释放其保持的长连接
+
+    SDK客户端的requests会话位于client.request.conn._session；
+    会话关闭后仍可继续发送请求，正在使用被淘汰客户端的调用不受影响
+    """
+    for client in clients:
+        close = getattr(client, "close", None)
+        if close is None:
+            conn = getattr(getattr(client, "request", None), "conn", None)
+            close = getattr(getattr(conn, "_session", None), "close", None)
+        if close is None:
+            continue
+        try:
+            close()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("关闭客户端失败: %s", e)
+
+
+class ClientPool:
+    """线程安全的客户端注册表，复用客户端及其底层HTTP会话，并淘汰空闲客户端"""
+
+    def __init__(self, idle_timeout: float = 300, max_size: int = 32):
+        """
+        初始化客户端注册表
+
+        Args:
+            idle_timeout: 空闲淘汰时间(秒)，小于等于0表示不淘汰
+            max_size: 最多缓存的客户端数量
+        """
+        self.idle_timeout = idle_timeout
+        self.max_size = max_size
+        self._clients: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """
+        获取客户端，不存在时通过factory创建
+
+        factory在锁外执行，创建较慢时不阻塞其他键的获取；同一键并发创建时保留先写入的客户端
+
+        Args:
+            key: 注册表键
+            factory: 客户端创建函数
+
+        Returns:
+            客户端实例
+        """
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._evict_idle(now)
+            client = self._touch(key, now)
+            if client is None:
+                self.misses += 1
+        _close_clients(evicted)
+        if client is not None:
+            return client
+
+        created = factory()
+        now = time.monotonic()
+        with self._lock:
+            client = self._touch(key, now)
+            if client is None:
+                client = created
+                self._clients[key] = (client, now)
+                evicted = []
+                while len(self._clients) > self.max_size:
+                    evicted.append(self._clients.popitem(last=False)[1][0])
+                    self.evictions += 1
+            else:
+                evicted = [created]
+        _close_clients(evicted)
+        return client
+
+    def _touch(self, key: Hashable, now: float) -> Any:
+        """返回已缓存的客户端并更新使用时间，不存在时返回None，调用方需持有锁"""
+        entry = self._clients.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+        self._clients[key] = (entry[0], now)
+        self._clients.move_to_end(key)
+        return entry[0]
+
+    def _evict_idle(self, now: float) -> List[Any]:
+        """淘汰空闲超时的客户端，返回被淘汰的客户端，调用方需持有锁"""
+        evicted: List[Any] = []
+        if self.idle_timeout <= 0:
+            return evicted
+        # 按最近使用排序，最早使用的在队首
+        while self._clients:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if now - last_used < self.idle_timeout:
+                break
+            del self._clients[key]
+            evicted.append(client)
+            self.evictions += 1
+            logger.debug("淘汰空闲客户端: %s", key[:4] if isinstance(key, tuple) else key)
+        return evicted
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        移除客户端并关闭其HTTP会话
+
+        Args:
+            key: 注册表键，为空时清空全部
+        """
+        with self._lock:
+            if key is None:
+                removed = [client for client, _ in self._clients.values()]
+                self._clients.clear()
+            else:
+                entry = self._clients.pop(key, None)
+                removed = [entry[0]] if entry is not None else []
+        _close_clients(removed)
+
+    def stats(self) -> Dict[str, Any]:
+        """返回注册表命中统计"""
+        with self._lock:
+            return {
+                "size": len(self._clients),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+client_pool = ClientPool(
+    idle_timeout=config.CLIENT_POOL_IDLE_TIMEOUT,
+    max_size=config.CLIENT_POOL_MAX_SIZE
+)
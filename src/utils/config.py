@@ -26,7 +26,102 @@ class Config:
     LIVE_API_VERSION = "2018-08-01"
 
     # API端点
-    LIVE_ENDPOINT = "live.tencentcloudapi.com"
+    LIVE_ENDPOINT = os.getenv("LIVE_ENDPOINT", "live.tencentcloudapi.com")
+
+    # API请求协议，本地调试桩服务可设置为http
+    API_SCHEME = os.getenv("TENCENTCLOUD_API_SCHEME", "https")
+
+    # 客户端注册表配置
+    CLIENT_POOL_IDLE_TIMEOUT = float(os.getenv("CLIENT_POOL_IDLE_TIMEOUT", "300"))
+    CLIENT_POOL_MAX_SIZE = int(os.getenv("CLIENT_POOL_MAX_SIZE", "32"))
+
+    # 同步API调用线程池大小
+    API_EXECUTOR_WORKERS = int(os.getenv("API_EXECUTOR_WORKERS", "16"))
+
+    # API请求超时(秒)
+    API_TIMEOUT = float(os.getenv("API_TIMEOUT", "60"))
+
+    # 异步HTTP连接池配置，ASYNC_HTTP2需要安装h2
+    ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv("ASYNC_HTTP_MAX_CONNECTIONS", "100"))
+    ASYNC_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("ASYNC_HTTP_KEEPALIVE_EXPIRY", "30"))
+    ASYNC_HTTP2 = os.getenv("ASYNC_HTTP2", "0") == "1"
+
+    # 推流/播放鉴权key缓存
+    AUTH_KEY_CACHE_TTL = float(os.getenv("AUTH_KEY_CACHE_TTL", "300"))
+    AUTH_KEY_CACHE_SIZE = int(os.getenv("AUTH_KEY_CACHE_SIZE", "1024"))
+
+    # 自动翻页时的最大并发页数
+    PAGINATOR_CONCURRENCY = int(os.getenv("PAGINATOR_CONCURRENCY", "8"))
+
+    # 按API操作的客户端限流，RATE_LIMITS形如"DescribeLiveStreamOnlineList=10,DropLiveStream=50"，
+    # 未单独配置的操作使用RATE_LIMIT_DEFAULT，0表示不限制；RATE_LIMIT_SCOPE可取action,region,credential的组合
+    RATE_LIMIT_DEFAULT = float(os.getenv("RATE_LIMIT_DEFAULT", "20"))
+    RATE_LIMITS = os.getenv("RATE_LIMITS", "")
+    RATE_LIMIT_SCOPE = os.getenv("RATE_LIMIT_SCOPE", "action")
+
+    # API调用重试：最多尝试次数(含首次)、首次退避上限、单次退避上限和总时限(秒)
+    RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+    RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.2"))
+    RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "5"))
+    RETRY_DEADLINE = float(os.getenv("RETRY_DEADLINE", "30"))
+
+    # 按(区域, 端点)熔断：连续故障次数阈值(0表示不熔断)、熔断持续时间(秒)、半开状态的探测请求数
+    BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    BREAKER_RECOVERY_TIMEOUT = float(os.getenv("BREAKER_RECOVERY_TIMEOUT", "30"))
+    BREAKER_HALF_OPEN_MAX_CALLS = int(os.getenv("BREAKER_HALF_OPEN_MAX_CALLS", "1"))
+
+    # 合并相同的并发只读请求
+    SINGLE_FLIGHT_ENABLED = os.getenv("SINGLE_FLIGHT_ENABLED", "1") == "1"
+
+    # 查询类API响应缓存：RESPONSE_CACHE_TTLS按操作覆盖默认有效期，形如"DescribeLiveDomains=120"，0表示不缓存；
+    # 过期后RESPONSE_CACHE_STALE_TTL秒内先返回旧值并后台刷新；RESPONSE_CACHE_MAX_ENTRIES为0时关闭缓存
+    RESPONSE_CACHE_TTLS = os.getenv("RESPONSE_CACHE_TTLS", "")
+    RESPONSE_CACHE_STALE_TTL = float(os.getenv("RESPONSE_CACHE_STALE_TTL", "30"))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+    # 查询缓存内存占用上限(字节)，按响应JSON序列化后的大小计算，0表示只按条目数限制
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+    # 查询缓存的磁盘目录，设置后多个服务进程共享持久化的查询结果，例如 ~/.cache/tencent-cloud-mcp
+    DISK_CACHE_DIR = os.getenv("DISK_CACHE_DIR", "")
+
+    # HTTP传输(sse/streamable-http)：监听地址、工作进程数、连接保持时间(秒)、优雅退出等待时间(秒)、
+    # 最大并发连接数(0表示不限制)、监听队列长度、是否输出访问日志
+    HTTP_HOST = os.getenv("HTTP_HOST", "0.0.0.0")
+    HTTP_WORKERS = int(os.getenv("HTTP_WORKERS", "1"))
+    HTTP_KEEP_ALIVE_TIMEOUT = int(os.getenv("HTTP_KEEP_ALIVE_TIMEOUT", "75"))
+    HTTP_GRACEFUL_TIMEOUT = int(os.getenv("HTTP_GRACEFUL_TIMEOUT", "30"))
+    HTTP_LIMIT_CONCURRENCY = int(os.getenv("HTTP_LIMIT_CONCURRENCY", "0"))
+    HTTP_BACKLOG = int(os.getenv("HTTP_BACKLOG", "2048"))
+    HTTP_ACCESS_LOG = os.getenv("HTTP_ACCESS_LOG", "0") == "1"
+
+    # 是否统计调用次数和耗时；HTTP传输下指标的访问路径，为空时不提供
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+    METRICS_PATH = os.getenv("METRICS_PATH", "/metrics")
+
+    # 调用链追踪：导出方式(jsonl/otlp，为空时不追踪)、JSONL文件路径、OTLP/HTTP地址和请求头、服务名、按调用链采样的比例
+    TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "")
+    TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+    TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+    TRACING_OTLP_HEADERS = os.getenv("TRACING_OTLP_HEADERS", "")
+    TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "tencent-cloud-mcp-server")
+    TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", "1"))
+
+    # API录制回放：模式(record/replay，为空时不启用)、录制文件路径(以.gz结尾时压缩)、回放耗时的缩放比例(0表示不等待)
+    FIXTURE_MODE = os.getenv("FIXTURE_MODE", "")
+    FIXTURE_PATH = os.getenv("FIXTURE_PATH", "")
+    FIXTURE_TIME_SCALE = float(os.getenv("FIXTURE_TIME_SCALE", "1"))
+
+    # 工具返回值是否缩进，默认紧凑输出以减小响应体积
+    OUTPUT_PRETTY = os.getenv("OUTPUT_PRETTY", "0") == "1"
+
+    # 批量流操作的默认并发数和每秒请求数，0表示不限制速率
+    BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "10"))
+    BATCH_RATE_LIMIT = float(os.getenv("BATCH_RATE_LIMIT", "20"))
+
+    # 推断流事件本地库，未设置路径时不启用；同步间隔为0时不在后台同步，域名以逗号分隔，为空时同步全部
+    EVENT_STORE_PATH = os.getenv("EVENT_STORE_PATH", "")
+    EVENT_STORE_SYNC_INTERVAL = float(os.getenv("EVENT_STORE_SYNC_INTERVAL", "300"))
+    EVENT_STORE_SYNC_DOMAINS = os.getenv("EVENT_STORE_SYNC_DOMAINS", "")
 
 
 config = Config()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : disk_cache.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 查询缓存和鉴权key缓存的磁盘持久层，基于SQLite WAL，多个服务进程可同时读写，新会话启动时直接命中
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Optional, Tuple
+
+from utils.logger import setup_logger
+
+logger = setup_logger("disk_cache")
+
+# 条目格式版本，格式变化时递增，旧版本条目视为不存在
+DISK_CACHE_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    value TEXT NOT NULL,
+    fresh_until REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_action ON entries (action);
+"""
+
+
+class DiskCache:
+    """
+    磁盘缓存
+
+    每个线程使用独立的连接，跨进程并发由SQLite的WAL和busy_timeout保证；
+    磁盘读写出错时只记录日志并视为未命中，不影响API调用
+    """
+
+    def __init__(self, path: str, version: int = DISK_CACHE_VERSION, busy_timeout: float = 5.0):
+        """
+        初始化磁盘缓存
+
+        Args:
+            path: SQLite数据库文件路径
+            version: 条目格式版本
+            busy_timeout: 等待其他进程释放写锁的时间(秒)
+        """
+        self.path = path
+        self.version = version
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            # 缓存中可能包含鉴权key，目录和文件只允许当前用户访问
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o600)
+        os.close(fd)
+        conn = self._conn()
+        with conn:
+            conn.executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def encode_key(key: Tuple) -> str:
+        """将内存缓存的请求键转换为字符串"""
+        return json.dumps(list(key), ensure_ascii=False, separators=(",", ":"))
+
+    def get(self, key: str) -> Optional[Tuple[Any, float, float]]:
+        """
+        读取条目
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            (值, 新鲜截止时间, 过期时间)，时间为UNIX时间戳；不存在、已过期或版本不一致时返回None
+        """
+        try:
+            row = self._conn().execute(
+                "SELECT value, fresh_until, expires_at FROM entries WHERE key = ? AND version = ? AND expires_at > ?",
+                (key, self.version, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("读取磁盘缓存失败: %s", e)
+            return None
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def set(self, key: str, action: str, value: Any, ttl: float, stale_ttl: float = 0.0) -> None:
+        """
+        写入条目
+
+        Args:
+            key: 缓存键
+            action: API操作名称，用于按操作失效
+            value: 可JSON序列化的值
+            ttl: 有效期(秒)
+            stale_ttl: 过期后仍可返回旧值的时长(秒)
+        """
+        now = time.time()
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, version, action, value, fresh_until, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, self.version, action, json.dumps(value, ensure_ascii=False), now + ttl, now + ttl + stale_ttl)
+                )
+        except sqlite3.Error as e:
+            logger.warning("写入磁盘缓存失败: %s", e)
+
+    def invalidate(self, actions: Optional[Iterable[str]] = None) -> None:
+        """
+        删除条目，其他进程随后读取时不再命中
+
+        Args:
+            actions: API操作名称，为空时清空全部
+        """
+        try:
+            conn = self._conn()
+            with conn:
+                if actions is None:
+                    conn.execute("DELETE FROM entries")
+                else:
+                    actions = list(actions)
+                    conn.execute(
+                        f"DELETE FROM entries WHERE action IN ({', '.join('?' for _ in actions)})",
+                        actions
+                    )
+        except sqlite3.Error as e:
+            logger.warning("清除磁盘缓存失败: %s", e)
+
+    def delete(self, keys: Iterable[str]) -> None:
+        """
+        按键删除条目
+
+        Args:
+            keys: 缓存键
+        """
+        try:
+            conn = self._conn()
+            with conn:
+                conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key in keys])
+        except sqlite3.Error as e:
+            logger.warning("清除磁盘缓存失败: %s", e)
+
+    def purge_expired(self) -> int:
+        """删除已过期和旧版本的条目，返回删除数"""
+        try:
+            conn = self._conn()
+            with conn:
+                cursor = conn.execute(
+                    "DELETE FROM entries WHERE expires_at <= ? OR version != ?",
+                    (time.time(), self.version)
+                )
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning("清理磁盘缓存失败: %s", e)
+            return 0
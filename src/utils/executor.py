@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : executor.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 异步执行层，将同步SDK调用放入有界线程池执行，避免阻塞事件循环
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from utils.config import config
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """获取进程级线程池，首次使用时创建"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, config.API_EXECUTOR_WORKERS),
+                    thread_name_prefix="tencent-api"
+                )
+    return _executor
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    在线程池中执行同步函数并等待结果
+
+    Args:
+        func: 同步函数
+        *args: 位置参数
+        **kwargs: 关键字参数
+
+    Returns:
+        函数返回值
+    """
+    loop = asyncio.get_running_loop()
+    # 复制上下文，保证contextvars在线程中可见
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_executor(), call)
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """
+    关闭线程池
+
+    Args:
+        wait: 是否等待正在执行的任务完成
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
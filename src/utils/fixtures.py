@@ -0,0 +1,209 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : fixtures.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : API录制回放，录制模式把(操作, 参数)和响应、耗时写入文件，回放模式按原始或缩放后的耗时返回录制的响应，
+           无需凭证和网络即可复现线上流量
+"""
+
+import asyncio
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+from utils.config import config
+from utils.logger import setup_logger
+
+logger = setup_logger("fixtures")
+
+RECORD = "record"
+REPLAY = "replay"
+
+# 回放时找不到录制记录的错误码
+FIXTURE_MISSING_CODE = "ClientFixtureMissing"
+
+
+def fixture_key(action: str, params: Dict[str, Any], region: str) -> Tuple[str, str, str]:
+    """
+    录制记录的匹配键，不含端点和凭证，回放时可以指向任意端点
+
+    Args:
+        action: API操作名称
+        params: API参数
+        region: 区域
+
+    Returns:
+        (操作, 排序后的参数JSON, 区域)
+    """
+    return action, json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False), region
+
+
+def _open(path: str, mode: str):
+    """以.gz结尾的文件按gzip压缩读写"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")  # pylint: disable=consider-using-with
+
+
+class FixtureStore:
+    """录制回放存储，每行一条JSON记录"""
+
+    def __init__(self, mode: str = "", path: str = "", time_scale: float = 1.0):
+        """
+        初始化存储
+
+        Args:
+            mode: record、replay，为空时不启用
+            path: 录制文件路径，以.gz结尾时压缩
+            time_scale: 回放耗时的缩放比例，1为原始耗时，0为不等待
+
+        Raises:
+            ValueError: 未知的模式或未设置路径
+        """
+        if mode not in ("", RECORD, REPLAY):
+            raise ValueError(f"未知的录制回放模式: {mode}，可选值为{RECORD}、{REPLAY}")
+        if mode and not path:
+            raise ValueError("启用录制回放时必须设置FIXTURE_PATH")
+        self.mode = mode
+        self.path = path
+        self.time_scale = time_scale
+        self._entries: Optional[Dict[Tuple[str, str, str], List[Dict[str, Any]]]] = None
+        self._cursors: Dict[Tuple[str, str, str], int] = {}
+        self._file = None
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    def record(
+            self,
+            action: str,
+            params: Dict[str, Any],
+            region: str,
+            elapsed: float,
+            response: Optional[Dict[str, Any]] = None,
+            error: Optional[TencentCloudSDKException] = None
+    ) -> None:
+        """
+        追加一条录制记录
+
+        Args:
+            action: API操作名称
+            params: API参数
+            region: 区域
+            elapsed: 上游耗时(秒)
+            response: 成功时的响应
+            error: 失败时的异常
+        """
+        entry: Dict[str, Any] = {"a": action, "p": params, "g": region, "t": round(elapsed, 6)}
+        if error is not None:
+            entry["e"] = [error.get_code(), error.get_message(), error.get_request_id()]
+        else:
+            entry["r"] = response
+        line = json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._file is None:
+                # 录制的响应可能含鉴权key，只允许当前用户读写
+                os.close(os.open(self.path, os.O_CREAT | os.O_APPEND | os.O_WRONLY, 0o600))
+                self._file = _open(self.path, "a")
+                logger.info("录制API响应到 %s", self.path)
+            self._file.write(line)
+            # 每条记录立即写出，进程被杀或崩溃时已录制的内容不丢失
+            self._file.flush()
+            self.recorded += 1
+
+    def _load(self) -> Dict[Tuple[str, str, str], List[Dict[str, Any]]]:
+        with self._lock:
+            if self._entries is None:
+                entries: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+                with _open(self.path, "r") as f:
+                    for line in f:
+                        if line.strip():
+                            entry = json.loads(line)
+                            key = fixture_key(entry["a"], entry["p"], entry.get("g", ""))
+                            entries.setdefault(key, []).append(entry)
+                self._entries = entries
+                logger.info("加载录制文件 %s: %d个请求", self.path, len(entries))
+            return self._entries
+
+    def _next(self, action: str, params: Dict[str, Any], region: str) -> Tuple[Dict[str, Any], float]:
+        """取下一条匹配的记录，同一请求录制了多次时按录制顺序循环返回"""
+        key = fixture_key(action, params, region)
+        entries = self._load().get(key)
+        with self._lock:
+            if not entries:
+                self.misses += 1
+            else:
+                self.hits += 1
+                cursor = self._cursors.get(key, 0)
+                self._cursors[key] = cursor + 1
+                entry = entries[cursor % len(entries)]
+                return entry, entry.get("t", 0.0) * self.time_scale
+        raise TencentCloudSDKException(FIXTURE_MISSING_CODE, f"录制文件中没有该请求: {action} {key[1]}")
+
+    @staticmethod
+    def _result(entry: Dict[str, Any]) -> Dict[str, Any]:
+        error = entry.get("e")
+        if error is not None:
+            raise TencentCloudSDKException(*error)
+        return entry["r"]
+
+    def replay(self, action: str, params: Dict[str, Any], region: str) -> Dict[str, Any]:
+        """
+        按录制耗时等待后返回录制的响应
+
+        Raises:
+            TencentCloudSDKException: 录制的错误或没有匹配的记录
+        """
+        entry, delay = self._next(action, params, region)
+        if delay > 0:
+            time.sleep(delay)
+        return self._result(entry)
+
+    async def replay_async(self, action: str, params: Dict[str, Any], region: str) -> Dict[str, Any]:
+        """replay的异步版本"""
+        entry, delay = self._next(action, params, region)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._result(entry)
+
+    def close(self) -> None:
+        """写完录制文件"""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        """返回录制回放统计"""
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "path": self.path,
+                "time_scale": self.time_scale,
+                "recorded": self.recorded,
+                "requests": len(self._entries) if self._entries is not None else None,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+fixture_store = FixtureStore(config.FIXTURE_MODE, config.FIXTURE_PATH, config.FIXTURE_TIME_SCALE)
+atexit.register(fixture_store.close)
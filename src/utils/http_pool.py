@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : http_pool.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 基于httpx的长连接池，专用于向单一API端点发送POST请求
+"""
+
+import asyncio
+from typing import Dict
+
+import httpx
+
+# httpcore每次分配连接都会扫描全部排队请求和连接，连接数多时开销按平方增长，按此大小拆成多个client
+SHARD_CONNECTIONS = 10
+
+
+class HTTPResponse:
+    """HTTP响应"""
+
+    __slots__ = ("status", "headers", "body")
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+
+class AsyncConnectionPool:
+    """
+    基于httpx.AsyncClient的长连接池
+
+    连接、1xx响应和代理由httpx处理；请求体发出后不在传输层重发，
+    是否重试由retry_policy按操作是否幂等决定。
+    最大连接数拆分到多个client，请求交给进行中请求最少的client，并在进入httpx之前排队，避免httpcore在高并发时的扫描开销
+    """
+
+    def __init__(
+            self,
+            scheme: str,
+            host: str,
+            http2: bool = False,
+            max_connections: int = 100,
+            keepalive_expiry: float = 30,
+            timeout: float = 60
+    ):
+        """
+        初始化连接池
+
+        Args:
+            scheme: http或https
+            host: 主机，可包含端口
+            http2: 是否使用HTTP/2，需要安装h2
+            max_connections: 最大连接数
+            keepalive_expiry: 空闲连接保持时间(秒)
+            timeout: 建立连接、发送和读取响应各自的超时(秒)
+        """
+        self.scheme = scheme
+        self.host = host
+        self._url = f"{scheme}://{host}/"
+        shards = max(1, -(-max_connections // SHARD_CONNECTIONS))
+        per_shard = max(1, -(-max_connections // shards))
+        # 各client共用一个SSL上下文，只加载一次证书
+        verify = httpx.create_ssl_context() if scheme == "https" else False
+        self._clients = [
+            httpx.AsyncClient(
+                http2=http2,
+                verify=verify,
+                timeout=httpx.Timeout(timeout),
+                limits=httpx.Limits(
+                    max_connections=per_shard,
+                    max_keepalive_connections=per_shard,
+                    keepalive_expiry=keepalive_expiry
+                )
+            )
+            for _ in range(shards)
+        ]
+        self._active = [0] * shards
+        self._semaphore = asyncio.Semaphore(max_connections)
+
+    @property
+    def is_closed(self) -> bool:
+        return self._clients[0].is_closed
+
+    async def post(self, path: str, headers: Dict[str, str], body: bytes) -> HTTPResponse:
+        """
+        发送POST请求
+
+        Args:
+            path: 请求路径
+            headers: 请求头
+            body: 请求体
+
+        Returns:
+            HTTP响应
+
+        Raises:
+            OSError: 网络错误或超时
+        """
+        url = self._url if path == "/" else f"{self.scheme}://{self.host}{path}"
+        try:
+            async with self._semaphore:
+                # 并发低时总是使用靠前的client，复用已有的长连接
+                index = self._active.index(min(self._active))
+                self._active[index] += 1
+                try:
+                    response = await self._clients[index].post(url, content=body, headers=headers)
+                finally:
+                    self._active[index] -= 1
+        except httpx.HTTPError as e:
+            raise OSError(f"{type(e).__name__}: {e}") from e
+        return HTTPResponse(response.status_code, dict(response.headers), response.content)
+
+    async def aclose(self) -> None:
+        """关闭连接池"""
+        for client in self._clients:
+            await client.aclose()
+
+
+def create_pool(
+        scheme: str,
+        host: str,
+        http2: bool = False,
+        max_connections: int = 100,
+        keepalive_expiry: float = 30,
+        timeout: float = 60
+) -> AsyncConnectionPool:
+    """
+    创建连接池
+
+    Args:
+        scheme: http或https
+        host: 主机，可包含端口
+        http2: 是否使用HTTP/2
+        max_connections: 最大连接数
+        keepalive_expiry: 空闲连接保持时间(秒)
+        timeout: 单次请求超时(秒)
+
+    Returns:
+        连接池
+    """
+    return AsyncConnectionPool(scheme, host, http2, max_connections, keepalive_expiry, timeout)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : http_server.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : HTTP传输(SSE/Streamable HTTP)的多进程部署，基于uvicorn，支持连接保持和优雅退出
+"""
+
+import asyncio
+import os
+import signal
+import threading
+from contextlib import asynccontextmanager, contextmanager, nullcontext
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Iterator, Optional
+
+import uvicorn
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from utils.config import config
+from utils.logger import setup_logger
+from utils.metrics import CONTENT_TYPE, metrics
+from utils.rate_limiter import rate_limiter
+
+logger = setup_logger("http_server")
+
+SSE = "sse"
+STREAMABLE_HTTP = "streamable-http"
+HTTP_TRANSPORTS = (SSE, STREAMABLE_HTTP)
+
+# 主进程通过环境变量把传输方式和进程数传给工作进程的应用工厂
+TRANSPORT_ENV = "MCP_HTTP_TRANSPORT"
+WORKERS_ENV = "MCP_HTTP_WORKERS"
+
+
+class ToolCallTracker:
+    """统计进行中的工具调用，退出时拒绝新的调用并等待进行中的调用完成"""
+
+    def __init__(self):
+        self.active = 0
+        self.draining = False
+        self._idle: Optional[asyncio.Event] = None
+
+    def attach(self, mcp: FastMCP) -> None:
+        """
+        统计mcp的工具调用
+
+        SSE传输下工具调用不占用HTTP请求(消息请求立即返回202)，uvicorn无法感知，需要在工具层统计
+        """
+        tool_manager = mcp._tool_manager  # pylint: disable=protected-access
+        call_tool = tool_manager.call_tool
+
+        async def tracked_call_tool(*args, **kwargs):
+            if self.draining:
+                raise ToolError("服务正在退出，不再接受新的工具调用，请稍后重试")
+            self._enter()
+            try:
+                return await call_tool(*args, **kwargs)
+            finally:
+                self._exit()
+
+        tool_manager.call_tool = tracked_call_tool
+
+    def _enter(self) -> None:
+        self.active += 1
+        if self._idle is not None:
+            self._idle.clear()
+
+    def _exit(self) -> None:
+        self.active -= 1
+        if self.active == 0 and self._idle is not None:
+            self._idle.set()
+
+    async def wait_idle(self, timeout: float) -> bool:
+        """
+        等待进行中的工具调用全部完成
+
+        Args:
+            timeout: 最长等待时间(秒)
+
+        Returns:
+            是否在超时前全部完成
+        """
+        if self._idle is None:
+            self._idle = asyncio.Event()
+        if self.active == 0:
+            return True
+        self._idle.clear()
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+
+tool_calls = ToolCallTracker()
+
+
+@contextmanager
+def drain_on_signal(tracker: ToolCallTracker, timeout: float) -> Iterator[None]:
+    """
+    收到SIGTERM/SIGINT时拒绝新的工具调用，等待进行中的工具调用完成后再交给uvicorn退出
+
+    uvicorn退出时会立即关闭SSE事件流，不等待会导致进行中的工具调用结果丢失
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+    loop = asyncio.get_running_loop()
+    originals = {}
+    # 持有退出任务的引用，避免任务执行完之前被垃圾回收
+    drain_task: Optional[asyncio.Task] = None
+
+    def forward(sig: int, frame: Any) -> None:
+        original = originals[sig]
+        if callable(original):
+            original(sig, frame)
+        else:
+            signal.signal(sig, original)
+            signal.raise_signal(sig)
+
+    async def drain(sig: int, frame: Any) -> None:
+        logger.info("等待%d个进行中的工具调用完成，最长%s秒", tracker.active, timeout)
+        if not await tracker.wait_idle(timeout):
+            logger.warning("等待超时，仍有%d个工具调用未完成", tracker.active)
+        forward(sig, frame)
+
+    def start_drain(sig: int, frame: Any) -> None:
+        nonlocal drain_task
+        drain_task = loop.create_task(drain(sig, frame))
+
+    def handler(sig: int, frame: Any) -> None:
+        # 再次收到信号时不再等待，直接退出
+        repeated = tracker.draining
+        tracker.draining = True
+        if repeated or tracker.active == 0:
+            forward(sig, frame)
+            return
+        loop.call_soon_threadsafe(start_drain, sig, frame)
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        originals[sig] = signal.getsignal(sig)
+        signal.signal(sig, handler)
+    try:
+        yield
+    finally:
+        for sig, original in originals.items():
+            if signal.getsignal(sig) is handler:
+                signal.signal(sig, original)
+
+
+async def metrics_endpoint(request: Request) -> Response:  # pylint: disable=unused-argument
+    """以Prometheus文本格式输出本进程的指标"""
+    return Response(metrics.render(), media_type=CONTENT_TYPE)
+
+
+def build_app(
+        mcp: FastMCP,
+        transport: str,
+        background: Optional[Callable[[], AsyncContextManager[None]]] = None
+) -> Starlette:
+    """
+    创建HTTP传输的ASGI应用
+
+    Args:
+        mcp: MCP服务器
+        transport: sse或streamable-http
+        background: 随工作进程启停的后台任务上下文
+
+    Returns:
+        Starlette应用
+
+    Raises:
+        RuntimeError: 当前mcp版本不支持Streamable HTTP
+    """
+    if transport == STREAMABLE_HTTP:
+        workers = int(os.getenv(WORKERS_ENV, "1"))
+        if workers > 1 and hasattr(mcp.settings, "stateless_http"):
+            # 多进程时同一会话的请求可能落到不同进程，使用无状态模式
+            mcp.settings.stateless_http = True
+        app = mcp.streamable_http_app()
+    else:
+        app = mcp.sse_app()
+
+    tool_calls.attach(mcp)
+    if config.METRICS_PATH:
+        app.router.routes.append(Route(config.METRICS_PATH, metrics_endpoint, methods=["GET"]))
+    inner = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(starlette_app: Starlette) -> AsyncIterator[Any]:
+        # 进程级持有后台任务，避免每个会话进出lifespan时反复启停
+        async with background() if background is not None else nullcontext():
+            with drain_on_signal(tool_calls, config.HTTP_GRACEFUL_TIMEOUT):
+                async with inner(starlette_app) as state:
+                    yield state
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+def configure_worker() -> None:
+    """工作进程初始化：多进程时各进程平分API限流配额"""
+    workers = int(os.getenv(WORKERS_ENV, "1"))
+    if workers > 1:
+        rate_limiter.partition(workers)
+        logger.info("工作进程%d启动，限流配额按%d个进程平分", os.getpid(), workers)
+
+
+def serve(
+        app_factory: str,
+        transport: str,
+        host: str,
+        port: int,
+        workers: int = 1
+) -> None:
+    """
+    启动uvicorn，收到SIGTERM/SIGINT后先等待进行中的工具调用完成，再停止接收新连接并等待进行中的请求，
+    各最长HTTP_GRACEFUL_TIMEOUT秒
+
+    Args:
+        app_factory: 应用工厂的导入路径，形如"server:create_app"
+        transport: sse或streamable-http
+        host: 监听地址
+        port: 监听端口
+        workers: 工作进程数
+    """
+    if transport == SSE and workers > 1:
+        # SSE的事件流和消息请求必须落在同一进程，多进程监听同一端口时无法保证
+        logger.warning("SSE传输不支持多进程，已改为单进程；多进程部署请使用streamable-http")
+        workers = 1
+    os.environ[TRANSPORT_ENV] = transport
+    os.environ[WORKERS_ENV] = str(workers)
+    logger.info("使用%s传输，监听%s:%d，工作进程数%d", transport, host, port, workers)
+    uvicorn.run(
+        app_factory,
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_keep_alive=config.HTTP_KEEP_ALIVE_TIMEOUT,
+        timeout_graceful_shutdown=config.HTTP_GRACEFUL_TIMEOUT,
+        limit_concurrency=config.HTTP_LIMIT_CONCURRENCY or None,
+        backlog=config.HTTP_BACKLOG,
+        access_log=config.HTTP_ACCESS_LOG,
+    )
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : lazy_tools.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 延迟注册工具，注册时只记录工具函数，首次列出或调用时才生成参数模型和JSON Schema，缩短服务冷启动时间
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.tools import Tool, ToolManager
+
+from utils.logger import setup_logger
+
+logger = setup_logger("lazy_tools")
+
+
+class LazyToolManager(ToolManager):
+    """
+    延迟生成工具定义的ToolManager
+
+    FastMCP注册每个工具时都会用pydantic创建参数模型并生成JSON Schema，几十个工具在导入时耗时数百毫秒。
+    这里注册时只保存函数，调用某个工具时只生成该工具，列出工具时生成全部
+    """
+
+    def __init__(self, warn_on_duplicate_tools: bool = True):
+        super().__init__(warn_on_duplicate_tools=warn_on_duplicate_tools)
+        self._pending: Dict[str, Tuple[Callable[..., Any], Dict[str, Any]]] = {}
+        self._order: List[str] = []
+
+    def add_tool(
+            self,
+            fn: Callable[..., Any],
+            name: Optional[str] = None,
+            description: Optional[str] = None,
+            **kwargs: Any
+    ) -> Optional[Tool]:
+        """
+        记录工具函数，lambda等没有名称的函数立即生成以便尽早报错
+
+        Args:
+            fn: 工具函数
+            name: 工具名称，默认使用函数名
+            description: 工具描述，默认使用函数文档
+            kwargs: 其他工具属性(如annotations)，随mcp版本增加，生成时原样传给ToolManager
+
+        Returns:
+            已生成的工具，延迟生成时返回None
+        """
+        tool_name = name or fn.__name__
+        if tool_name == "<lambda>":
+            return super().add_tool(fn, name=name, description=description, **kwargs)
+        if tool_name in self._pending or tool_name in self._tools:
+            if self.warn_on_duplicate_tools:
+                logger.warning("工具已存在: %s", tool_name)
+            return self._tools.get(tool_name)
+        self._pending[tool_name] = (fn, dict(kwargs, name=name, description=description))
+        self._order.append(tool_name)
+        return None
+
+    def _build(self, name: str) -> None:
+        spec = self._pending.pop(name, None)
+        if spec is not None:
+            fn, kwargs = spec
+            super().add_tool(fn, **kwargs)
+
+    def get_tool(self, name: str) -> Optional[Tool]:
+        """获取工具，首次获取时生成"""
+        self._build(name)
+        return super().get_tool(name)
+
+    def list_tools(self) -> List[Tool]:
+        """按注册顺序列出全部工具，生成尚未生成的工具"""
+        for name in list(self._pending):
+            self._build(name)
+        tools = [self._tools[name] for name in self._order if name in self._tools]
+        # 立即生成的工具不在注册顺序中
+        tools.extend(tool for name, tool in self._tools.items() if name not in self._order)
+        return tools
+
+    @property
+    def pending(self) -> int:
+        """尚未生成的工具数"""
+        return len(self._pending)
+
+
+def defer_tool_registration(mcp: FastMCP) -> None:
+    """
+    将mcp的工具注册改为延迟生成，需要在注册工具和包装call_tool之前调用
+
+    Args:
+        mcp: FastMCP实例
+    """
+    tool_manager = mcp._tool_manager  # pylint: disable=protected-access
+    lazy = LazyToolManager(warn_on_duplicate_tools=tool_manager.warn_on_duplicate_tools)
+    for tool in tool_manager.list_tools():
+        lazy._tools[tool.name] = tool  # pylint: disable=protected-access
+    mcp._tool_manager = lazy  # pylint: disable=protected-access
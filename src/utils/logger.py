@@ -5,12 +5,202 @@
 @File    : logger.py
 @Time    : 2025/05/30
 @Author  : willsygao
-@Desc    : 日志记录模块
+@Desc    : 日志记录模块，日志经队列由后台线程写入stderr或文件，支持JSON格式和按记录器采样
 """
 
+import atexit
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
 import sys
-from typing import Optional
+import threading
+from typing import Dict, Optional
+
+from utils.redaction import RedactionFilter
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# LogRecord的标准属性，JSON格式中其余属性作为extra字段输出
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+# 每个请求都会输出INFO日志的第三方记录器，至少按WARNING级别记录
+QUIET_LOGGERS = ("httpx", "httpcore")
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志输出一行JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """按记录器名称采样WARNING以下的日志，WARNING及以上全部保留"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(record.name)
+        return rate is None or random.random() < rate
+
+
+def parse_sampling(value: str) -> Dict[str, float]:
+    """
+    解析采样配置
+
+    Args:
+        value: 形如"tencent_client=0.1,async_tencent_client=0.1"的字符串
+
+    Returns:
+        {记录器名称: 保留比例}
+    """
+    rates = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, rate = item.partition("=")
+        if not sep:
+            raise ValueError(f"日志采样配置格式错误: {item}，应为 记录器名称=比例")
+        rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+def parse_level(level) -> int:
+    """将DEBUG/INFO等级别名称或数字转换为日志级别"""
+    if isinstance(level, int):
+        return level
+    value = str(level).strip().upper()
+    if value.isdigit():
+        return int(value)
+    if value not in logging.getLevelNamesMapping():
+        raise ValueError(f"未知的日志级别: {level}")
+    return logging.getLevelNamesMapping()[value]
+
+
+class _LogState:
+    """进程内共享的日志队列和后台写入线程"""
+
+    def __init__(self):
+        self.level = parse_level(os.getenv("LOG_LEVEL", "INFO"))
+        self.log_file = os.getenv("LOG_FILE", "")
+        self.log_format = os.getenv("LOG_FORMAT", "text")
+        self.sampling = SamplingFilter(parse_sampling(os.getenv("LOG_SAMPLING", "")))
+        self.queue_handler = logging.handlers.QueueHandler(queue.SimpleQueue())
+        self.queue_handler.addFilter(self.sampling)
+        # 采样之后再脱敏，被丢弃的日志不做处理
+        self.queue_handler.addFilter(RedactionFilter(int(os.getenv("LOG_MAX_ARG_LENGTH", "2048"))))
+        self.loggers: Dict[str, logging.Logger] = {}
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.lock = threading.Lock()
+
+    def build_handler(self) -> logging.Handler:
+        """创建实际写入的处理器，日志不能写入stdout，否则会破坏stdio传输"""
+        if self.log_file:
+            directory = os.path.dirname(os.path.abspath(self.log_file))
+            os.makedirs(directory, exist_ok=True)
+            # 兼容logrotate等外部轮转工具
+            handler: logging.Handler = logging.handlers.WatchedFileHandler(self.log_file, encoding="utf-8")
+        else:
+            handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(JsonFormatter() if self.log_format == "json" else logging.Formatter(TEXT_FORMAT))
+        return handler
+
+    def start(self) -> None:
+        """(重新)启动后台写入线程"""
+        with self.lock:
+            if self.listener is not None:
+                self.listener.stop()
+                for handler in self.listener.handlers:
+                    handler.close()
+            self.listener = logging.handlers.QueueListener(self.queue_handler.queue, self.build_handler())
+            self.listener.start()
+
+    def stop(self) -> None:
+        """写完队列中剩余的日志后停止后台线程"""
+        with self.lock:
+            if self.listener is not None:
+                self.listener.stop()
+                self.listener = None
+
+
+_state = _LogState()
+atexit.register(_state.stop)
+
+
+def _quiet_third_party() -> None:
+    """第三方记录器同样经日志队列输出，不经过其他库配置的根处理器，级别不低于WARNING"""
+    for name in QUIET_LOGGERS:
+        logger = logging.getLogger(name)
+        logger.setLevel(max(logging.WARNING, _state.level))
+        if _state.queue_handler not in logger.handlers:
+            logger.addHandler(_state.queue_handler)
+            logger.propagate = False
+
+
+_quiet_third_party()
+
+
+def configure_logging(
+        level=None,
+        log_file: Optional[str] = None,
+        log_format: Optional[str] = None,
+        sampling: Optional[str] = None
+) -> None:
+    """
+    修改日志配置，命令行参数解析后调用，已创建的记录器同步生效
+
+    Args:
+        level: 日志级别，如DEBUG、INFO
+        log_file: 日志文件路径，空字符串表示输出到stderr
+        log_format: text或json
+        sampling: 采样配置，见parse_sampling
+    """
+    # 同步到环境变量，HTTP传输的工作进程启动时沿用
+    for env, value in (
+            ("LOG_LEVEL", level),
+            ("LOG_FILE", log_file),
+            ("LOG_FORMAT", log_format),
+            ("LOG_SAMPLING", sampling)
+    ):
+        if value is not None:
+            os.environ[env] = str(value)
+    if level is not None:
+        _state.level = parse_level(level)
+        for logger in _state.loggers.values():
+            logger.setLevel(_state.level)
+        _quiet_third_party()
+    if sampling is not None:
+        _state.sampling.rates = parse_sampling(sampling)
+    restart = False
+    if log_file is not None and log_file != _state.log_file:
+        _state.log_file = log_file
+        restart = True
+    if log_format is not None and log_format != _state.log_format:
+        _state.log_format = log_format
+        restart = True
+    if restart or _state.listener is None:
+        _state.start()
 
 
 def setup_logger(name: str, level: Optional[int] = None) -> logging.Logger:
@@ -19,24 +209,21 @@ def setup_logger(name: str, level: Optional[int] = None) -> logging.Logger:
 
     Args:
         name: 日志记录器名称
-        level: 日志级别，默认为DEBUG
+        level: 日志级别，默认使用LOG_LEVEL配置(INFO)
 
     Returns:
         配置好的日志记录器
     """
-    if level is None:
-        level = logging.DEBUG
-
     logger = logging.getLogger(name)
-    logger.setLevel(level)
+    logger.setLevel(level if level is not None else _state.level)
 
     # 避免重复添加处理器
-    if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        handler.setFormatter(formatter)
-        logger.addHandler(handler)
+    if _state.queue_handler not in logger.handlers:
+        logger.addHandler(_state.queue_handler)
+        # 不再传给根记录器，避免第三方库配置的根处理器重复输出
+        logger.propagate = False
+        _state.loggers[name] = logger
+    if _state.listener is None:
+        _state.start()
 
     return logger
@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : metrics.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 运行指标，按API操作、区域、错误码和工具统计调用次数和耗时分布，以Prometheus文本格式输出
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+from utils.circuit_breaker import OPEN, HALF_OPEN, circuit_breakers
+from utils.client_pool import client_pool
+from utils.config import config
+from utils.rate_limiter import rate_limiter
+from utils.response_cache import response_cache
+from utils.retry import retry_policy
+from utils.single_flight import single_flight
+
+PREFIX = "tencent_live_mcp_"
+
+# 耗时分布的桶上界(秒)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 成功调用的错误码标签
+OK = "OK"
+
+# Prometheus文本格式的Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 熔断状态对应的数值
+_BREAKER_STATES = {OPEN: 2, HALF_OPEN: 1}
+
+# (指标名, 类型, 说明, [(标签, 值)])
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Counter:
+    """按标签累加的计数器"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """按标签值(顺序同labelnames)累加"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def collect(self) -> List[Family]:
+        with self._lock:
+            values = list(self._values.items())
+        samples = [(dict(zip(self.labelnames, labels)), value) for labels, value in values]
+        return [(self.name, "counter", self.documentation, samples)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """按标签统计的耗时分布"""
+
+    def __init__(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str],
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 标签值 -> [各桶计数(不累计), 总和, 次数]
+        self._values: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """记录一次观测值，标签值顺序同labelnames"""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+
+    def collect(self) -> List[Family]:
+        with self._lock:
+            values = [(labels, list(entry[0]), entry[1], entry[2]) for labels, entry in self._values.items()]
+        samples = []
+        for labels, counts, total, count in values:
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                samples.append(({**base, "le": _format_value(bound)}, cumulative, "_bucket"))
+            samples.append((base, total, "_sum"))
+            samples.append((base, count, "_count"))
+        return [(self.name, "histogram", self.documentation, samples)]
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """按标签返回次数、平均耗时和估算的p50/p99"""
+        with self._lock:
+            values = [(labels, list(entry[0]), entry[1], entry[2]) for labels, entry in self._values.items()]
+        result = {}
+        for labels, counts, total, count in values:
+            result["|".join(labels)] = {
+                "count": count,
+                "avg_seconds": round(total / count, 6) if count else 0.0,
+                "p50_seconds": self._quantile(counts, count, 0.5),
+                "p99_seconds": self._quantile(counts, count, 0.99),
+            }
+        return result
+
+    def _quantile(self, counts: List[int], count: int, q: float) -> Optional[float]:
+        """取覆盖该分位的桶上界，落在最后一个桶时返回None"""
+        if not count:
+            return 0.0
+        rank = q * count
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return bound
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """进程级指标注册表"""
+
+    def __init__(self, enabled: bool = True):
+        """
+        初始化注册表
+
+        Args:
+            enabled: 是否记录，关闭时调用和工具不再计数，组件统计仍可输出
+        """
+        self.enabled = enabled
+        self._metrics: List[Any] = []
+        self._collectors: List[Callable[[], List[Family]]] = []
+
+        self.api_requests = self.counter(
+            "api_requests_total", "上游API调用次数(含重试)", ("action", "region", "code"))
+        self.api_duration = self.histogram(
+            "api_request_duration_seconds", "上游API单次调用耗时(不含限流排队，只计上游请求)", ("action", "region"))
+        self.tool_calls = self.counter(
+            "tool_calls_total", "MCP工具调用次数", ("tool", "status"))
+        self.tool_duration = self.histogram(
+            "tool_call_duration_seconds", "MCP工具调用耗时", ("tool",))
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str]) -> Counter:
+        """创建并注册计数器，名称自动加前缀"""
+        metric = Counter(PREFIX + name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+            self,
+            name: str,
+            documentation: str,
+            labelnames: Sequence[str],
+            buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        """创建并注册耗时分布，名称自动加前缀"""
+        metric = Histogram(PREFIX + name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], List[Family]]) -> None:
+        """注册采集函数，输出时调用，用于导出各组件已有的统计"""
+        self._collectors.append(collector)
+
+    @contextmanager
+    def track_api(self, action: str, region: str) -> Iterator[None]:
+        """
+        统计一次上游API调用的结果和耗时
+
+        Args:
+            action: API操作名称
+            region: 区域
+        """
+        if not self.enabled:
+            yield
+            return
+        code = OK
+        start = time.perf_counter()
+        try:
+            yield
+        except TencentCloudSDKException as e:
+            code = e.get_code() or "UnknownError"
+            raise
+        except BaseException as e:
+            code = type(e).__name__
+            raise
+        finally:
+            region = region or "default"
+            self.api_duration.observe(time.perf_counter() - start, action, region)
+            self.api_requests.inc(action, region, code)
+
+    def instrument_tools(self, mcp) -> None:
+        """
+        统计mcp全部工具的调用次数和耗时
+
+        工具内部捕获异常后返回{"error": ...}，以返回值区分成功和失败
+        """
+        tool_manager = mcp._tool_manager  # pylint: disable=protected-access
+        call_tool = tool_manager.call_tool
+
+        async def measured_call_tool(name: str, *args, **kwargs):
+            if not self.enabled:
+                return await call_tool(name, *args, **kwargs)
+            status = "exception"
+            start = time.perf_counter()
+            try:
+                result = await call_tool(name, *args, **kwargs)
+                status = "error" if _is_error_result(result) else "ok"
+                return result
+            finally:
+                self.tool_duration.observe(time.perf_counter() - start, name)
+                self.tool_calls.inc(name, status)
+
+        tool_manager.call_tool = measured_call_tool
+
+    def collect(self) -> List[Family]:
+        """采集全部指标"""
+        families: List[Family] = []
+        for metric in self._metrics:
+            families.extend(metric.collect())
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        """
+        以Prometheus文本格式输出全部指标
+
+        Returns:
+            Prometheus exposition格式(0.0.4)的文本
+        """
+        lines = []
+        for name, kind, documentation, samples in self.collect():
+            lines.append(f"# HELP {name} {_escape(documentation)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                labels, value = sample[0], sample[1]
+                suffix = sample[2] if len(sample) > 2 else ""
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """返回便于阅读的汇总，供stdio传输下的诊断工具使用"""
+        def counts(counter: Counter) -> Dict[str, float]:
+            return {
+                "|".join(labels.values()): value
+                for _, _, _, samples in counter.collect() for labels, value in samples
+            }
+
+        return {
+            "Enabled": self.enabled,
+            "ApiRequests": counts(self.api_requests),
+            "ApiLatency": self.api_duration.summary(),
+            "ToolCalls": counts(self.tool_calls),
+            "ToolLatency": self.tool_duration.summary(),
+        }
+
+    def clear(self) -> None:
+        """清空调用计数和耗时分布"""
+        for metric in self._metrics:
+            metric.clear()
+
+
+def _is_error_result(result: Any) -> bool:
+    """工具返回值是否为{"error": ...}"""
+    if isinstance(result, str):
+        return result[:32].lstrip("{ \n").startswith('"error"')
+    return isinstance(result, dict) and "error" in result
+
+
+def _collect_components() -> List[Family]:
+    """将缓存、限流、合并、重试、熔断和客户端池的统计导出为指标"""
+    cache = response_cache.stats()
+    flight = single_flight.stats()
+    limiter = rate_limiter.stats()
+    retry = retry_policy.stats()
+    breakers = circuit_breakers.stats()
+    pool = client_pool.stats()
+    families: List[Family] = [
+        (PREFIX + "response_cache_entries", "gauge", "查询缓存条目数", [({}, cache["size"])]),
+        (PREFIX + "response_cache_bytes", "gauge", "查询缓存条目按JSON序列化计算的字节数", [({}, cache["bytes"])]),
+        (PREFIX + "response_cache_requests_total", "counter", "查询缓存命中和未命中次数", [
+            ({"result": "hit"}, cache["hits"]),
+            ({"result": "stale_hit"}, cache["stale_hits"]),
+            ({"result": "disk_hit"}, cache["disk_hits"]),
+            ({"result": "miss"}, cache["misses"]),
+        ]),
+        (PREFIX + "response_cache_invalidations_total", "counter", "查询缓存失效次数",
+         [({}, cache["invalidations"])]),
+        (PREFIX + "single_flight_requests_total", "counter", "只读请求的上游请求数和被合并数", [
+            ({"result": "upstream"}, flight["upstream_requests"]),
+            ({"result": "coalesced"}, flight["coalesced"]),
+        ]),
+        (PREFIX + "rate_limit_requests_total", "counter", "经过限流的请求数",
+         [({"action": action}, s["requests"]) for action, s in limiter.items()]),
+        (PREFIX + "rate_limit_waited_total", "counter", "因限流排队的请求数",
+         [({"action": action}, s["waited"]) for action, s in limiter.items()]),
+        (PREFIX + "rate_limit_wait_seconds_total", "counter", "限流排队总时间",
+         [({"action": action}, s["total_wait_seconds"]) for action, s in limiter.items()]),
+        (PREFIX + "retries_total", "counter", "重试次数",
+         [({"action": action}, s["retries"]) for action, s in retry.items()]),
+        (PREFIX + "retry_exhausted_total", "counter", "重试耗尽后仍失败的次数",
+         [({"action": action}, s["exhausted"]) for action, s in retry.items()]),
+        (PREFIX + "circuit_breaker_state", "gauge", "熔断状态，0关闭、1半开、2打开",
+         [({"breaker": name}, _BREAKER_STATES.get(s["state"], 0)) for name, s in breakers.items()]),
+        (PREFIX + "circuit_breaker_rejected_total", "counter", "熔断拒绝的请求数",
+         [({"breaker": name}, s["rejected"]) for name, s in breakers.items()]),
+        (PREFIX + "client_pool_clients", "gauge", "客户端池中的客户端数", [({}, pool["size"])]),
+    ]
+    return families
+
+
+metrics = MetricsRegistry(enabled=config.METRICS_ENABLED)
+metrics.register_collector(_collect_components)
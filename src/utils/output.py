@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : output.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 工具返回值的序列化，默认紧凑输出，支持按字段路径裁剪响应，安装orjson时使用orjson编码
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+from utils.config import config
+from utils.tracing import tracer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - 未安装时使用标准库
+    orjson = None
+
+# 字段路径中匹配任意键的通配符
+WILDCARD = "*"
+
+FIELDS_DESCRIPTION = (
+    "只返回指定字段，多个路径以逗号分隔，路径用.连接各级字段名，列表会逐个元素裁剪，*匹配任意字段，"
+    "可省略最外层的Response。示例值：OnlineInfo.StreamName,TotalNum"
+)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    解析字段路径，生成嵌套的裁剪规则
+
+    兼容JSONPath写法：开头的$和列表下标[*]、[]会被忽略
+
+    Args:
+        fields: 形如"OnlineInfo[*].StreamName,TotalNum"的字符串
+
+    Returns:
+        {字段名: 下级规则}，叶子节点的下级规则为空字典；未指定字段时返回None
+
+    Raises:
+        ValueError: 路径中存在空字段名
+    """
+    if not fields or not fields.strip():
+        return None
+    spec: Dict[str, Any] = {}
+    for path in fields.split(","):
+        path = path.strip().replace("[*]", "").replace("[]", "")
+        if path.startswith("$"):
+            path = path[1:].lstrip(".")
+        if not path:
+            continue
+        node = spec
+        for name in path.split("."):
+            name = name.strip()
+            if not name:
+                raise ValueError(f"字段路径格式错误: {path}")
+            # 已经要求返回完整字段时，不再向下裁剪
+            if name in node and not node[name]:
+                break
+            node = node.setdefault(name, {})
+        else:
+            node.clear()
+    return spec or None
+
+
+def project(data: Any, spec: Optional[Dict[str, Any]]) -> Any:
+    """
+    按裁剪规则保留字段，不存在的字段忽略
+
+    Args:
+        data: 原始数据
+        spec: parse_fields生成的规则，为空时返回原始数据
+
+    Returns:
+        裁剪后的数据
+    """
+    if not spec:
+        return data
+    if isinstance(data, list):
+        return [project(item, spec) for item in data]
+    if not isinstance(data, dict):
+        return data
+    wildcard = spec.get(WILDCARD)
+    result = {}
+    for key, value in data.items():
+        sub = spec.get(key, wildcard)
+        if sub is not None:
+            result[key] = project(value, sub)
+    return result
+
+
+def _project_root(data: Any, spec: Optional[Dict[str, Any]]) -> Any:
+    """SDK响应只有Response一层时，路径可以省略Response"""
+    if (
+        spec
+        and isinstance(data, dict)
+        and "Response" in data
+        and "Response" not in spec
+        and WILDCARD not in spec
+    ):
+        response = project(data["Response"], spec)
+        # 保留RequestId和错误信息，便于排查
+        for key in ("RequestId", "Error"):
+            if isinstance(data["Response"], dict) and key in data["Response"]:
+                response.setdefault(key, data["Response"][key])
+        return {"Response": response}
+    return project(data, spec)
+
+
+def dumps(data: Any, pretty: Optional[bool] = None) -> str:
+    """
+    序列化为JSON字符串，中文不转义
+
+    Args:
+        data: 待序列化的数据
+        pretty: 是否缩进，默认按OUTPUT_PRETTY配置
+
+    Returns:
+        JSON字符串
+    """
+    if pretty is None:
+        pretty = config.OUTPUT_PRETTY
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+        except TypeError:
+            # orjson不支持的类型(如非字符串的键、超长整数)交给标准库处理
+            pass
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def render(data: Any, fields: Optional[str] = None) -> str:
+    """
+    生成工具返回值：按fields裁剪后序列化
+
+    Args:
+        data: 工具结果
+        fields: 字段路径，见parse_fields
+
+    Returns:
+        JSON字符串
+    """
+    with tracer.span("serialize", fields=fields) as span:
+        text = dumps(_project_root(data, parse_fields(fields)))
+        span.set_attribute("bytes", len(text))
+        return text
+
+
+def encoder_name() -> str:
+    """当前使用的JSON编码器"""
+    return "orjson" if orjson is not None else "json"
+
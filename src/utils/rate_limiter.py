@@ -0,0 +1,211 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : rate_limiter.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 按API操作限制请求频率的令牌桶，超出配额时排队等待而不是失败
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from utils.config import config
+
+# 限流键可包含的维度
+SCOPE_FIELDS = ("action", "region", "credential")
+
+
+def parse_rate_limits(value: str) -> Dict[str, float]:
+    """
+    解析按操作配置的限额
+
+    Args:
+        value: 形如"DescribeLiveStreamOnlineList=10,DropLiveStream=50"的字符串
+
+    Returns:
+        {操作名称: 每秒请求数}
+
+    Raises:
+        ValueError: 格式错误
+    """
+    limits = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        action, sep, rate = item.partition("=")
+        if not sep:
+            raise ValueError(f"限流配置格式错误: {item}，应为 操作名称=每秒请求数")
+        limits[action.strip()] = float(rate)
+    return limits
+
+
+class TokenBucket:
+    """
+    令牌桶
+
+    令牌不足时预留未来的令牌并返回需要等待的时间，
+    令牌数可以为负，排队的请求按预留顺序依次放行
+    """
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated", "_lock")
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        初始化令牌桶
+
+        Args:
+            rate: 每秒生成的令牌数
+            burst: 桶容量，默认等于rate
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        预留一个令牌
+
+        Returns:
+            需要等待的时间(秒)，0表示可以立即执行
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class _WaitStats:
+    """单个操作的排队统计"""
+
+    __slots__ = ("requests", "waited", "total_wait", "max_wait")
+
+    def __init__(self):
+        self.requests = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+
+class RateLimiter:
+    """按(操作[, 区域][, 凭证])维护令牌桶的限流器"""
+
+    def __init__(
+            self,
+            default_rate: float,
+            limits: Optional[Dict[str, float]] = None,
+            scope: Tuple[str, ...] = ("action",)
+    ):
+        """
+        初始化限流器
+
+        Args:
+            default_rate: 未单独配置的操作的每秒请求数，0表示不限制
+            limits: 按操作配置的每秒请求数，0表示不限制
+            scope: 限流键包含的维度，取值见SCOPE_FIELDS
+        """
+        unknown = set(scope) - set(SCOPE_FIELDS)
+        if unknown or "action" not in scope:
+            raise ValueError(f"限流维度必须包含action，且只能取{SCOPE_FIELDS}: {scope}")
+        self.default_rate = default_rate
+        self.limits = dict(limits or {})
+        self.scope = scope
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        self._stats: Dict[str, _WaitStats] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, action: str, region: str, credential: str) -> Optional[TokenBucket]:
+        rate = self.limits.get(action, self.default_rate)
+        if rate <= 0:
+            return None
+        values = {"action": action, "region": region, "credential": credential}
+        key = tuple(values[field] for field in self.scope)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(key, TokenBucket(rate))
+        return bucket
+
+    def partition(self, parts: int) -> None:
+        """
+        多个进程共用同一配额时，各进程只使用1/parts的速率
+
+        Args:
+            parts: 进程数
+        """
+        if parts <= 1:
+            return
+        with self._lock:
+            self.default_rate /= parts
+            self.limits = {action: rate / parts for action, rate in self.limits.items()}
+            self._buckets.clear()
+
+    def reserve(self, action: str, region: str = "", credential: str = "") -> float:
+        """
+        预留一次调用并记录排队时间
+
+        Args:
+            action: API操作名称
+            region: 区域
+            credential: 凭证标识
+
+        Returns:
+            需要等待的时间(秒)
+        """
+        bucket = self._bucket(action, region, credential)
+        delay = bucket.reserve() if bucket is not None else 0.0
+        with self._lock:
+            stats = self._stats.get(action)
+            if stats is None:
+                stats = self._stats[action] = _WaitStats()
+            stats.requests += 1
+            if delay > 0:
+                stats.waited += 1
+                stats.total_wait += delay
+                stats.max_wait = max(stats.max_wait, delay)
+        return delay
+
+    def acquire(self, action: str, region: str = "", credential: str = "") -> float:
+        """同步等待配额，返回等待时间(秒)"""
+        delay = self.reserve(action, region, credential)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self, action: str, region: str = "", credential: str = "") -> float:
+        """异步等待配额，返回等待时间(秒)"""
+        delay = self.reserve(action, region, credential)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """返回按操作统计的排队次数和等待时间"""
+        with self._lock:
+            return {
+                action: {
+                    "rate": self.limits.get(action, self.default_rate),
+                    "requests": s.requests,
+                    "waited": s.waited,
+                    "total_wait_seconds": round(s.total_wait, 6),
+                    "max_wait_seconds": round(s.max_wait, 6),
+                }
+                for action, s in self._stats.items()
+            }
+
+
+rate_limiter = RateLimiter(
+    default_rate=config.RATE_LIMIT_DEFAULT,
+    limits=parse_rate_limits(config.RATE_LIMITS),
+    scope=tuple(field.strip() for field in config.RATE_LIMIT_SCOPE.split(",") if field.strip())
+)
@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : redaction.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 日志脱敏，屏蔽密钥、鉴权key和地址中的签名，截断过大的参数和响应
+"""
+
+import hashlib
+import logging
+import re
+from typing import Any
+
+# 值需要屏蔽的字段名(小写比较)
+SECRET_FIELDS = frozenset({
+    "secretid",
+    "secretkey",
+    "secret_id",
+    "secret_key",
+    "token",
+    "authorization",
+    "signature",
+    "password",
+    "masterauthkey",
+    "backupauthkey",
+    "authkey",
+    "master_auth_key",
+    "backup_auth_key",
+    "auth_key",
+    "txsecret",
+})
+
+MASK = "***"
+
+# 文本中的密钥：地址中的签名参数、key=value形式以及字典/JSON文本中的密钥、腾讯云SecretId。
+# 字段名按后缀匹配，MasterAuthKey、'SecretKey': 'x'、"txSecret":"x"都能命中；
+# 开头的前瞻让正则引擎先按首字母跳过不可能匹配的位置，比逐个位置尝试整个分支快
+_SECRET_PATTERN = re.compile(
+    r"(?i)(?=[tspa])(txSecret|signature|sign|token|secret_?key|auth_?key|authorization|password)"
+    r"(['\"]?\s*[=:]\s*['\"]?)(?!%)([^&\s'\",}]+)"
+)
+_SECRET_ID_PATTERN = re.compile(r"AKID[0-9A-Za-z]{4,}")
+_MASKED = r"\1\2" + MASK
+
+# 快速判断文本中是否可能含有密钥，绝大多数日志不含这些词，可以跳过完整匹配；
+# 转小写后逐个查找子串比忽略大小写的正则快一个数量级
+_HINTS = ("secret", "sign", "token", "auth", "passw", "akid")
+
+# 消息模板基本是常量，缓存脱敏结果
+_MSG_CACHE_SIZE = 1024
+
+
+def mask_secret_id(secret_id: str) -> str:
+    """只保留SecretId的前4位和后4位，用于排查使用的是哪个凭证"""
+    if not secret_id:
+        return ""
+    if len(secret_id) <= 8:
+        return MASK
+    return f"{secret_id[:4]}{MASK}{secret_id[-4:]}"
+
+
+def _has_hint(text: str) -> bool:
+    lowered = text.lower()
+    for hint in _HINTS:
+        if hint in lowered:
+            return True
+    return False
+
+
+def redact_text(text: str, max_length: int = 0) -> str:
+    """
+    屏蔽文本中的密钥，超长时截断
+
+    Args:
+        text: 文本
+        max_length: 最大长度，0表示不截断
+
+    Returns:
+        脱敏后的文本
+    """
+    if _has_hint(text):
+        text = _SECRET_PATTERN.sub(_MASKED, text)
+        if "AKID" in text:
+            text = _SECRET_ID_PATTERN.sub(lambda m: mask_secret_id(m.group(0)), text)
+    if max_length and len(text) > max_length:
+        digest = hashlib.sha256(text.encode("utf-8", "replace")).hexdigest()[:12]
+        text = f"{text[:max_length]}...(共{len(text)}字符, sha256:{digest})"
+    return text
+
+
+def redact(value: Any, max_items: int = 10, depth: int = 6) -> Any:
+    """
+    复制并屏蔽字典中的密钥字段，列表只保留前max_items项；
+    字符串中的密钥不在这里处理，由调用方对转换后的整段文本调用redact_text，一次匹配比逐个字符串匹配快
+
+    Args:
+        value: 参数或响应
+        max_items: 列表最多保留的项数
+        depth: 最大嵌套深度，超出部分以摘要代替
+
+    Returns:
+        脱敏后的副本
+    """
+    if isinstance(value, dict):
+        if depth <= 0:
+            return f"{{...{len(value)}个字段}}"
+        result = {}
+        for key, item in value.items():
+            if isinstance(key, str) and key.lower() in SECRET_FIELDS and item:
+                result[key] = MASK
+            else:
+                result[key] = redact(item, max_items, depth - 1)
+        return result
+    if isinstance(value, (list, tuple)):
+        if depth <= 0:
+            return f"[...{len(value)}项]"
+        items = [redact(item, max_items, depth - 1) for item in value[:max_items]]
+        if len(value) > max_items:
+            items.append(f"...(共{len(value)}项)")
+        return items
+    return value
+
+
+class _Redacted:
+    """延迟脱敏的日志参数，只有日志实际输出时才转换为字符串"""
+
+    __slots__ = ("value", "max_length")
+
+    def __init__(self, value: Any, max_length: int):
+        self.value = value
+        self.max_length = max_length
+
+    def __str__(self) -> str:
+        value = self.value
+        if isinstance(value, str):
+            return redact_text(value, self.max_length)
+        # 容器先屏蔽密钥字段并截断列表；异常等其他对象的文本中也可能带有密钥，同样需要脱敏
+        if isinstance(value, (dict, list, tuple)):
+            value = redact(value)
+        return redact_text(str(value), self.max_length)
+
+    def __repr__(self) -> str:
+        value = self.value
+        if isinstance(value, (dict, list, tuple)):
+            value = redact(value)
+        return redact_text(repr(value), self.max_length)
+
+
+class _RedactedMapping(dict):
+    """
+    logging把唯一的字典参数当作%(name)s的映射，但消息也可能是"%s"，以整体输出该字典，
+    按键取值时返回逐个脱敏的值，整体输出时按字典脱敏
+    """
+
+    __slots__ = ("whole",)
+
+    def __init__(self, items: dict, whole: _Redacted):
+        super().__init__(items)
+        self.whole = whole
+
+    def __str__(self) -> str:
+        return str(self.whole)
+
+    def __repr__(self) -> str:
+        return repr(self.whole)
+
+
+class RedactionFilter(logging.Filter):
+    """
+    日志脱敏过滤器
+
+    消息文本立即脱敏；字典、列表等参数包装为延迟对象，格式化时才脱敏并截断，
+    被级别或采样过滤掉的日志不产生额外开销
+    """
+
+    def __init__(self, max_length: int = 2048):
+        """
+        初始化过滤器
+
+        Args:
+            max_length: 单个参数格式化后的最大长度，0表示不截断
+        """
+        super().__init__()
+        self.max_length = max_length
+        self._msg_cache: dict = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        msg = record.msg
+        if isinstance(msg, str):
+            redacted = self._msg_cache.get(msg)
+            if redacted is None:
+                redacted = redact_text(msg)
+                if len(self._msg_cache) >= _MSG_CACHE_SIZE:
+                    self._msg_cache.clear()
+                self._msg_cache[msg] = redacted
+            record.msg = redacted
+        args = record.args
+        if isinstance(args, tuple) and args:
+            record.args = tuple(self._wrap(arg) for arg in args)
+        elif isinstance(args, dict) and args:
+            # logger.info("%(name)s", {...})形式的参数，或logger.info("%s", {...})的唯一字典参数
+            record.args = _RedactedMapping(
+                {key: self._wrap(arg) for key, arg in args.items()},
+                _Redacted(args, self.max_length)
+            )
+        return True
+
+    def _wrap(self, arg: Any) -> Any:
+        if isinstance(arg, (int, float, bool)) or arg is None:
+            return arg
+        if isinstance(arg, str) and len(arg) < 64 and not _has_hint(arg):
+            return arg
+        return _Redacted(arg, self.max_length)
@@ -0,0 +1,429 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : response_cache.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 查询类API的读穿透缓存，按操作设置有效期，过期后先返回旧值再后台刷新，写操作成功后使相关缓存失效，
+           可选持久化到磁盘供新启动的服务进程使用
+"""
+
+import asyncio
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from utils.config import config
+from utils.disk_cache import DiskCache
+from utils.executor import get_executor, run_blocking
+from utils.logger import setup_logger
+
+logger = setup_logger("response_cache")
+
+# 默认缓存的查询操作及有效期(秒)，实时状态类查询(如流状态、在线流列表)不缓存，
+# 鉴权key查询由auth_key_cache按域名缓存，这里不再缓存一份
+DEFAULT_TTLS = {
+    "DescribeLiveDomain": 60,
+    "DescribeLiveDomains": 60,
+    "DescribeLivePullStreamTasks": 10,
+    "DescribeLiveTranscodeTemplate": 300,
+    "DescribeLiveTranscodeTemplates": 300,
+    "DescribeLiveTranscodeRules": 300,
+}
+
+# 写操作 -> 受影响的查询操作
+INVALIDATIONS = {
+    "AddLiveDomain": ("DescribeLiveDomain", "DescribeLiveDomains"),
+    "DeleteLiveDomain": ("DescribeLiveDomain", "DescribeLiveDomains"),
+    "EnableLiveDomain": ("DescribeLiveDomain", "DescribeLiveDomains"),
+    "ForbidLiveDomain": ("DescribeLiveDomain", "DescribeLiveDomains"),
+    "CreateLivePullStreamTask": ("DescribeLivePullStreamTasks",),
+    "ModifyLivePullStreamTask": ("DescribeLivePullStreamTasks",),
+    "DeleteLivePullStreamTask": ("DescribeLivePullStreamTasks",),
+    "CreateLiveTranscodeTemplate": ("DescribeLiveTranscodeTemplate", "DescribeLiveTranscodeTemplates"),
+    "DeleteLiveTranscodeTemplate": (
+        "DescribeLiveTranscodeTemplate", "DescribeLiveTranscodeTemplates", "DescribeLiveTranscodeRules"
+    ),
+    "CreateLiveTranscodeRule": ("DescribeLiveTranscodeRules",),
+    "DeleteLiveTranscodeRule": ("DescribeLiveTranscodeRules",),
+    "ModifyLivePushAuthKey": ("DescribeLivePushAuthKey",),
+    "ModifyLivePlayAuthKey": ("DescribeLivePlayAuthKey",),
+}
+
+
+class _Entry:
+    """缓存条目"""
+
+    __slots__ = ("action", "value", "fresh_until", "stale_until", "size")
+
+    def __init__(self, action: str, value: Any, fresh_until: float, stale_until: float, size: int):
+        self.action = action
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.size = size
+
+
+def _size_of(value: Any) -> int:
+    """条目大小按JSON序列化后的字节数估算，与写入磁盘的内容一致"""
+    return len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+
+class ResponseCache:
+    """查询类API响应缓存，超出条目数或字节数上限时淘汰最久未使用的条目"""
+
+    def __init__(
+            self,
+            ttls: Dict[str, float],
+            stale_ttl: float = 30.0,
+            max_entries: int = 512,
+            max_bytes: int = 32 * 1024 * 1024,
+            disk: Optional[DiskCache] = None
+    ):
+        """
+        初始化缓存
+
+        Args:
+            ttls: 按操作设置的有效期(秒)，未列出或为0的操作不缓存
+            stale_ttl: 过期后仍可返回旧值并后台刷新的时长(秒)，0表示过期即重新请求
+            max_entries: 最大条目数，0表示不缓存
+            max_bytes: 全部条目按JSON序列化计算的字节数上限，0表示不限制；单个响应超过上限时不缓存在内存中
+            disk: 磁盘持久层，内存未命中时读取，写入和失效同步到磁盘
+        """
+        self.ttls = {action: ttl for action, ttl in ttls.items() if ttl > 0}
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.disk = disk
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._refreshing: Set[Hashable] = set()
+        # 异步刷新任务需要保持引用，避免被回收
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        # 失效操作递增代数，失效前发起的请求结果不再写入缓存
+        self._generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.refreshes = 0
+        self.invalidations = 0
+
+    def ttl_for(self, action: str) -> Optional[float]:
+        """返回操作的有效期，不缓存时返回None"""
+        if self.max_entries <= 0:
+            return None
+        return self.ttls.get(action)
+
+    def _lookup(self, key: Hashable, action: str) -> Tuple[Optional[_Entry], bool, int]:
+        """返回(条目, 是否需要后台刷新, 当前代数)，条目不可用时为None"""
+        result, generation = self._lookup_memory(key)
+        if result is not None:
+            return result
+        # 内存未命中时读取磁盘，磁盘读取不持有锁
+        return self._from_disk(key, action, self.disk.get(DiskCache.encode_key(key)), generation)
+
+    async def _lookup_async(self, key: Hashable, action: str) -> Tuple[Optional[_Entry], bool, int]:
+        """_lookup的异步版本，磁盘读取可能等待其他进程的写锁，放到线程池中执行，不阻塞事件循环"""
+        result, generation = self._lookup_memory(key)
+        if result is not None:
+            return result
+        stored = await run_blocking(self.disk.get, DiskCache.encode_key(key))
+        return self._from_disk(key, action, stored, generation)
+
+    def _lookup_memory(self, key: Hashable) -> Tuple[Optional[Tuple[Optional[_Entry], bool, int]], int]:
+        """查找内存，返回(查找结果, 当前代数)，需要继续读取磁盘时查找结果为None"""
+        with self._lock:
+            generation = self._generation
+            entry = self._lookup_locked(key, time.monotonic())
+            if entry is not None or self.disk is None:
+                return self._hit_locked(key, entry, time.monotonic(), generation), generation
+        return None, generation
+
+    def _from_disk(
+            self,
+            key: Hashable,
+            action: str,
+            stored: Optional[Tuple[Any, float, float]],
+            generation: int
+    ) -> Tuple[Optional[_Entry], bool, int]:
+        size = _size_of(stored[0]) if stored is not None else 0
+        with self._lock:
+            if stored is None or generation != self._generation:
+                return self._hit_locked(key, None, time.monotonic(), generation)
+            value, fresh_until, expires_at = stored
+            # 磁盘中的时间是UNIX时间戳，换算为本进程的单调时钟
+            now = time.monotonic()
+            offset = now - time.time()
+            entry = _Entry(action, value, fresh_until + offset, expires_at + offset, size)
+            self._put_locked(key, entry)
+            self.disk_hits += 1
+            return self._hit_locked(key, entry, now, generation)
+
+    def _lookup_locked(self, key: Hashable, now: float) -> Optional[_Entry]:
+        entry = self._data.get(key)
+        if entry is not None and entry.stale_until <= now:
+            del self._data[key]
+            self._bytes -= entry.size
+            entry = None
+        return entry
+
+    def _hit_locked(self, key: Hashable, entry: Optional[_Entry], now: float, generation: int):
+        if entry is None:
+            self.misses += 1
+            return None, False, generation
+        if key in self._data:
+            self._data.move_to_end(key)
+        if entry.fresh_until > now:
+            self.hits += 1
+            return entry, False, generation
+        self.stale_hits += 1
+        refresh = key not in self._refreshing
+        if refresh:
+            self._refreshing.add(key)
+        return entry, refresh, generation
+
+    def _put_locked(self, key: Hashable, entry: _Entry) -> None:
+        old = self._data.pop(key, None)
+        if old is not None:
+            self._bytes -= old.size
+        if self.max_bytes and entry.size > self.max_bytes:
+            logger.debug("响应过大，不缓存在内存中: %s, %d字节", entry.action, entry.size)
+            return
+        self._data[key] = entry
+        self._bytes += entry.size
+        while len(self._data) > self.max_entries or (self.max_bytes and self._bytes > self.max_bytes):
+            self._bytes -= self._data.popitem(last=False)[1].size
+
+    def _store(self, key: Hashable, action: str, value: Any, generation: int) -> None:
+        snapshot = self._store_memory(key, action, value, generation)
+        if snapshot is not None and self.disk is not None:
+            self._store_disk(key, action, snapshot, generation)
+
+    def _store_async(self, key: Hashable, action: str, value: Any, generation: int) -> None:
+        """写入内存，磁盘写入交给线程池在后台完成，调用方不等待"""
+        snapshot = self._store_memory(key, action, value, generation)
+        if snapshot is not None and self.disk is not None:
+            get_executor().submit(self._store_disk, key, action, snapshot, generation)
+
+    def _store_memory(self, key: Hashable, action: str, value: Any, generation: int) -> Optional[Any]:
+        """写入内存，返回写入的快照；期间发生过失效时不写入，返回None"""
+        ttl = self.ttls[action]
+        snapshot = copy.deepcopy(value)
+        size = _size_of(snapshot)
+        with self._lock:
+            if generation != self._generation:
+                return None
+            now = time.monotonic()
+            self._put_locked(key, _Entry(action, snapshot, now + ttl, now + ttl + self.stale_ttl, size))
+        return snapshot
+
+    def _store_disk(self, key: Hashable, action: str, snapshot: Any, generation: int) -> None:
+        # 后台写入排队期间可能已经失效
+        if generation == self._generation:
+            self.disk.set(DiskCache.encode_key(key), action, snapshot, self.ttls[action], self.stale_ttl)
+
+    def _refresh_done(self, key: Hashable) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+            self.refreshes += 1
+
+    def _refresh(self, key: Hashable, action: str, fetch: Callable[[], Any], generation: int) -> None:
+        try:
+            self._store(key, action, fetch(), generation)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("后台刷新缓存失败: %s, %s", action, e)
+        finally:
+            self._refresh_done(key)
+
+    async def _refresh_async(
+            self,
+            key: Hashable,
+            action: str,
+            fetch: Callable[[], Awaitable[Any]],
+            generation: int
+    ) -> None:
+        try:
+            self._store_async(key, action, await fetch(), generation)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning("后台刷新缓存失败: %s, %s", action, e)
+        finally:
+            self._refresh_done(key)
+
+    def get_or_fetch(self, key: Hashable, action: str, fetch: Callable[[], Any]) -> Any:
+        """
+        同步读取，未命中时调用fetch并写入缓存，条目过期但仍在stale_ttl内时返回旧值并在线程池中刷新
+
+        Args:
+            key: 请求键
+            action: API操作名称
+            fetch: 上游调用
+
+        Returns:
+            API响应，命中缓存时返回副本
+        """
+        if self.ttl_for(action) is None:
+            return fetch()
+        entry, refresh, generation = self._lookup(key, action)
+        if entry is None:
+            value = fetch()
+            self._store(key, action, value, generation)
+            return value
+        if refresh:
+            get_executor().submit(self._refresh, key, action, fetch, generation)
+        return copy.deepcopy(entry.value)
+
+    async def get_or_fetch_async(
+            self,
+            key: Hashable,
+            action: str,
+            fetch: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        异步读取，行为同get_or_fetch，后台刷新在事件循环中执行，磁盘读写在线程池中执行
+
+        Args:
+            key: 请求键
+            action: API操作名称
+            fetch: 返回上游调用协程的函数
+
+        Returns:
+            API响应，命中缓存时返回副本
+        """
+        if self.ttl_for(action) is None:
+            return await fetch()
+        entry, refresh, generation = await self._lookup_async(key, action)
+        if entry is None:
+            value = await fetch()
+            self._store_async(key, action, value, generation)
+            return value
+        if refresh:
+            task = asyncio.get_running_loop().create_task(self._refresh_async(key, action, fetch, generation))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return copy.deepcopy(entry.value)
+
+    def invalidate(self, actions: Optional[Tuple[str, ...]] = None) -> int:
+        """
+        使缓存失效
+
+        Args:
+            actions: 查询操作名称，为空时清空全部
+
+        Returns:
+            删除的条目数
+        """
+        removed = self._invalidate_memory(actions)
+        if self.disk is not None:
+            # 同时使其他服务进程的持久化条目失效
+            self.disk.invalidate(actions)
+        return removed
+
+    async def invalidate_async(self, actions: Optional[Tuple[str, ...]] = None) -> int:
+        """invalidate的异步版本，磁盘删除在线程池中执行"""
+        removed = self._invalidate_memory(actions)
+        if self.disk is not None:
+            await run_blocking(self.disk.invalidate, actions)
+        return removed
+
+    def _invalidate_memory(self, actions: Optional[Tuple[str, ...]]) -> int:
+        with self._lock:
+            self._generation += 1
+            if actions is None:
+                removed = len(self._data)
+                self._data.clear()
+                self._bytes = 0
+            else:
+                keys = [key for key, entry in self._data.items() if entry.action in actions]
+                for key in keys:
+                    self._bytes -= self._data.pop(key).size
+                removed = len(keys)
+            self.invalidations += 1
+        return removed
+
+    def invalidate_for_write(self, action: str) -> None:
+        """写操作执行后使受影响的查询缓存失效"""
+        actions = INVALIDATIONS.get(action)
+        if actions:
+            removed = self.invalidate(actions)
+            logger.info("%s 使查询缓存失效: %s, 删除%d条", action, actions, removed)
+
+    async def invalidate_for_write_async(self, action: str) -> None:
+        """invalidate_for_write的异步版本"""
+        actions = INVALIDATIONS.get(action)
+        if actions:
+            removed = await self.invalidate_async(actions)
+            logger.info("%s 使查询缓存失效: %s, 删除%d条", action, actions, removed)
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计"""
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "disk": self.disk.path if self.disk is not None else None,
+                "disk_hits": self.disk_hits,
+                "refreshes": self.refreshes,
+                "invalidations": self.invalidations,
+            }
+
+
+def parse_ttls(value: str) -> Dict[str, float]:
+    """
+    解析按操作配置的有效期，覆盖默认值
+
+    Args:
+        value: 形如"DescribeLiveDomains=120,DescribeLivePullStreamTasks=0"的字符串
+
+    Returns:
+        {操作名称: 有效期(秒)}
+    """
+    ttls = dict(DEFAULT_TTLS)
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        action, sep, ttl = item.partition("=")
+        if not sep:
+            raise ValueError(f"缓存有效期配置格式错误: {item}，应为 操作名称=秒数")
+        ttls[action.strip()] = float(ttl)
+    return ttls
+
+
+def open_disk_cache(directory: str) -> Optional[DiskCache]:
+    """
+    打开缓存目录下的磁盘缓存，并清理过期条目
+
+    Args:
+        directory: 缓存目录，为空时不启用
+
+    Returns:
+        磁盘缓存，未启用或打开失败时返回None
+    """
+    if not directory:
+        return None
+    try:
+        disk = DiskCache(os.path.join(os.path.expanduser(directory), "response_cache.sqlite3"))
+        disk.purge_expired()
+        return disk
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.warning("打开磁盘缓存失败，仅使用内存缓存: %s", e)
+        return None
+
+
+response_cache = ResponseCache(
+    ttls=parse_ttls(config.RESPONSE_CACHE_TTLS),
+    stale_ttl=config.RESPONSE_CACHE_STALE_TTL,
+    max_entries=config.RESPONSE_CACHE_MAX_ENTRIES,
+    max_bytes=config.RESPONSE_CACHE_MAX_BYTES,
+    disk=open_disk_cache(config.DISK_CACHE_DIR)
+)
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : retry.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : API调用重试，按错误码区分可重试错误，指数退避加随机抖动，受总时限约束
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+from utils.config import config
+from utils.logger import setup_logger
+
+logger = setup_logger("retry")
+
+# 请求未被服务端处理的错误，任何操作都可以重试
+REJECTED_CODES = (
+    "RequestLimitExceeded",
+    "AuthFailure.SignatureExpire",
+)
+
+# 服务端或网络的临时错误，请求可能已经生效，只有幂等操作可以重试
+TRANSIENT_CODES = (
+    "InternalError",
+    "ResourceUnavailable",
+    "ClientNetworkError",
+    "ServerNetworkError",
+)
+
+# 重复执行结果不变的写操作，其余Create/Add类操作重复执行会产生重复资源或报已存在
+IDEMPOTENT_ACTIONS = frozenset({
+    "DropLiveStream",
+    "ForbidLiveStream",
+    "ResumeLiveStream",
+    "EnableLiveDomain",
+    "ForbidLiveDomain",
+    "DeleteLiveDomain",
+    "DeleteLivePullStreamTask",
+    "ModifyLivePullStreamTask",
+    "DeleteLiveTranscodeTemplate",
+    "DeleteLiveTranscodeRule",
+    "AddDelayLiveStream",
+    "ResumeDelayLiveStream",
+})
+
+
+def match_code(code: str, prefixes) -> bool:
+    """错误码与前缀相同或为其子错误码，如RequestLimitExceeded.UinLimitExceeded"""
+    return any(code == prefix or code.startswith(prefix + ".") for prefix in prefixes)
+
+
+def is_idempotent(action: str) -> bool:
+    """查询类操作和IDEMPOTENT_ACTIONS中的写操作可以安全地重复执行"""
+    return action.startswith("Describe") or action in IDEMPOTENT_ACTIONS
+
+
+def is_retryable(action: str, code: Optional[str]) -> bool:
+    """
+    判断错误是否可以重试
+
+    Args:
+        action: API操作名称
+        code: 错误码
+
+    Returns:
+        是否可以重试
+    """
+    if not code:
+        return False
+    if match_code(code, REJECTED_CODES):
+        return True
+    return is_idempotent(action) and match_code(code, TRANSIENT_CODES)
+
+
+class _RetryStats:
+    """单个操作的重试统计"""
+
+    __slots__ = ("calls", "retries", "total_delay", "exhausted", "codes")
+
+    def __init__(self):
+        self.calls = 0
+        self.retries = 0
+        self.total_delay = 0.0
+        self.exhausted = 0
+        self.codes: Dict[str, int] = {}
+
+
+class RetryPolicy:
+    """重试策略"""
+
+    def __init__(
+            self,
+            max_attempts: int = 3,
+            base_delay: float = 0.2,
+            max_delay: float = 5.0,
+            deadline: float = 30.0
+    ):
+        """
+        初始化重试策略
+
+        Args:
+            max_attempts: 最多尝试次数，包含首次调用
+            base_delay: 首次重试的退避上限(秒)
+            max_delay: 单次退避上限(秒)
+            deadline: 从首次调用开始的总时限(秒)，超出后不再重试
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self._stats: Dict[str, _RetryStats] = {}
+        self._lock = threading.Lock()
+
+    def backoff(self, attempt: int) -> float:
+        """第attempt次重试前的等待时间，在[0, min(max_delay, base_delay * 2^(attempt-1))]内随机取值"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+    def _next_delay(self, action: str, error: TencentCloudSDKException, attempt: int, started: float) -> Optional[float]:
+        """返回下次重试前的等待时间，不再重试时返回None"""
+        code = error.get_code()
+        retryable = is_retryable(action, code)
+        delay = self.backoff(attempt) if retryable else 0.0
+        with self._lock:
+            stats = self._stats.get(action)
+            if stats is None:
+                stats = self._stats[action] = _RetryStats()
+            stats.codes[code] = stats.codes.get(code, 0) + 1
+            if not retryable:
+                return None
+            if attempt >= self.max_attempts or time.monotonic() - started + delay > self.deadline:
+                stats.exhausted += 1
+                return None
+            stats.retries += 1
+            stats.total_delay += delay
+        logger.warning("API调用失败，%.3f秒后第%d次重试: %s, %s", delay, attempt, action, code)
+        return delay
+
+    def _record_call(self, action: str) -> None:
+        with self._lock:
+            stats = self._stats.get(action)
+            if stats is None:
+                stats = self._stats[action] = _RetryStats()
+            stats.calls += 1
+
+    def call(self, action: str, func: Callable[[], Any]) -> Any:
+        """
+        同步调用并按策略重试
+
+        Args:
+            action: API操作名称
+            func: 单次调用
+
+        Returns:
+            func的返回值
+
+        Raises:
+            TencentCloudSDKException: 不可重试或重试耗尽
+        """
+        self._record_call(action)
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                return func()
+            except TencentCloudSDKException as e:
+                delay = self._next_delay(action, e, attempt, started)
+                if delay is None:
+                    raise
+            time.sleep(delay)
+            attempt += 1
+
+    async def call_async(self, action: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        异步调用并按策略重试
+
+        Args:
+            action: API操作名称
+            func: 返回单次调用协程的函数
+
+        Returns:
+            协程的返回值
+
+        Raises:
+            TencentCloudSDKException: 不可重试或重试耗尽
+        """
+        self._record_call(action)
+        started = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                return await func()
+            except TencentCloudSDKException as e:
+                delay = self._next_delay(action, e, attempt, started)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """返回按操作统计的调用、重试次数和退避时间"""
+        with self._lock:
+            return {
+                action: {
+                    "calls": s.calls,
+                    "retries": s.retries,
+                    "total_delay_seconds": round(s.total_delay, 6),
+                    "exhausted": s.exhausted,
+                    "error_codes": dict(s.codes),
+                }
+                for action, s in self._stats.items()
+            }
+
+
+retry_policy = RetryPolicy(
+    max_attempts=config.RETRY_MAX_ATTEMPTS,
+    base_delay=config.RETRY_BASE_DELAY,
+    max_delay=config.RETRY_MAX_DELAY,
+    deadline=config.RETRY_DEADLINE
+)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : single_flight.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 只读API的请求合并，相同(操作, 参数, 区域, 端点, 凭证)的并发请求只向上游发起一次
+"""
+
+import asyncio
+import copy
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from utils.client_pool import credential_identity
+from utils.config import config
+
+
+def is_read_only(action: str) -> bool:
+    """只读操作可以合并，写操作每次都必须发到上游"""
+    return action.startswith("Describe")
+
+
+def request_key(action: str, params: Dict[str, Any], region: str, endpoint: str) -> Tuple:
+    """
+    生成请求键，参数按键排序后序列化，顺序不同的相同参数视为同一请求
+
+    Args:
+        action: API操作名称
+        params: API参数
+        region: 区域
+        endpoint: API端点
+
+    Returns:
+        请求键
+    """
+    return (
+        action,
+        json.dumps(params, sort_keys=True, separators=(",", ":"), ensure_ascii=False),
+        region,
+        endpoint,
+        credential_identity(config.SECRET_ID, config.SECRET_KEY),
+    )
+
+
+class _Flight:
+    """一次正在进行的同步请求"""
+
+    __slots__ = ("event", "value", "error", "followers")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class _AsyncFlight:
+    """一次正在进行的异步请求"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task"):
+        self.task = task
+        self.waiters = 1
+
+
+class SingleFlight:
+    """
+    请求合并
+
+    合并的请求各自拿到响应的副本，避免调用方修改响应时互相影响；
+    没有被合并的请求直接返回原始响应
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        初始化请求合并
+
+        Args:
+            enabled: 是否启用，关闭时直接调用
+        """
+        self.enabled = enabled
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._async_flights: Dict[Hashable, _AsyncFlight] = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        同步执行，同一键的并发调用只执行一次func
+
+        Args:
+            key: 请求键
+            func: 上游调用
+
+        Returns:
+            func的返回值，被合并的调用返回副本
+        """
+        if not self.enabled:
+            return func()
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.requests += 1
+            else:
+                flight.followers += 1
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return copy.deepcopy(flight.value)
+
+        try:
+            value = func()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+                followers = flight.followers
+            if flight.error is None and followers:
+                # 发起方可能修改返回的响应，跟随方从独立的快照复制
+                flight.value = copy.deepcopy(value)
+            flight.event.set()
+        return value
+
+    async def do_async(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        异步执行，同一事件循环中同一键的并发调用只执行一次func
+
+        上游调用在独立的任务中执行，任一调用方被取消不影响其他调用方
+
+        Args:
+            key: 请求键
+            func: 返回上游调用协程的函数
+
+        Returns:
+            协程的返回值，发生合并时每个调用方都拿到副本
+        """
+        if not self.enabled:
+            return await func()
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            flight = self._async_flights.get(flight_key)
+            if flight is None:
+                flight = _AsyncFlight(loop.create_task(func()))
+                self._async_flights[flight_key] = flight
+                flight.task.add_done_callback(lambda task: self._finish_async(flight_key, task))
+                self.requests += 1
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        value = await asyncio.shield(flight.task)
+        # 完成回调先于各调用方恢复执行，此时waiters已不再变化
+        return copy.deepcopy(value) if flight.waiters > 1 else value
+
+    def _finish_async(self, flight_key: Hashable, task: "asyncio.Task") -> None:
+        with self._lock:
+            self._async_flights.pop(flight_key, None)
+        # 调用方全部取消时没有人读取结果，在此读取异常避免事件循环告警
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回上游请求数、合并数和合并比例"""
+        with self._lock:
+            total = self.requests + self.coalesced
+            return {
+                "enabled": self.enabled,
+                "upstream_requests": self.requests,
+                "coalesced": self.coalesced,
+                "coalescing_ratio": round(self.coalesced / total, 4) if total else 0.0,
+            }
+
+
+single_flight = SingleFlight(enabled=config.SINGLE_FLIGHT_ENABLED)
@@ -8,20 +8,37 @@
 @Desc    : 腾讯云API客户端基类
 """
 
-from typing import Any, Dict, Optional
+import time
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from tencentcloud.common import credential
-from tencentcloud.common.common_client import CommonClient
 from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
-from tencentcloud.common.profile.client_profile import ClientProfile
-from tencentcloud.common.profile.http_profile import HttpProfile
 
+from utils.circuit_breaker import circuit_breakers
+from utils.client_pool import client_pool, credential_identity
 from utils.config import config
+from utils.executor import run_blocking
+from utils.fixtures import fixture_store
 from utils.logger import setup_logger
+from utils.metrics import metrics
+from utils.rate_limiter import rate_limiter
+from utils.response_cache import response_cache
+from utils.retry import retry_policy
+from utils.single_flight import is_read_only, request_key, single_flight
+from utils.tracing import tracer
+
+if TYPE_CHECKING:
+    from tencentcloud.common.common_client import CommonClient
 
 logger = setup_logger("tencent_client")
 
 
+def request_id_of(response: Any) -> Optional[str]:
+    """取API响应中的RequestId"""
+    if isinstance(response, dict):
+        return response.get("Response", {}).get("RequestId")
+    return None
+
+
 class TencentCloudClient:
     """腾讯云API客户端基类"""
 
@@ -45,10 +62,29 @@ class TencentCloudClient:
         self.version = version
         self.endpoint = endpoint
         self.region = region or ""
-        self.client = self._create_client()
+        # 回放时不访问网络，也不需要凭证
+        self.client = None if fixture_store.replaying else self._create_client()
+
+    def _create_client(self) -> "CommonClient":
+        """从进程级注册表获取腾讯云API客户端，相同配置的客户端及HTTP会话会被复用"""
+        key = (
+            self.service,
+            self.version,
+            self.endpoint,
+            self.region,
+            credential_identity(config.SECRET_ID, config.SECRET_KEY)
+        )
+        with tracer.span("client.create", service=self.service, endpoint=self.endpoint):
+            return client_pool.get(key, self._build_client)
+
+    def _build_client(self) -> "CommonClient":
+        """创建腾讯云API客户端，SDK及其依赖的requests在首次创建时才导入，缩短服务启动时间"""
+        # pylint: disable=import-outside-toplevel
+        from tencentcloud.common import credential
+        from tencentcloud.common.common_client import CommonClient
+        from tencentcloud.common.profile.client_profile import ClientProfile
+        from tencentcloud.common.profile.http_profile import HttpProfile
 
-    def _create_client(self) -> CommonClient:
-        """创建腾讯云API客户端"""
         try:
             # 创建凭证
             cred = credential.Credential(config.SECRET_ID, config.SECRET_KEY)
@@ -56,23 +92,41 @@ class TencentCloudClient:
             # 创建HTTP配置
             http_profile = HttpProfile()
             http_profile.endpoint = self.endpoint
+            http_profile.scheme = config.API_SCHEME
+            http_profile.reqTimeout = config.API_TIMEOUT
+            # 复用的客户端保持长连接
+            http_profile.keepAlive = True
 
             # 创建客户端配置
             client_profile = ClientProfile()
             client_profile.httpProfile = http_profile
 
             # 创建客户端
-            return CommonClient(
+            client = CommonClient(
                 self.service,
                 self.version,
                 cred,
                 self.region,
                 profile=client_profile
             )
+            self._resize_connection_pool(client)
+            return client
         except Exception as e:
-            logger.error(f"创建腾讯云API客户端失败: {e}")
+            logger.error("创建腾讯云API客户端失败: %s", e)
             raise
 
+    @staticmethod
+    def _resize_connection_pool(client: "CommonClient") -> None:
+        """将客户端HTTP会话的连接池扩大到与线程池一致，避免并发调用时丢弃长连接"""
+        from requests.adapters import HTTPAdapter  # pylint: disable=import-outside-toplevel
+
+        session = getattr(getattr(client.request, "conn", None), "_session", None)
+        if session is None:
+            return
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, config.API_EXECUTOR_WORKERS))
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
     def call_api(self, action: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         调用腾讯云API
@@ -90,10 +144,104 @@ class TencentCloudClient:
         if params is None:
             params = {}
 
+        with tracer.span("api.call", action=action, region=self.region) as span:
+            result = self._call_api(action, params)
+            span.set_attribute("request_id", request_id_of(result))
+            return result
+
+    def _call_api(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """查询经缓存、合并和重试后调用，写操作重试后使相关查询缓存失效"""
+        if is_read_only(action):
+            key = request_key(action, params, self.region, self.endpoint)
+            return response_cache.get_or_fetch(key, action, lambda: single_flight.do(
+                key,
+                lambda: retry_policy.call(action, lambda: self._call_once(action, params))
+            ))
+        try:
+            return retry_policy.call(action, lambda: self._call_once(action, params))
+        finally:
+            # 写操作失败时也可能已部分生效，同样使相关查询缓存失效
+            response_cache.invalidate_for_write(action)
+
+    def _call_once(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """单次调用，每次重试都重新排队限流，排队结束后才进入熔断和指标统计"""
+        with tracer.span("api.attempt", action=action):
+            # 同步调用方在当前线程中排队，工具调用应使用async_call_api在事件循环中排队
+            with tracer.span("rate_limit.acquire"):
+                rate_limiter.acquire(action, self.region, credential_identity(config.SECRET_ID, config.SECRET_KEY))
+            with metrics.track_api(action, self.region), circuit_breakers.get(self.region, self.endpoint).guard():
+                return self._attempt(action, params)
+
+    def _attempt(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """发送一次请求"""
+        try:
+            logger.info("调用API: %s, 参数: %s", action, params)
+            # SDK在一次调用内完成签名、发送和解析，无法再拆分
+            with tracer.span("http.send", endpoint=self.endpoint):
+                return self._send(action, params)
+        except TencentCloudSDKException as e:
+            logger.error("API调用失败: %s", e)
+            raise
+
+    def _send(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """发送请求，录制模式下记录响应和耗时，回放模式下返回录制的响应"""
+        if fixture_store.replaying:
+            return fixture_store.replay(action, params, self.region)
+        if not fixture_store.recording:
+            return self.client.call_json(action, params)
+        start = time.perf_counter()
         try:
-            logger.info(f"调用API: {action}, 参数: {params}")
             response = self.client.call_json(action, params)
-            return response
         except TencentCloudSDKException as e:
-            logger.error(f"API调用失败: {e}")
+            fixture_store.record(action, params, self.region, time.perf_counter() - start, error=e)
             raise
+        fixture_store.record(action, params, self.region, time.perf_counter() - start, response=response)
+        return response
+
+    async def async_call_api(self, action: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        调用腾讯云API，不阻塞事件循环
+
+        缓存、合并、重试和限流排队都在事件循环中完成，只有SDK请求放入线程池，
+        排队等待配额的调用不占用工作线程
+
+        Args:
+            action: API操作名称
+            params: API参数，默认为空字典
+
+        Returns:
+            API响应结果
+
+        Raises:
+            TencentCloudSDKException: API调用失败
+        """
+        if params is None:
+            params = {}
+
+        with tracer.span("api.call", action=action, region=self.region) as span:
+            result = await self._async_call_api(action, params)
+            span.set_attribute("request_id", request_id_of(result))
+            return result
+
+    async def _async_call_api(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """_call_api的异步版本"""
+        if is_read_only(action):
+            key = request_key(action, params, self.region, self.endpoint)
+            return await response_cache.get_or_fetch_async(key, action, lambda: single_flight.do_async(
+                key,
+                lambda: retry_policy.call_async(action, lambda: self._async_call_once(action, params))
+            ))
+        try:
+            return await retry_policy.call_async(action, lambda: self._async_call_once(action, params))
+        finally:
+            await response_cache.invalidate_for_write_async(action)
+
+    async def _async_call_once(self, action: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """在事件循环中排队限流，再把请求放入线程池"""
+        with tracer.span("api.attempt", action=action):
+            with tracer.span("rate_limit.acquire"):
+                await rate_limiter.acquire_async(
+                    action, self.region, credential_identity(config.SECRET_ID, config.SECRET_KEY)
+                )
+            with metrics.track_api(action, self.region), circuit_breakers.get(self.region, self.endpoint).guard():
+                return await run_blocking(self._attempt, action, params)
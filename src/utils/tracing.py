@@ -0,0 +1,424 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : tracing.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 调用链追踪，按工具、客户端、签名、网络和序列化分层记录嵌套的span，导出到本地JSONL文件或OTLP，未启用时不产生开销
+"""
+
+import abc
+import atexit
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
+import urllib.request
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+from utils.config import config
+from utils.logger import setup_logger
+
+logger = setup_logger("tracing")
+
+JSONL = "jsonl"
+OTLP = "otlp"
+
+_current: ContextVar[Optional["Span"]] = ContextVar("tracing_span", default=None)
+
+# 进程退出时最多等待导出的时间(秒)
+_SHUTDOWN_TIMEOUT = 5.0
+
+
+class Span:
+    """一个已开始的span"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.attributes = {key: value for key, value in attributes.items() if value is not None}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """设置属性，值为None时忽略"""
+        if value is not None:
+            self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        """记录异常，腾讯云错误同时记录错误码和RequestId"""
+        if isinstance(error, TencentCloudSDKException):
+            self.set_attribute("error.code", error.get_code())
+            self.set_attribute("request_id", error.get_request_id())
+            self.error = error.get_message() or error.get_code()
+        else:
+            self.error = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSONL导出格式"""
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    """未启用或未采样时使用的空span"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class _SpanScope:
+    """在with块内把span设为当前span，退出时结束并导出"""
+
+    __slots__ = ("tracer", "span", "token")
+
+    def __init__(self, tracer: "Tracer", span: Optional[Span]):
+        self.tracer = tracer
+        self.span = span
+        self.token = None
+
+    def __enter__(self):
+        # 未采样的根span以空span占位，子span随之跳过
+        self.token = _current.set(self.span if self.span is not None else NOOP_SPAN)
+        return self.span if self.span is not None else NOOP_SPAN
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current.reset(self.token)
+        span = self.span
+        if span is not None:
+            span.end_ns = time.time_ns()
+            if exc is not None:
+                span.record_error(exc)
+            self.tracer.export(span)
+        return False
+
+
+class _BatchExporter(abc.ABC):
+    """在后台线程中按批导出span，子类实现write"""
+
+    def __init__(self, batch_size: int = 512, interval: float = 1.0):
+        self.batch_size = batch_size
+        self.interval = interval
+        self._queue: "queue.SimpleQueue[Span]" = queue.SimpleQueue()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="tracing-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        """放入导出队列，不阻塞调用方"""
+        self._queue.put(span)
+
+    def shutdown(self, timeout: float = _SHUTDOWN_TIMEOUT) -> None:
+        """导出剩余的span后停止后台线程"""
+        self._stopped.set()
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        # 定时批量取出，不为每个span唤醒线程，减少与调用方争抢GIL
+        while not self._stopped.wait(self.interval):
+            self._flush()
+        self._flush()
+
+    def _flush(self) -> None:
+        while True:
+            batch: List[Span] = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if not batch:
+                return
+            try:
+                self.write(batch)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.warning("导出%d个span失败: %s", len(batch), e)
+
+    @abc.abstractmethod
+    def write(self, batch: List[Span]) -> None:
+        """
+        导出一批span，在后台线程中调用，抛出的异常只记录日志
+
+        Args:
+            batch: 待导出的span
+        """
+
+
+class JsonlExporter(_BatchExporter):
+    """追加写入本地JSONL文件，每行一个span"""
+
+    def __init__(self, path: str, **kwargs: Any):
+        """
+        初始化导出器
+
+        Args:
+            path: 文件路径，多个工作进程可写入同一文件
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(**kwargs)
+
+    def write(self, batch: List[Span]) -> None:
+        data = "".join(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n" for span in batch)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+
+
+class OtlpExporter(_BatchExporter):
+    """以OTLP/HTTP JSON格式发送到采集器，不依赖opentelemetry SDK"""
+
+    def __init__(
+            self,
+            endpoint: str,
+            service_name: str,
+            headers: Optional[Dict[str, str]] = None,
+            timeout: float = 5.0,
+            **kwargs: Any
+    ):
+        """
+        初始化导出器
+
+        Args:
+            endpoint: 采集器地址，形如http://localhost:4318/v1/traces
+            service_name: 上报的service.name
+            headers: 额外的请求头，如鉴权token
+            timeout: 请求超时(秒)
+        """
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def write(self, batch: List[Span]) -> None:
+        body = json.dumps({
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{
+                    "scope": {"name": "tencent-cloud-mcp-server"},
+                    "spans": [_otlp_span(span) for span in batch],
+                }],
+            }],
+        }, default=str).encode("utf-8")
+        request = urllib.request.Request(self.endpoint, data=body, headers=self.headers, method="POST")
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    return {"key": key, "value": _otlp_value(value)}
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        # SPAN_KIND_INTERNAL
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [_otlp_attribute(key, value) for key, value in span.attributes.items()],
+        # STATUS_CODE_OK / STATUS_CODE_ERROR
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    return data
+
+
+class Tracer:
+    """span的创建和导出"""
+
+    def __init__(self, exporter: Optional[_BatchExporter] = None, sample_rate: float = 1.0):
+        """
+        初始化追踪器
+
+        Args:
+            exporter: 导出器，为None时不追踪
+            sample_rate: 按调用链采样的比例
+        """
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def span(self, name: str, **attributes: Any):
+        """
+        创建当前span的子span，没有当前span时开始新的调用链
+
+        Args:
+            name: span名称
+            **attributes: 属性
+
+        Returns:
+            上下文管理器，进入时返回span；未启用或未采样时返回空span
+        """
+        if self.exporter is None:
+            return NOOP_SPAN
+        parent = _current.get()
+        if parent is NOOP_SPAN:
+            return NOOP_SPAN
+        if parent is None:
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return _SpanScope(self, None)
+            return _SpanScope(self, Span(name, f"{random.getrandbits(128):032x}", None, attributes))
+        return _SpanScope(self, Span(name, parent.trace_id, parent.span_id, attributes))
+
+    def record(self, name: str, start_ns: int, end_ns: int, **attributes: Any) -> None:
+        """
+        记录当前span下已经结束的子span，用于无法用with包裹的阶段
+
+        Args:
+            name: span名称
+            start_ns: 开始时间(time.time_ns)
+            end_ns: 结束时间(time.time_ns)
+            **attributes: 属性
+        """
+        parent = _current.get()
+        if self.exporter is None or parent is None or parent is NOOP_SPAN:
+            return
+        span = Span(name, parent.trace_id, parent.span_id, attributes)
+        span.start_ns = start_ns
+        span.end_ns = end_ns
+        self.export(span)
+
+    @staticmethod
+    def current():
+        """当前span，没有时返回空span"""
+        return _current.get() or NOOP_SPAN
+
+    def export(self, span: Span) -> None:
+        if self.exporter is not None:
+            self.exporter.export(span)
+
+    def instrument_tools(self, mcp) -> None:
+        """
+        追踪mcp全部工具的调用：mcp.tool包含分发和参数校验，其下的mcp.validate为参数校验耗时，
+        工具函数内的客户端调用和序列化作为子span
+        """
+        if not self.enabled:
+            return
+        tool_manager = mcp._tool_manager  # pylint: disable=protected-access
+        call_tool = tool_manager.call_tool
+
+        async def traced_call_tool(name: str, *args, **kwargs):
+            tool = tool_manager.get_tool(name)
+            if tool is not None and not getattr(tool.fn, "__traced__", False):
+                tool.fn = self._wrap_tool_fn(tool.fn)
+            with self.span("mcp.tool", tool=name):
+                return await call_tool(name, *args, **kwargs)
+
+        tool_manager.call_tool = traced_call_tool
+
+    def _wrap_tool_fn(self, fn):
+        """工具函数开始执行时补记参数校验的span"""
+        @functools.wraps(fn)
+        async def traced_fn(*args, **kwargs):
+            parent = _current.get()
+            if isinstance(parent, Span):
+                self.record("mcp.validate", parent.start_ns, time.time_ns())
+            return await fn(*args, **kwargs)
+
+        traced_fn.__traced__ = True
+        return traced_fn
+
+    def shutdown(self) -> None:
+        """导出剩余的span"""
+        if self.exporter is not None:
+            self.exporter.shutdown()
+
+
+def parse_headers(value: str) -> Dict[str, str]:
+    """
+    解析OTLP请求头配置
+
+    Args:
+        value: 形如"Authorization=Bearer xxx,X-Tenant=live"的字符串
+
+    Returns:
+        {请求头: 值}
+    """
+    headers = {}
+    for item in value.split(","):
+        name, sep, header_value = item.partition("=")
+        if sep and name.strip():
+            headers[name.strip()] = header_value.strip()
+    return headers
+
+
+def create_exporter(kind: str) -> Optional[_BatchExporter]:
+    """
+    按配置创建导出器
+
+    Args:
+        kind: jsonl、otlp，为空时不追踪
+
+    Returns:
+        导出器，不追踪时为None
+
+    Raises:
+        ValueError: 未知的导出方式
+    """
+    if not kind:
+        return None
+    if kind == JSONL:
+        return JsonlExporter(config.TRACING_FILE)
+    if kind == OTLP:
+        return OtlpExporter(
+            config.TRACING_OTLP_ENDPOINT,
+            config.TRACING_SERVICE_NAME,
+            headers=parse_headers(config.TRACING_OTLP_HEADERS)
+        )
+    raise ValueError(f"未知的追踪导出方式: {kind}，可选值为{JSONL}、{OTLP}")
+
+
+tracer = Tracer(create_exporter(config.TRACING_EXPORTER), sample_rate=config.TRACING_SAMPLE_RATE)
+atexit.register(tracer.shutdown)
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : ttl_cache.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 线程安全的TTL缓存，容量有界，同步和异步的并发未命中都只执行一次加载
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _Flight:
+    """一次正在进行的加载"""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class Expiring:
+    """
+    带剩余有效期的加载结果，用于从磁盘等其他缓存层读到的值，
+    按剩余时间而不是完整的ttl缓存，避免值被使用得比原始有效期更久
+    """
+
+    __slots__ = ("value", "ttl")
+
+    def __init__(self, value: Any, ttl: float):
+        self.value = value
+        self.ttl = ttl
+
+
+def _unwrap(value: Any) -> Any:
+    return value.value if isinstance(value, Expiring) else value
+
+
+class TTLCache:
+    """TTL缓存，超出容量时淘汰最久未使用的条目"""
+
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        """
+        初始化缓存
+
+        Args:
+            ttl: 条目有效期(秒)
+            maxsize: 最大条目数
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, _Flight] = {}
+        # 异步加载按(事件循环, 键)合并，加载在独立任务中执行
+        self._async_inflight: Dict[Tuple[asyncio.AbstractEventLoop, Hashable], "asyncio.Task"] = {}
+        self._lock = threading.Lock()
+        # 失效操作递增代数，失效前发起的加载结果不再写入缓存
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key: Hashable) -> Any:
+        """
+        读取未过期的条目
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存值，不存在或已过期时返回None
+        """
+        with self._lock:
+            return self._get_locked(key, time.monotonic())
+
+    def _get_locked(self, key: Hashable, now: float) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= now:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        写入条目
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 有效期(秒)，默认使用缓存的ttl
+        """
+        with self._lock:
+            self._set_locked(key, value, ttl)
+
+    def _set_locked(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        if isinstance(value, Expiring):
+            value, ttl = value.value, min(self.ttl, value.ttl)
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        读取条目，未命中时调用loader加载，同一键的并发未命中只调用一次loader
+
+        Args:
+            key: 缓存键
+            loader: 加载函数，抛出异常时不缓存，返回Expiring时按其剩余有效期缓存
+
+        Returns:
+            缓存值
+        """
+        with self._lock:
+            value = self._get_locked(key, time.monotonic())
+            if value is not None:
+                self.hits += 1
+                return value
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+                generation = self._generation
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _unwrap(flight.value)
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if flight.error is None and generation == self._generation:
+                    self._set_locked(key, flight.value)
+                self._inflight.pop(key, None)
+            flight.event.set()
+        return _unwrap(flight.value)
+
+    async def get_or_load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        get_or_load的异步版本，同一事件循环中同一键的并发未命中只调用一次loader
+
+        加载在独立的任务中执行，任一调用方被取消不影响其他调用方和缓存写入
+
+        Args:
+            key: 缓存键
+            loader: 返回协程的加载函数，抛出异常时不缓存，返回Expiring时按其剩余有效期缓存
+
+        Returns:
+            缓存值
+        """
+        loop = asyncio.get_running_loop()
+        flight_key = (loop, key)
+        with self._lock:
+            value = self._get_locked(key, time.monotonic())
+            if value is not None:
+                self.hits += 1
+                return value
+            task = self._async_inflight.get(flight_key)
+            if task is None:
+                self.misses += 1
+                task = loop.create_task(loader())
+                self._async_inflight[flight_key] = task
+                generation = self._generation
+                task.add_done_callback(lambda done: self._finish_async(flight_key, done, generation))
+            else:
+                self.coalesced += 1
+        return _unwrap(await asyncio.shield(task))
+
+    def _finish_async(
+            self,
+            flight_key: Tuple[asyncio.AbstractEventLoop, Hashable],
+            task: "asyncio.Task",
+            generation: int
+    ) -> None:
+        with self._lock:
+            self._async_inflight.pop(flight_key, None)
+            # 调用方全部取消时没有人读取异常，在此读取避免事件循环告警
+            if not task.cancelled() and task.exception() is None and generation == self._generation:
+                self._set_locked(flight_key[1], task.result())
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        使条目失效
+
+        Args:
+            key: 缓存键，为空时清空全部
+        """
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计"""
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
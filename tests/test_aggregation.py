@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_aggregation.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 列表结果汇总测试
+"""
+
+from tools.aggregation import Aggregator
+
+
+def test_group_by_list_and_dict_values():
+    """列表和字典字段可以分组，值相同的记录归入同一组"""
+    aggregator = Aggregator(group_by=["Tags", "Info"])
+    aggregator.add({"Tags": ["a", "b"], "Info": {"x": 1, "y": 2}})
+    aggregator.add({"Tags": ["a", "b"], "Info": {"y": 2, "x": 1}})
+    aggregator.add({"Tags": ["c"], "Info": None})
+
+    summary = aggregator.summary()
+    assert summary["GroupNum"] == 2
+    assert summary["Groups"][0] == {"Key": {"Tags": '["a","b"]', "Info": '{"x":1,"y":2}'}, "Count": 2}
+    assert summary["Groups"][1]["Key"] == {"Tags": '["c"]', "Info": None}
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_async_tencent_client.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : TC3-HMAC-SHA256签名及经桩服务收发请求的测试
+"""
+
+import asyncio
+import hashlib
+import os
+import socket
+import sys
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+from tencentcloud.common.sign import Sign
+
+from utils.async_tencent_client import (
+    TC3_ALGORITHM, AsyncTencentCloudClient, close_http_pools, tc3_sign, tc3_signing_key
+)
+from utils.config import config
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_live_server import MockLiveServer  # noqa: E402
+
+# 腾讯云API 3.0签名方法v3文档中的示例(CVM DescribeInstances)，密钥即文档中打码后的字符串
+DOC_SECRET_ID = "AKIDz8krbsJ5yKBZQpn74WFkmLPx3*******"
+DOC_SECRET_KEY = "Gu5t9xGARNpq86cd98joQYCN3*******"
+DOC_PAYLOAD = b'{"Limit": 1, "Filters": [{"Values": ["\\u672a\\u547d\\u540d"], "Name": "instance-name"}]}'
+DOC_TIMESTAMP = 1551113065
+DOC_SIGNATURE = "2230eefd229f582d8b1b891af7107b91597240707d778ab3738f756258d7652c"
+
+
+def test_tc3_sign_matches_documented_example():
+    """文档示例的请求体哈希和签名"""
+    assert hashlib.sha256(DOC_PAYLOAD).hexdigest() == \
+        "35e9c5b0e3ae67532d3c9f17ead6c90222632e5b1ff7f6e89887f1398934f064"
+    authorization = tc3_sign(
+        DOC_SECRET_ID,
+        DOC_SECRET_KEY,
+        "cvm",
+        "cvm.tencentcloudapi.com",
+        "DescribeInstances",
+        DOC_PAYLOAD,
+        DOC_TIMESTAMP,
+        content_type="application/json; charset=utf-8",
+        signed_headers="content-type;host"
+    )
+    assert authorization == (
+        f"{TC3_ALGORITHM} Credential={DOC_SECRET_ID}/2019-02-25/cvm/tc3_request, "
+        f"SignedHeaders=content-type;host, Signature={DOC_SIGNATURE}"
+    )
+
+
+def test_tc3_sign_matches_sdk():
+    """默认签名的请求头与SDK的签名实现结果一致"""
+    payload = b'{"AppName":"live","DomainName":"test.com","StreamName":"s1"}'
+    timestamp = 1760659200
+    authorization = tc3_sign(
+        "AKIDtest", "secret", "live", "live.tencentcloudapi.com", "DescribeLiveStreamState", payload, timestamp
+    )
+
+    canonical_request = (
+        "POST\n/\n\ncontent-type:application/json\nhost:live.tencentcloudapi.com\n"
+        "x-tc-action:describelivestreamstate\n\ncontent-type;host;x-tc-action\n"
+        + hashlib.sha256(payload).hexdigest()
+    )
+    string_to_sign = (
+        f"{TC3_ALGORITHM}\n{timestamp}\n2025-10-17/live/tc3_request\n"
+        + hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+    )
+    expected = Sign.sign_tc3("secret", "2025-10-17", "live", string_to_sign)
+    assert authorization.endswith(f"Signature={expected}")
+    assert "Credential=AKIDtest/2025-10-17/live/tc3_request" in authorization
+
+
+def test_tc3_sign_uses_utc_date():
+    """凭证范围的日期按UTC计算"""
+    timestamp = int(datetime(2026, 1, 1, 23, 30, tzinfo=timezone.utc).timestamp())
+    authorization = tc3_sign("id", "key", "live", "host", "Action", b"{}", timestamp)
+    assert "/2026-01-01/live/tc3_request" in authorization
+
+
+def test_tc3_signing_key_is_cached_per_date():
+    """派生密钥按(密钥, 日期, 服务)缓存"""
+    tc3_signing_key.cache_clear()
+    first = tc3_signing_key("key", "2026-10-17", "live")
+    assert tc3_signing_key("key", "2026-10-17", "live") is first
+    assert tc3_signing_key("key", "2026-10-18", "live") != first
+    assert tc3_signing_key.cache_info().hits == 1
+
+
+SECRET_ID = "AKIDtest"
+SECRET_KEY = "test-secret"
+
+
+@pytest.fixture
+def live_config(monkeypatch):
+    """客户端使用测试凭证，经HTTP访问本地服务"""
+    monkeypatch.setattr(config, "SECRET_ID", SECRET_ID)
+    monkeypatch.setattr(config, "SECRET_KEY", SECRET_KEY)
+    monkeypatch.setattr(config, "API_SCHEME", "http")
+
+
+def _call(coro_factory):
+    async def run():
+        try:
+            return await coro_factory()
+        finally:
+            await close_http_pools()
+
+    return asyncio.run(run())
+
+
+class _BadGatewayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = b"bad gateway"
+        self.send_response(502)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+def test_round_trip_through_mock_server(live_config):
+    """请求头和规范请求与桩服务独立实现的签名校验一致"""
+    stub = MockLiveServer(secret_key=SECRET_KEY).start()
+    try:
+        client = AsyncTencentCloudClient("live", "2018-08-01", stub.endpoint, region="ap-guangzhou")
+        headers, payload = client._build_request("DescribeLiveStreamState", {"StreamName": "s1"})
+        assert headers["Host"] == stub.endpoint
+        assert headers["X-TC-Action"] == "DescribeLiveStreamState"
+        assert headers["X-TC-Version"] == "2018-08-01"
+        assert headers["X-TC-Region"] == "ap-guangzhou"
+        assert f"Credential={SECRET_ID}/" in headers["Authorization"]
+        assert stub.verify_signature("POST", headers, payload)
+
+        result = _call(lambda: client.call_api("DescribeLiveStreamState", {"StreamName": "s1"}))
+        assert result["Response"]["StreamState"] == "active"
+        assert stub.signature_failures == 0
+        assert stub.action_counts == {"DescribeLiveStreamState": 1}
+    finally:
+        stub.stop()
+
+
+def test_signature_mismatch_is_rejected(live_config):
+    """密钥不一致时桩服务拒绝请求，错误码原样抛出"""
+    stub = MockLiveServer(secret_key="other-secret").start()
+    try:
+        client = AsyncTencentCloudClient("live", "2018-08-01", stub.endpoint)
+        with pytest.raises(TencentCloudSDKException) as excinfo:
+            _call(lambda: client._request("DescribeLiveStreamState", {"StreamName": "s1"}))
+        assert excinfo.value.get_code() == "AuthFailure.SignatureFailure"
+        assert stub.signature_failures == 1
+    finally:
+        stub.stop()
+
+
+def test_non_200_maps_to_server_network_error(live_config):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _BadGatewayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = AsyncTencentCloudClient("live", "2018-08-01", "127.0.0.1:%d" % server.server_address[1])
+        with pytest.raises(TencentCloudSDKException) as excinfo:
+            _call(lambda: client._request("DescribeLiveStreamState", {}))
+        assert excinfo.value.get_code() == "ServerNetworkError"
+        assert "bad gateway" in excinfo.value.get_message()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_transport_error_maps_to_client_network_error(live_config):
+    # 取一个随即释放的端口，连接会被拒绝
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    client = AsyncTencentCloudClient("live", "2018-08-01", f"127.0.0.1:{port}")
+    with pytest.raises(TencentCloudSDKException) as excinfo:
+        _call(lambda: client._request("DescribeLiveStreamState", {}))
+    assert excinfo.value.get_code() == "ClientNetworkError"
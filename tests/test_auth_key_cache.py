@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_auth_key_cache.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 鉴权key缓存测试
+"""
+
+import asyncio
+import os
+import stat
+import time
+
+from tools import auth_key_cache as auth_key_module
+from tools.auth_key_cache import AuthKeyCache, PUSH_ACTION
+from utils.disk_cache import DiskCache
+
+
+class FakeLiveClient:
+    """记录调用次数的鉴权key查询"""
+
+    calls = 0
+
+    async def describe_live_push_auth_key(self, domain_name):
+        FakeLiveClient.calls += 1
+        return {"Response": {"PushAuthKeyInfo": {"DomainName": domain_name, "MasterAuthKey": "k"}}}
+
+    async def describe_live_play_auth_key(self, domain_name):
+        FakeLiveClient.calls += 1
+        return {"Response": {"PlayAuthKeyInfo": {"DomainName": domain_name, "AuthKey": "k"}}}
+
+
+def _fake_client(monkeypatch):
+    FakeLiveClient.calls = 0
+    monkeypatch.setattr(auth_key_module, "ThreadedLiveClient", FakeLiveClient)
+
+
+def test_new_process_reads_auth_key_from_disk(monkeypatch, tmp_path):
+    _fake_client(monkeypatch)
+    path = str(tmp_path / "cache.sqlite3")
+    first = AuthKeyCache(ttl=60, maxsize=10, disk=DiskCache(path))
+    asyncio.run(first.get_push_auth_key("push.example.com"))
+    assert FakeLiveClient.calls == 1
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+    # 模拟新启动的进程：内存为空，共用同一个数据库
+    second = AuthKeyCache(ttl=60, maxsize=10, disk=DiskCache(path))
+    result = asyncio.run(second.get_push_auth_key("push.example.com"))
+    assert FakeLiveClient.calls == 1
+    assert result["Response"]["PushAuthKeyInfo"]["MasterAuthKey"] == "k"
+    assert second.stats()["disk_hits"] == 1
+
+
+def test_disk_hit_keeps_remaining_ttl(monkeypatch, tmp_path):
+    _fake_client(monkeypatch)
+    disk = DiskCache(str(tmp_path / "cache.sqlite3"))
+    cache = AuthKeyCache(ttl=60, maxsize=10, disk=disk)
+    disk.set(cache._disk_key(PUSH_ACTION, "push.example.com"), PUSH_ACTION, {"Response": {}}, ttl=5)
+
+    asyncio.run(cache.get_push_auth_key("push.example.com"))
+    assert FakeLiveClient.calls == 0
+    _, expires_at = cache.push_keys._data["push.example.com"]
+    assert expires_at - time.monotonic() <= 5
+
+
+def test_invalidate_clears_memory_and_disk(monkeypatch, tmp_path):
+    _fake_client(monkeypatch)
+    path = str(tmp_path / "cache.sqlite3")
+    cache = AuthKeyCache(ttl=60, maxsize=10, disk=DiskCache(path))
+
+    async def run():
+        await cache.get_push_auth_key("push.example.com")
+        await cache.get_play_auth_key("play.example.com")
+        await cache.invalidate("push.example.com")
+        await cache.get_push_auth_key("push.example.com")
+        await cache.get_play_auth_key("play.example.com")
+        await cache.invalidate()
+
+    asyncio.run(run())
+    # 按域名失效只重新查询该域名，其余仍命中
+    assert FakeLiveClient.calls == 3
+    disk = DiskCache(path)
+    assert disk.get(cache._disk_key(PUSH_ACTION, "push.example.com")) is None
+    assert cache.push_keys.stats()["size"] == 0
+    assert cache.play_keys.stats()["size"] == 0
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_circuit_breaker.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 熔断器状态转换测试
+"""
+
+import pytest
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+from utils import circuit_breaker
+from utils.circuit_breaker import CIRCUIT_OPEN_CODE, CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class FakeClock:
+    """可手动推进的单调时钟"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake)
+    return fake
+
+
+def call(breaker: CircuitBreaker, code=None) -> None:
+    """通过熔断器执行一次调用，code不为空时以该错误码失败"""
+    with breaker.guard():
+        if code:
+            raise TencentCloudSDKException(code, "error")
+
+
+def fail(breaker: CircuitBreaker, code: str = "InternalError") -> str:
+    """执行一次失败的调用，返回抛出的错误码"""
+    with pytest.raises(TencentCloudSDKException) as info:
+        call(breaker, code)
+    return info.value.get_code()
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        fail(breaker)
+    assert breaker.state == OPEN
+
+
+def test_opens_after_consecutive_transient_failures(clock):  # pylint: disable=unused-argument
+    breaker = CircuitBreaker("live", failure_threshold=3, recovery_timeout=10)
+    fail(breaker)
+    fail(breaker)
+    assert breaker.state == CLOSED
+    fail(breaker, "ResourceUnavailable.Busy")
+    assert breaker.state == OPEN
+    assert fail(breaker) == CIRCUIT_OPEN_CODE
+    snapshot = breaker.snapshot()
+    assert snapshot["rejected"] == 1
+    assert snapshot["open_remaining_seconds"] == 10
+
+
+def test_success_and_business_errors_reset_failure_count(clock):  # pylint: disable=unused-argument
+    breaker = CircuitBreaker("live", failure_threshold=2, recovery_timeout=10)
+    fail(breaker)
+    call(breaker)
+    fail(breaker)
+    assert breaker.state == CLOSED
+    # 参数错误说明上游可用，不计为故障
+    fail(breaker, "InvalidParameter")
+    fail(breaker)
+    assert breaker.state == CLOSED
+    assert breaker.snapshot()["consecutive_failures"] == 1
+
+
+def test_half_open_after_recovery_timeout_and_probe_success_closes(clock):
+    breaker = CircuitBreaker("live", failure_threshold=1, recovery_timeout=10)
+    open_breaker(breaker)
+    clock.now += 9.9
+    assert fail(breaker) == CIRCUIT_OPEN_CODE
+    clock.now += 0.1
+    assert breaker.state == HALF_OPEN
+    call(breaker)
+    assert breaker.state == CLOSED
+    call(breaker)
+
+
+def test_probe_failure_reopens(clock):
+    breaker = CircuitBreaker("live", failure_threshold=3, recovery_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    # 半开状态下一次探测失败就重新熔断，并重新计算恢复期
+    assert fail(breaker) == "InternalError"
+    assert breaker.state == OPEN
+    clock.now += 5
+    assert fail(breaker) == CIRCUIT_OPEN_CODE
+    clock.now += 5
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_limits_concurrent_probes(clock):
+    breaker = CircuitBreaker("live", failure_threshold=1, recovery_timeout=10, half_open_max_calls=1)
+    open_breaker(breaker)
+    clock.now += 10
+    with breaker.guard():
+        assert fail(breaker) == CIRCUIT_OPEN_CODE
+    assert breaker.state == CLOSED
+
+
+def test_cancelled_probe_returns_slot(clock):
+    breaker = CircuitBreaker("live", failure_threshold=1, recovery_timeout=10)
+    open_breaker(breaker)
+    clock.now += 10
+    with pytest.raises(KeyboardInterrupt):
+        with breaker.guard():
+            raise KeyboardInterrupt
+    assert breaker.state == HALF_OPEN
+    call(breaker)
+    assert breaker.state == CLOSED
+
+
+def test_zero_threshold_disables_breaker(clock):  # pylint: disable=unused-argument
+    breaker = CircuitBreaker("live", failure_threshold=0)
+    for _ in range(10):
+        fail(breaker)
+    assert breaker.state == CLOSED
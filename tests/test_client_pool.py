@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_client_pool.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 客户端注册表测试
+"""
+
+import threading
+import time
+
+from utils.client_pool import ClientPool
+
+
+class FakeClient:
+    """记录是否被关闭"""
+
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_factory_runs_outside_the_lock():
+    """一个键创建较慢时不阻塞其他键"""
+    pool = ClientPool(idle_timeout=0, max_size=8)
+    started = threading.Event()
+
+    def slow_factory():
+        started.set()
+        time.sleep(0.5)
+        return FakeClient("slow")
+
+    thread = threading.Thread(target=pool.get, args=("slow", slow_factory))
+    thread.start()
+    started.wait()
+    start = time.monotonic()
+    assert pool.get("fast", lambda: FakeClient("fast")).name == "fast"
+    assert time.monotonic() - start < 0.2
+    thread.join()
+
+
+def test_concurrent_creation_keeps_one_client():
+    """同一键并发创建时都拿到先写入的客户端，多创建的客户端被关闭"""
+    pool = ClientPool(idle_timeout=0, max_size=8)
+    barrier = threading.Barrier(4)
+    created = []
+    results = []
+
+    def factory():
+        client = FakeClient(len(created))
+        created.append(client)
+        barrier.wait()
+        return client
+
+    threads = [threading.Thread(target=lambda: results.append(pool.get("key", factory))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(client) for client in results}) == 1
+    assert sum(1 for client in created if client.closed) == 3
+    assert not results[0].closed
+
+
+def test_evicted_clients_are_closed():
+    pool = ClientPool(idle_timeout=0, max_size=2)
+    clients = [pool.get(i, lambda i=i: FakeClient(i)) for i in range(3)]
+    assert [client.closed for client in clients] == [True, False, False]
+
+    pool.invalidate()
+    assert all(client.closed for client in clients)
+    assert pool.stats()["evictions"] == 1
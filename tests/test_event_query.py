@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_event_query.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 推断流事件查询和同步测试
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from tools import event_store as event_store_module
+from tools.event_query import EVENT_RECORDS_MAX, EVENT_WINDOW_MIN, EventQuery, parse_time
+from tools.event_store import EventStore
+
+
+class HotMinuteClient:
+    """包含hot的子窗口总是超过可翻页条数，其余子窗口没有事件"""
+
+    def __init__(self, hot: datetime):
+        self.hot = hot
+
+    async def describe_live_stream_event_list(self, start_time, end_time, page_num=1, **kwargs):
+        if parse_time(start_time) <= self.hot < parse_time(end_time):
+            return {"Response": {"TotalNum": EVENT_RECORDS_MAX * 2, "TotalPage": 200, "EventList": []}}
+        return {"Response": {"TotalNum": 0, "TotalPage": 1, "EventList": []}}
+
+
+def test_fetch_window_marks_truncated_minute():
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    query = EventQuery(client=HotMinuteClient(start + timedelta(seconds=30)))
+    asyncio.run(query.fetch_window(start, start + 2 * EVENT_WINDOW_MIN))
+    assert query.truncated
+    assert query.truncated_windows == [(start, start + EVENT_WINDOW_MIN)]
+
+
+def test_sync_keeps_high_water_before_truncated_window(monkeypatch, tmp_path):
+    hot = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(hours=1)
+    client = HotMinuteClient(hot)
+    monkeypatch.setattr(
+        event_store_module, "EventQuery", lambda domain_name=None: EventQuery(domain_name=domain_name, client=client)
+    )
+    store = EventStore(str(tmp_path / "events.sqlite3"))
+    try:
+        result = asyncio.run(store.sync())
+        assert result["Truncated"]
+        assert parse_time(store.get_high_water("")) <= hot
+    finally:
+        store.close()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_fixtures.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 录制回放测试
+"""
+
+import gzip
+import json
+
+import pytest
+
+from utils.fixtures import RECORD, REPLAY, FixtureStore
+
+
+@pytest.mark.parametrize("name", ["live.jsonl", "live.jsonl.gz"])
+def test_record_is_readable_before_close(tmp_path, name):
+    path = str(tmp_path / name)
+    store = FixtureStore(RECORD, path)
+    store.record("DescribeLiveDomains", {"PageNum": 1}, "", 0.01, response={"Response": {"RequestId": "1"}})
+    # 未关闭时其他进程也能读到已录制的记录
+    if name.endswith(".gz"):
+        with open(path, "rb") as f:
+            text = gzip.GzipFile(fileobj=f).read1().decode("utf-8")  # pylint: disable=no-member
+    else:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    assert json.loads(text.splitlines()[0])["a"] == "DescribeLiveDomains"
+    store.close()
+
+
+def test_replay_recorded_response(tmp_path):
+    path = str(tmp_path / "live.jsonl")
+    store = FixtureStore(RECORD, path)
+    store.record("DescribeLiveDomains", {"PageNum": 1}, "", 0.01, response={"Response": {"RequestId": "1"}})
+    store.close()
+    replay = FixtureStore(REPLAY, path, time_scale=0)
+    assert replay.replay("DescribeLiveDomains", {"PageNum": 1}, "")["Response"]["RequestId"] == "1"
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_http_pool.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 异步连接池测试，本地asyncio服务按用例返回响应、断开或不响应
+"""
+
+import asyncio
+
+import pytest
+
+from utils.http_pool import create_pool
+
+
+async def _serve(handler):
+    """启动本地服务，返回(服务, 收到的请求列表, 连接数统计)"""
+    requests = []
+    connections = [0]
+
+    async def on_connect(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connections[0] += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode("latin-1").split("\r\n"):
+                    name, _, value = line.partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                body = await reader.readexactly(length)
+                requests.append(body)
+                if not await handler(writer):
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(on_connect, "127.0.0.1", 0)
+    return server, requests, connections
+
+
+def _endpoint(server) -> str:
+    return f"127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+
+def _response(body: bytes, status: bytes = b"200 OK") -> bytes:
+    return b"HTTP/1.1 " + status + b"\r\nContent-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+
+
+def test_post_reuses_connection_and_skips_informational_response():
+    """跳过1xx响应，长连接上连续发送多个请求"""
+    async def handler(writer):
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n" + _response(b'{"Response":{}}'))
+        await writer.drain()
+        return True
+
+    async def run():
+        server, requests, connections = await _serve(handler)
+        pool = create_pool("http", _endpoint(server), timeout=5)
+        try:
+            for i in range(3):
+                response = await pool.post("/", {"Content-Type": "application/json"}, b'{"i":%d}' % i)
+                assert response.status == 200
+                assert response.body == b'{"Response":{}}'
+        finally:
+            await pool.aclose()
+            server.close()
+        return requests, connections[0]
+
+    requests, connections = asyncio.run(run())
+    assert requests == [b'{"i":0}', b'{"i":1}', b'{"i":2}']
+    assert connections == 1
+
+
+def test_post_not_resent_after_connection_dropped():
+    """请求发出后连接断开时直接报错，不在传输层重发"""
+    async def handler(writer):
+        return False
+
+    async def run():
+        server, requests, _ = await _serve(handler)
+        pool = create_pool("http", _endpoint(server), timeout=5)
+        try:
+            with pytest.raises(OSError):
+                await pool.post("/", {}, b'{"Action":"AddLiveDomain"}')
+        finally:
+            await pool.aclose()
+            server.close()
+        return requests
+
+    assert asyncio.run(run()) == [b'{"Action":"AddLiveDomain"}']
+
+
+def test_post_times_out():
+    """服务端不响应时按超时报错"""
+    async def handler(writer):
+        await asyncio.sleep(10)
+        return False
+
+    async def run():
+        server, _, _ = await _serve(handler)
+        pool = create_pool("http", _endpoint(server), timeout=0.2)
+        try:
+            with pytest.raises(OSError):
+                await pool.post("/", {}, b"{}")
+        finally:
+            await pool.aclose()
+            server.close()
+
+    asyncio.run(run())
+
+
+def test_pool_closed_after_aclose():
+    """关闭后is_closed为真，由get_http_pool重新创建"""
+    async def run():
+        pool = create_pool("http", "127.0.0.1:1", max_connections=25)
+        assert not pool.is_closed
+        await pool.aclose()
+        return pool.is_closed
+
+    assert asyncio.run(run())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_http_server.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : HTTP传输优雅退出测试
+"""
+
+import asyncio
+import os
+import signal
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+from utils.http_server import ToolCallTracker, drain_on_signal
+
+
+def build_mcp(release: asyncio.Event) -> FastMCP:
+    mcp = FastMCP("test")
+
+    @mcp.tool()
+    async def slow() -> str:
+        await release.wait()
+        return "done"
+
+    return mcp
+
+
+def test_drain_waits_for_active_calls_and_rejects_new_ones(monkeypatch):
+    forwarded = []
+
+    async def run():
+        release = asyncio.Event()
+        mcp = build_mcp(release)
+        tracker = ToolCallTracker()
+        tracker.attach(mcp)
+        monkeypatch.setattr(signal, "raise_signal", forwarded.append)
+        previous = signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            with drain_on_signal(tracker, timeout=5):
+                call = asyncio.ensure_future(mcp.call_tool("slow", {}))
+                await asyncio.sleep(0.01)
+                os.kill(os.getpid(), signal.SIGTERM)
+                await asyncio.sleep(0.01)
+                assert tracker.draining
+                with pytest.raises(ToolError):
+                    await mcp.call_tool("slow", {})
+                assert not forwarded
+                release.set()
+                await call
+                for _ in range(100):
+                    if forwarded:
+                        break
+                    await asyncio.sleep(0.01)
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+
+    asyncio.run(run())
+    assert forwarded == [signal.SIGTERM]
+
+
+def test_wait_idle_times_out():
+    async def run():
+        tracker = ToolCallTracker()
+        tracker._enter()  # pylint: disable=protected-access
+        assert not await tracker.wait_idle(0.01)
+        tracker._exit()  # pylint: disable=protected-access
+        assert await tracker.wait_idle(0.01)
+
+    asyncio.run(run())
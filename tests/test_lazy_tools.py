@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_lazy_tools.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 延迟注册工具测试
+"""
+
+import asyncio
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ToolAnnotations
+
+from utils.lazy_tools import LazyToolManager, defer_tool_registration
+
+
+def test_tools_built_on_first_use_with_all_attributes():
+    mcp = FastMCP("test")
+    defer_tool_registration(mcp)
+
+    @mcp.tool(description="查询", annotations=ToolAnnotations(readOnlyHint=True))
+    async def describe(name: str) -> str:
+        return name
+
+    @mcp.tool()
+    async def drop() -> str:
+        return "ok"
+
+    manager = mcp._tool_manager  # pylint: disable=protected-access
+    assert isinstance(manager, LazyToolManager)
+    assert manager.pending == 2
+    assert asyncio.run(mcp.call_tool("describe", {"name": "live"}))[0].text == "live"
+    assert manager.pending == 1
+    tools = asyncio.run(mcp.list_tools())
+    assert [tool.name for tool in tools] == ["describe", "drop"]
+    assert tools[0].description == "查询"
+    assert tools[0].annotations.readOnlyHint is True
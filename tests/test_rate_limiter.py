@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_rate_limiter.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 令牌桶限流测试
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import executor, rate_limiter as rate_limiter_module, tencent_client
+from utils.rate_limiter import RateLimiter, TokenBucket, parse_rate_limits
+from utils.tencent_client import TencentCloudClient
+
+
+class FakeClock:
+    """可手动推进的单调时钟"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter_module.time, "monotonic", fake)
+    return fake
+
+
+def test_bucket_allows_burst_then_queues_in_order(clock):  # pylint: disable=unused-argument
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # 令牌数可以为负，后续请求依次排在前一个之后
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+
+def test_bucket_refills_up_to_burst(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+    bucket.reserve()
+    bucket.reserve()
+    clock.now += 0.1
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == [0, 0, pytest.approx(0.1)]
+
+
+def test_bucket_burst_defaults_to_rate_and_at_least_one(clock):  # pylint: disable=unused-argument
+    assert TokenBucket(rate=5).burst == 5
+    slow = TokenBucket(rate=0.5)
+    assert slow.burst == 1
+    assert slow.reserve() == 0
+    assert slow.reserve() == pytest.approx(2)
+
+
+def test_limiter_per_action_rates_and_unlimited_default(clock):  # pylint: disable=unused-argument
+    limiter = RateLimiter(default_rate=0, limits={"DropLiveStream": 1})
+    assert [limiter.reserve("DescribeLiveDomains") for _ in range(5)] == [0] * 5
+    assert limiter.reserve("DropLiveStream") == 0
+    assert limiter.reserve("DropLiveStream") == pytest.approx(1)
+    stats = limiter.stats()
+    assert stats["DropLiveStream"]["waited"] == 1
+    assert stats["DescribeLiveDomains"]["rate"] == 0
+
+
+def test_limiter_scope_separates_regions(clock):  # pylint: disable=unused-argument
+    limiter = RateLimiter(default_rate=1, scope=("action", "region"))
+    assert limiter.reserve("A", "ap-guangzhou") == 0
+    assert limiter.reserve("A", "ap-beijing") == 0
+    assert limiter.reserve("A", "ap-guangzhou") == pytest.approx(1)
+
+
+def test_limiter_partition_divides_rates(clock):  # pylint: disable=unused-argument
+    limiter = RateLimiter(default_rate=4, limits={"B": 2})
+    limiter.partition(2)
+    assert limiter.default_rate == 2
+    assert limiter.limits == {"B": 1}
+
+
+def test_limiter_rejects_scope_without_action():
+    with pytest.raises(ValueError):
+        RateLimiter(default_rate=1, scope=("region",))
+
+
+def test_parse_rate_limits():
+    assert parse_rate_limits(" DropLiveStream=50, DescribeLiveDomains=0.5 ,") == {
+        "DropLiveStream": 50.0,
+        "DescribeLiveDomains": 0.5,
+    }
+    with pytest.raises(ValueError):
+        parse_rate_limits("DropLiveStream")
+
+
+def test_throttled_call_does_not_hold_executor_worker(monkeypatch):
+    """排队等待配额的调用在事件循环中等待，不占用线程池，其他操作照常执行"""
+    monkeypatch.setattr(TencentCloudClient, "_create_client", lambda self: None)
+    monkeypatch.setattr(
+        TencentCloudClient, "_attempt", lambda self, action, params: {"Response": {"RequestId": action}}
+    )
+    monkeypatch.setattr(tencent_client, "rate_limiter", RateLimiter(default_rate=0, limits={"DropLiveStream": 2}))
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(executor, "_executor", pool)
+    client = TencentCloudClient("live", "2018-08-01", "live.example.com")
+
+    async def run():
+        finished = {}
+
+        async def call(action: str, index: int):
+            await client.async_call_api(action, {"Index": index})
+            finished[(action, index)] = time.perf_counter()
+
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(call("DropLiveStream", i) for i in range(3)),
+            call("ResumeLiveStream", 0)
+        )
+        return {key: value - start for key, value in finished.items()}
+
+    try:
+        elapsed = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    # 第三个DropLiveStream等待约1秒，期间唯一的工作线程仍可执行其他操作
+    assert elapsed[("ResumeLiveStream", 0)] < 0.3
+    assert max(elapsed[("DropLiveStream", i)] for i in range(3)) >= 0.4
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_redaction.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 日志脱敏测试
+"""
+
+import logging
+
+import pytest
+
+from utils.redaction import RedactionFilter, redact_text
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("{'MasterAuthKey': 'abcdef', 'SecretKey': 'qq'}", "{'MasterAuthKey': '***', 'SecretKey': '***'}"),
+    ('{"AuthKey":"abc","txSecret":"deadbeef"}', '{"AuthKey":"***","txSecret":"***"}'),
+    ("rtmp://push.example.com/live/s?txSecret=abc&txTime=6A1B", "rtmp://push.example.com/live/s?txSecret=***&txTime=6A1B"),
+    ("backup_auth_key=xyz password: hunter2", "backup_auth_key=*** password: ***"),
+    ("SecretId AKIDabcdefgh12345678", "SecretId AKID***5678"),
+    # 格式化占位符不是密钥
+    ("sign=%s", "sign=%s"),
+    ("查询流状态: stream_name=live", "查询流状态: stream_name=live"),
+])
+def test_redact_text(text, expected):
+    assert redact_text(text) == expected
+
+
+def test_redact_text_truncates_with_digest():
+    text = redact_text("x" * 100, max_length=10)
+    assert text.startswith("x" * 10 + "...(共100字符, sha256:")
+
+
+def format_record(msg, *args, max_length=2048):
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, msg, args, None)
+    RedactionFilter(max_length=max_length).filter(record)
+    return record.getMessage()
+
+
+def test_filter_redacts_dict_fields_and_strings():
+    params = {"DomainName": "play.example.com", "MasterAuthKey": "abc", "Urls": ["a?txSecret=1&t=2"] * 20}
+    message = format_record("调用API: %s", params)
+    assert "abc" not in message and "txSecret=1" not in message
+    assert "'MasterAuthKey': '***'" in message
+    assert "...(共20项)" in message
+    assert params["MasterAuthKey"] == "abc"
+
+
+def test_filter_redacts_other_objects():
+    error = ValueError("{'AuthKey': 'abc'} rejected")
+    assert format_record("调用失败: %s", error) == "调用失败: {'AuthKey': '***'} rejected"
+
+
+def test_filter_keeps_repr_format():
+    assert format_record("%r", "AuthKey=abc") == "'AuthKey=***'"
+    assert format_record("%r %s", "live", 3) == "'live' 3"
+    assert format_record("%r", {"SecretKey": "x"}) == "{'SecretKey': '***'}"
+
+
+def test_filter_truncates_long_arguments():
+    message = format_record("%s", {"Items": list(range(5))}, max_length=8)
+    assert message.startswith("{'Items'...(共")
+    assert format_record("%(Items)s", {"Items": "a?sign=1"}) == "a?sign=***"
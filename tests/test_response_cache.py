@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_response_cache.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 查询缓存测试
+"""
+
+import asyncio
+import threading
+import time
+
+from utils.disk_cache import DiskCache
+from utils.response_cache import ResponseCache
+
+
+class SlowDisk(DiskCache):
+    """每次读写都像等待其他进程的写锁一样阻塞"""
+
+    def __init__(self, path: str, delay: float):
+        super().__init__(path)
+        self.delay = delay
+        self.threads = set()
+
+    def get(self, key):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        return super().get(key)
+
+    def set(self, key, action, value, ttl, stale_ttl=0.0):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        super().set(key, action, value, ttl, stale_ttl)
+
+    def invalidate(self, actions=None):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        super().invalidate(actions)
+
+
+def test_async_path_keeps_disk_io_off_the_event_loop(tmp_path):
+    disk = SlowDisk(str(tmp_path / "cache.sqlite3"), delay=0.2)
+    cache = ResponseCache({"DescribeLiveDomains": 60}, disk=disk)
+
+    async def fetch():
+        return {"Response": {"DomainList": ["a"]}}
+
+    async def run():
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticking = asyncio.ensure_future(ticker())
+        started = time.perf_counter()
+        value = await cache.get_or_fetch_async(("k",), "DescribeLiveDomains", fetch)
+        await cache.invalidate_async(("DescribeLiveDomains",))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await ticking
+        return value, ticks, elapsed, threading.get_ident()
+
+    value, ticks, elapsed, loop_thread = asyncio.run(run())
+    assert value == {"Response": {"DomainList": ["a"]}}
+    # 读取和失效各阻塞0.2秒，期间事件循环仍在调度其他协程
+    assert elapsed >= 0.4
+    assert ticks >= 20
+    assert loop_thread not in disk.threads
+
+
+def test_async_store_written_to_disk_in_background(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache({"DescribeLiveDomains": 60}, disk=DiskCache(path))
+
+    async def fetch():
+        return {"Response": {"TotalNum": 1}}
+
+    asyncio.run(cache.get_or_fetch_async(("k",), "DescribeLiveDomains", fetch))
+    # 新进程的缓存直接从磁盘命中，不调用上游
+    deadline = time.monotonic() + 5
+    while DiskCache(path).get(DiskCache.encode_key(("k",))) is None:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    other = ResponseCache({"DescribeLiveDomains": 60}, disk=DiskCache(path))
+    assert other.get_or_fetch(("k",), "DescribeLiveDomains", lambda: None) == {"Response": {"TotalNum": 1}}
+    assert other.stats()["disk_hits"] == 1
+
+
+def test_invalidate_clears_other_process_entries(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = ResponseCache({"DescribeLiveDomains": 60}, disk=DiskCache(path))
+    cache.get_or_fetch(("k",), "DescribeLiveDomains", lambda: {"v": 1})
+    cache.invalidate(("DescribeLiveDomains",))
+    other = ResponseCache({"DescribeLiveDomains": 60}, disk=DiskCache(path))
+    assert other.get_or_fetch(("k",), "DescribeLiveDomains", lambda: {"v": 2}) == {"v": 2}
+
+
+def test_memory_bounded_by_serialized_bytes():
+    """超出字节数上限时淘汰最久未使用的条目，单个过大的响应不缓存在内存中"""
+    cache = ResponseCache({"DescribeLiveDomains": 60}, max_entries=100, max_bytes=200)
+    calls = []
+
+    def fetch(size):
+        calls.append(size)
+        return {"Data": "x" * size}
+
+    for i in range(3):
+        cache.get_or_fetch(("domains", i), "DescribeLiveDomains", lambda: fetch(80))
+    stats = cache.stats()
+    assert stats["size"] == 2
+    assert stats["bytes"] <= 200
+
+    cache.get_or_fetch(("domains", "big"), "DescribeLiveDomains", lambda: fetch(500))
+    cache.get_or_fetch(("domains", "big"), "DescribeLiveDomains", lambda: fetch(500))
+    assert calls.count(500) == 2
+    assert cache.stats()["size"] == 2
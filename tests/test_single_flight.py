@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_single_flight.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 请求合并测试
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from tencentcloud.common.exception.tencent_cloud_sdk_exception import TencentCloudSDKException
+
+from utils.single_flight import SingleFlight
+
+
+def run_concurrently(flight: SingleFlight, func, callers: int = 4):
+    """多个线程用同一个键调用do，等全部跟随方加入后再让func返回，返回各调用方的结果或异常"""
+    release = threading.Event()
+    calls = []
+
+    def leader_func():
+        calls.append(1)
+        release.wait(5)
+        return func()
+
+    def one():
+        try:
+            return flight.do("key", leader_func)
+        except BaseException as e:  # pylint: disable=broad-except
+            return e
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        futures = [pool.submit(one) for _ in range(callers)]
+        while flight.stats()["coalesced"] < callers - 1:
+            threading.Event().wait(0.001)
+        release.set()
+        results = [future.result() for future in futures]
+    return results, len(calls)
+
+
+def test_error_propagates_to_every_caller():
+    flight = SingleFlight()
+    error = TencentCloudSDKException("InternalError", "boom")
+
+    def fail():
+        raise error
+
+    results, calls = run_concurrently(flight, fail)
+    assert calls == 1
+    assert all(result is error for result in results)
+
+
+def test_key_released_after_error():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        flight.do("key", fail)
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.stats()["upstream_requests"] == 2
+
+
+def test_followers_get_independent_copies():
+    flight = SingleFlight()
+    results, calls = run_concurrently(flight, lambda: {"items": [1]})
+    assert calls == 1
+    results[0]["items"].append(2)
+    assert all(result == {"items": [1]} for result in results[1:])
+
+
+def test_async_error_propagates_to_every_caller():
+    flight = SingleFlight()
+    calls = []
+
+    async def fail():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise TencentCloudSDKException("InternalError", "boom")
+
+    async def run():
+        results = await asyncio.gather(*(flight.do_async("key", fail) for _ in range(4)), return_exceptions=True)
+        # 出错后键已释放，下一次调用重新发起
+        results.append(await flight.do_async("key", lambda: asyncio.sleep(0, "ok")))
+        return results
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(isinstance(result, TencentCloudSDKException) for result in results[:4])
+    assert results[4] == "ok"
+
+
+def test_async_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        raise RuntimeError("boom")
+
+    async def run():
+        first = asyncio.ensure_future(flight.do_async("key", slow))
+        second = asyncio.ensure_future(flight.do_async("key", slow))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(RuntimeError):
+            await second
+        assert first.cancelled()
+
+    asyncio.run(run())
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_ttl_cache.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : TTL缓存测试
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from utils import ttl_cache
+from utils.ttl_cache import TTLCache
+
+
+class FakeClock:
+    """可手动推进的单调时钟"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def wait_until(predicate, timeout: float = 5) -> None:
+    """等待条件成立，超时则测试失败"""
+    deadline = time.perf_counter() + timeout
+    while not predicate():
+        assert time.perf_counter() < deadline, "等待超时"
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ttl_cache.time, "monotonic", fake)
+    return fake
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = TTLCache(ttl=10)
+    cache.set("a", 1)
+    clock.now += 9.9
+    assert cache.get("a") == 1
+    clock.now += 0.1
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_per_entry_ttl(clock):
+    cache = TTLCache(ttl=10)
+    cache.set("short", 1, ttl=1)
+    cache.set("long", 2)
+    clock.now += 2
+    assert cache.get("short") is None
+    assert cache.get("long") == 2
+
+
+def test_evicts_least_recently_used(clock):  # pylint: disable=unused-argument
+    cache = TTLCache(ttl=10, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_get_or_load_reloads_after_expiry(clock):
+    cache = TTLCache(ttl=10)
+    calls = []
+    assert cache.get_or_load("a", lambda: calls.append(1) or len(calls)) == 1
+    assert cache.get_or_load("a", lambda: calls.append(1) or len(calls)) == 1
+    clock.now += 10
+    assert cache.get_or_load("a", lambda: calls.append(1) or len(calls)) == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_concurrent_misses_load_once():
+    cache = TTLCache(ttl=10)
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(5)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    wait_until(lambda: cache.stats()["coalesced"] == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == ["value"] * 5
+    assert len(calls) == 1
+
+
+def test_load_error_propagates_to_waiters_and_is_not_cached():
+    cache = TTLCache(ttl=10)
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_load("k", failing)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    wait_until(lambda: cache.stats()["coalesced"] == 1)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+    assert [str(e) for e in errors] == ["boom", "boom"]
+    assert cache.get_or_load("k", lambda: "ok") == "ok"
+
+
+def test_invalidate_during_load_discards_result():
+    cache = TTLCache(ttl=10)
+
+    def loader():
+        cache.invalidate("k")
+        return "stale"
+
+    assert cache.get_or_load("k", loader) == "stale"
+    assert cache.get("k") is None
+
+
+def test_async_concurrent_misses_load_once():
+    cache = TTLCache(ttl=10)
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"AuthKey": "k"}
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load_async("play.example.com", loader) for _ in range(8)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result == {"AuthKey": "k"} for result in results)
+    assert asyncio.run(cache.get_or_load_async("play.example.com", loader)) == {"AuthKey": "k"}
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1, "coalesced": 7}
+
+
+def test_async_error_propagates_and_is_not_cached():
+    cache = TTLCache(ttl=10)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_load_async("a", fail) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in asyncio.run(run()))
+    assert cache.stats()["size"] == 0
+
+    async def ok():
+        return 1
+
+    assert asyncio.run(cache.get_or_load_async("a", ok)) == 1
+
+
+def test_async_cancelled_caller_does_not_cancel_load():
+    cache = TTLCache(ttl=10)
+
+    async def loader():
+        await asyncio.sleep(0.02)
+        return 1
+
+    async def run():
+        first = asyncio.ensure_future(cache.get_or_load_async("a", loader))
+        second = asyncio.ensure_future(cache.get_or_load_async("a", loader))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        assert await second == 1
+        assert first.cancelled()
+
+    asyncio.run(run())
+    assert cache.get("a") == 1
+
+
+def test_async_invalidate_during_load_skips_store():
+    cache = TTLCache(ttl=10)
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        return 1
+
+    async def run():
+        load = asyncio.ensure_future(cache.get_or_load_async("a", loader))
+        await asyncio.sleep(0)
+        cache.invalidate("a")
+        return await load
+
+    assert asyncio.run(run()) == 1
+    assert cache.get("a") is None
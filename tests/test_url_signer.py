@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+@File    : test_url_signer.py
+@Time    : 2026/10/17
+@Author  : willsygao
+@Desc    : 批量地址签名测试
+"""
+
+import hashlib
+
+from tools.url_signer import StreamUrlSigner, sign_batch, tx_time
+
+
+def test_sign_batch_records_per_item_errors():
+    """单条缺少stream_name或expire_time无效时只影响该条"""
+    signer = StreamUrlSigner("push.example.com", "key")
+    results = sign_batch(
+        [{"stream_name": "s1"}, {"app_name": "live"}, {"stream_name": "s2", "expire_time": "x"}],
+        push_signer=signer,
+        now=0
+    )
+    assert [r["Status"] for r in results] == ["Success", "Failed", "Failed"]
+    assert results[1]["Error"] == "缺少stream_name"
+    assert "expire_time" in results[2]["Error"]
+
+    tx_time_hex = tx_time(7, 0)
+    secret = hashlib.md5(("key" + "s1" + tx_time_hex).encode("utf-8")).hexdigest()
+    assert results[0]["PushAddr"] == \
+        f"rtmp://push.example.com/live/s1?txSecret={secret}&txTime={tx_time_hex}"